@@ -1,5 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate
-from config import llm_heavy
+from config import FORECAST_MIN_CONFIDENCE
+from engine.forecaster import get_forecaster
+from llm import routed
 from schemas import SurgeForecast
 from state import AgentState
 
@@ -10,6 +12,7 @@ doctor_prompt = ChatPromptTemplate.from_template(
     CONTEXT:
     Zone: {zone} | Time: {time}
     Evidence: {rag_data}
+    Statistical baseline: {baseline}
     
     TASK:
     1. Estimate total patient volume for next 48h.
@@ -20,12 +23,44 @@ doctor_prompt = ChatPromptTemplate.from_template(
     """
 )
 
-def doctor_node(state: AgentState):
-    print("--- DOCTOR AGENT (Gemini) ---")
-    chain = doctor_prompt | llm_heavy.with_structured_output(SurgeForecast)
-    result = chain.invoke({
+def _statistical_forecast(state: AgentState):
+    """Forecaster fast path; None when the zone has no arrival history"""
+    forecaster = get_forecaster(state["location_zone"])
+    if forecaster is None:
+        return None
+    return forecaster.forecast(state["current_time"], state.get("evidence_features"))
+
+def _doctor_inputs(state: AgentState, baseline: SurgeForecast = None):
+    return {
         "zone": state["location_zone"],
         "time": state["current_time"],
-        "rag_data": state["rag_context"]
-    })
-    return {"forecast": result, "messages": [f"Doctor: Predicted {result.predicted_patients} patients."]}
\ No newline at end of file
+        "rag_data": state["rag_context"],
+        "baseline": (
+            f"{baseline.predicted_patients} patients {baseline.severity_breakdown} "
+            f"(confidence {baseline.confidence}). {baseline.reasoning}"
+            if baseline else "unavailable"
+        ),
+    }
+
+def _doctor_result(result: SurgeForecast):
+    return {"forecast": result, "messages": [f"Doctor: Predicted {result.predicted_patients} patients."]}
+
+def doctor_node(state: AgentState):
+    baseline = _statistical_forecast(state)
+    if baseline and baseline.confidence >= FORECAST_MIN_CONFIDENCE:
+        print("--- DOCTOR AGENT (Forecaster) ---")
+        return _doctor_result(baseline)
+
+    print("--- DOCTOR AGENT (Gemini) ---")
+    chain = doctor_prompt | routed("doctor", SurgeForecast)
+    return _doctor_result(chain.invoke(_doctor_inputs(state, baseline)))
+
+async def adoctor_node(state: AgentState):
+    baseline = _statistical_forecast(state)
+    if baseline and baseline.confidence >= FORECAST_MIN_CONFIDENCE:
+        print("--- DOCTOR AGENT (Forecaster) ---")
+        return _doctor_result(baseline)
+
+    print("--- DOCTOR AGENT (Gemini) ---")
+    chain = doctor_prompt | routed("doctor", SurgeForecast)
+    return _doctor_result(await chain.ainvoke(_doctor_inputs(state, baseline)))
@@ -1,16 +1,8 @@
-import os
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
 from schemas import InfographicContent
+from llm import routed
 from state import AgentState
 
-# Using the specific model requested by the user
-llm_nano = ChatGoogleGenerativeAI(
-    model="models/nano-banana-pro-preview", # Or fallback to gemini-2.0-flash if this fails
-    temperature=0.7,
-    google_api_key=os.getenv("GOOGLE_API_KEY")
-)
-
 infographic_prompt = ChatPromptTemplate.from_template(
     """
     You are **InfographicAgent**. Create content for a public health infographic.
@@ -28,6 +20,12 @@ infographic_prompt = ChatPromptTemplate.from_template(
     """
 )
 
+def _infographic_inputs(state: AgentState):
+    return {
+        "advisory": state["public_advisory"].model_dump_json(),
+        "forecast": state["forecast"].model_dump_json()
+    }
+
 def infographic_node(state: AgentState):
     print("--- INFOGRAPHIC AGENT (Nano Banana) ---")
     
@@ -35,24 +33,27 @@ def infographic_node(state: AgentState):
     if not advisory:
         return {"messages": ["Infographic: Skipped (No Advisory)"]}
         
-    try:
-        chain = infographic_prompt | llm_nano.with_structured_output(InfographicContent)
-        result = chain.invoke({
-            "advisory": advisory.model_dump_json(),
-            "forecast": state["forecast"].model_dump_json()
-        })
-    except Exception as e:
-        print(f"Nano model failed, falling back to standard: {e}")
-        # Fallback logic if the specific model isn't available or fails
-        from config import llm_light
-        chain = infographic_prompt | llm_light.with_structured_output(InfographicContent)
-        result = chain.invoke({
-            "advisory": advisory.model_dump_json(),
-            "forecast": state["forecast"].model_dump_json()
-        })
+    # The router tries Nano Banana first and falls back (or hedges) to the
+    # standard models; a broken Nano model is skipped until its breaker closes.
+    chain = infographic_prompt | routed("infographic", InfographicContent)
+    result = chain.invoke(_infographic_inputs(state))
 
     # In a real app, we would generate the image here using PIL/Matplotlib based on result.visual_description
     # For now, we just return the content.
     result.image_path = "/tmp/infographic_placeholder.png" 
     
     return {"infographic": result, "messages": ["Infographic: Content generated."]}
+
+async def ainfographic_node(state: AgentState):
+    print("--- INFOGRAPHIC AGENT (Nano Banana) ---")
+    
+    advisory = state.get("public_advisory")
+    if not advisory:
+        return {"messages": ["Infographic: Skipped (No Advisory)"]}
+        
+    chain = infographic_prompt | routed("infographic", InfographicContent)
+    result = await chain.ainvoke(_infographic_inputs(state))
+
+    result.image_path = "/tmp/infographic_placeholder.png" 
+    
+    return {"infographic": result, "messages": ["Infographic: Content generated."]}
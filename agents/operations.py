@@ -1,8 +1,10 @@
 from langchain_core.prompts import ChatPromptTemplate
-from config import llm_light
-from schemas import StaffingPlan
+from config import PLANNING_MODE
+from llm import routed
+from schemas import StaffingPlan, StaffingNarrative
 from state import AgentState
 from tools import get_roster
+from engine.planning import compute_staffing_plan
 
 ops_prompt = ChatPromptTemplate.from_template(
     """
@@ -22,11 +24,64 @@ ops_prompt = ChatPromptTemplate.from_template(
     """
 )
 
-def operations_node(state: AgentState):
-    print("--- OPERATIONS AGENT (OpenAI) ---")
-    chain = ops_prompt | llm_light.with_structured_output(StaffingPlan)
-    result = chain.invoke({
+gap_prompt = ChatPromptTemplate.from_template(
+    """
+    You are **OperationsAgent**. The staffing numbers below are final; do not change them.
+    
+    INPUT:
+    - Forecast: {forecast}
+    - Roster: {roster}
+    - Staffing Plan: {plan}
+    
+    TASK:
+    - Write a short gap analysis for the duty manager: where the roster falls short,
+      which shifts to call in first, and any operational risk.
+    
+    OUTPUT: Strict JSON (StaffingNarrative).
+    """
+)
+
+def _ops_inputs(state: AgentState, roster):
+    return {
         "forecast": state["forecast"].model_dump_json(),
-        "roster": str(get_roster(state["location_zone"]))
-    })
-    return {"staffing_plan": result, "messages": ["Operations: Staffing calculated."]}
\ No newline at end of file
+        "roster": str(roster)
+    }
+
+def _ops_update(result):
+    return {"staffing_plan": result, "messages": ["Operations: Staffing calculated."]}
+
+def operations_node(state: AgentState):
+    roster = get_roster(state["location_zone"])
+
+    if PLANNING_MODE == "llm":
+        print("--- OPERATIONS AGENT (Gemini) ---")
+        chain = ops_prompt | routed("operations", StaffingPlan)
+        return _ops_update(chain.invoke(_ops_inputs(state, roster)))
+
+    result = compute_staffing_plan(state["forecast"], roster)
+    if PLANNING_MODE == "hybrid":
+        print("--- OPERATIONS AGENT (Rules + Gemini gap analysis) ---")
+        chain = gap_prompt | routed("operations", StaffingNarrative)
+        narrative = chain.invoke({**_ops_inputs(state, roster), "plan": result.model_dump_json()})
+        result.gap_analysis = narrative.gap_analysis
+    else:
+        print("--- OPERATIONS AGENT (Rules) ---")
+    return _ops_update(result)
+
+async def aoperations_node(state: AgentState):
+    roster = get_roster(state["location_zone"])
+
+    if PLANNING_MODE == "llm":
+        print("--- OPERATIONS AGENT (Gemini) ---")
+        chain = ops_prompt | routed("operations", StaffingPlan)
+        return _ops_update(await chain.ainvoke(_ops_inputs(state, roster)))
+
+    result = compute_staffing_plan(state["forecast"], roster)
+    if PLANNING_MODE == "hybrid":
+        print("--- OPERATIONS AGENT (Rules + Gemini gap analysis) ---")
+        chain = gap_prompt | routed("operations", StaffingNarrative)
+        narrative = await chain.ainvoke({**_ops_inputs(state, roster), "plan": result.model_dump_json()})
+        result.gap_analysis = narrative.gap_analysis
+    else:
+        print("--- OPERATIONS AGENT (Rules) ---")
+    return _ops_update(result)
\ No newline at end of file
@@ -1,8 +1,14 @@
+import logging
 from langchain_core.prompts import ChatPromptTemplate
-from config import llm_heavy
-from schemas import FinalDecision, AuditLog
+from config import DECISION_MODE, ORCHESTRATOR_PROMPT_MODE, ORCHESTRATOR_PROMPT_TOKEN_BUDGET
+from engine.decision import check_rules, execution_plan, merge_review, rule_decision
+from engine.prompt_compaction import CompactInputs, estimate_tokens, total_costs
+from llm import routed
+from schemas import FinalDecision, DecisionNarrative, AuditLog
 from state import AgentState
 
+logger = logging.getLogger(__name__)
+
 orch_prompt = ChatPromptTemplate.from_template(
     """
     You are **OrchestratorAgent**. Review all sub-agent plans and make a GO/NO-GO decision.
@@ -12,6 +18,8 @@ orch_prompt = ChatPromptTemplate.from_template(
     2. Supplier Plan: {supplier}
     3. Staffing Plan: {staffing}
     4. Advisory: {advisory}
+    5. Totals: {totals}
+    6. Rule Check: {rule_check}
     
     RULES:
     - If Total Cost > 50,000 (INR) OR Supplier Risk is High -> Require Human Approval.
@@ -22,19 +30,106 @@ orch_prompt = ChatPromptTemplate.from_template(
     """
 )
 
-def orchestrator_node(state: AgentState):
-    print("--- ORCHESTRATOR (Gemini) ---")
-    print(f"State keys: {list(state.keys())}")
+narrative_prompt = ChatPromptTemplate.from_template(
+    """
+    You are **OrchestratorAgent**. The GO/NO-GO decision below is final; do not change it.
+    
+    INPUTS:
+    1. Forecast: {forecast}
+    2. Supplier Plan: {supplier}
+    3. Staffing Plan: {staffing}
+    4. Advisory: {advisory}
+    5. Totals: {totals}
+    6. Decision: {rule_check}
     
+    TASK:
+    - Write a short execution plan for the duty manager: what happens first,
+      who owns each step, and what needs sign-off.
+    
+    OUTPUT: Strict JSON (DecisionNarrative).
+    """
+)
+
+def prompt_tokens(inputs) -> int:
+    return estimate_tokens(orch_prompt.format(**inputs))
+
+def _full_inputs(state: AgentState, rule_check: str = "not evaluated"):
     # Handle None types safely
     supplier_resp = state.get("supplier_response")
     supplier_dump = supplier_resp.model_dump_json() if supplier_resp else "No Orders"
-    
-    chain = orch_prompt | llm_heavy.with_structured_output(FinalDecision)
-    result = chain.invoke({
+    costs = total_costs(supplier_resp, state["staffing_plan"])
+
+    return {
         "forecast": state["forecast"].model_dump_json(),
         "supplier": supplier_dump,
         "staffing": state["staffing_plan"].model_dump_json(),
-        "advisory": state["public_advisory"].model_dump_json()
-    })
-    return {"final_decision": result, "messages": ["Orchestrator: Final decision logged."]}
\ No newline at end of file
+        "advisory": state["public_advisory"].model_dump_json(),
+        "totals": f"total_cost_inr={costs['total']:.0f}",
+        "rule_check": rule_check,
+    }
+
+def _compact_inputs(state: AgentState, budget: int = ORCHESTRATOR_PROMPT_TOKEN_BUDGET,
+                    rule_check: str = "not evaluated"):
+    compact = CompactInputs(state["forecast"], state.get("supplier_response"),
+                            state["staffing_plan"], state["public_advisory"])
+    inputs = compact.fit(lambda variables: prompt_tokens({**variables, "rule_check": rule_check}), budget)
+    return {**inputs, "rule_check": rule_check}
+
+def _orch_inputs(state: AgentState, rule_check: str = "not evaluated"):
+    if ORCHESTRATOR_PROMPT_MODE == "full":
+        inputs = _full_inputs(state, rule_check)
+    else:
+        inputs = _compact_inputs(state, rule_check=rule_check)
+    if logger.isEnabledFor(logging.DEBUG):  # Estimating renders the whole prompt
+        logger.debug(f"Prompt: ~{prompt_tokens(inputs)} tokens ({ORCHESTRATOR_PROMPT_MODE})")
+    return inputs
+
+def _rule_path(state: AgentState):
+    """Deterministic decision plus the rule check it was built from"""
+    forecast, supplier = state["forecast"], state.get("supplier_response")
+    staffing, advisory = state["staffing_plan"], state.get("public_advisory")
+    check = check_rules(forecast, supplier, staffing)
+    return check, rule_decision(check, execution_plan(forecast, supplier, staffing, advisory))
+
+def _orch_update(result: FinalDecision):
+    return {"final_decision": result, "messages": ["Orchestrator: Final decision logged."]}
+
+def orchestrator_node(state: AgentState):
+    if DECISION_MODE == "llm":
+        print("--- ORCHESTRATOR (Gemini) ---")
+        chain = orch_prompt | routed("orchestrator", FinalDecision)
+        return _orch_update(chain.invoke(_orch_inputs(state)))
+
+    check, decision = _rule_path(state)
+    if check.borderline:
+        print("--- ORCHESTRATOR (Rules + Gemini review) ---")
+        chain = orch_prompt | routed("orchestrator", FinalDecision)
+        review = chain.invoke(_orch_inputs(state, check.summary()))
+        return _orch_update(merge_review(check, decision, review))
+
+    print("--- ORCHESTRATOR (Rules) ---")
+    if DECISION_MODE == "hybrid":
+        chain = narrative_prompt | routed("orchestrator", DecisionNarrative)
+        narrative = chain.invoke(_orch_inputs(state, decision.audit_trail[-1].reasoning))
+        decision.execution_plan = narrative.execution_plan
+    return _orch_update(decision)
+
+async def aorchestrator_node(state: AgentState):
+    if DECISION_MODE == "llm":
+        print("--- ORCHESTRATOR (Gemini) ---")
+        chain = orch_prompt | routed("orchestrator", FinalDecision)
+        return _orch_update(await chain.ainvoke(_orch_inputs(state)))
+
+    check, decision = _rule_path(state)
+    if check.borderline:
+        print("--- ORCHESTRATOR (Rules + Gemini review) ---")
+        chain = orch_prompt | routed("orchestrator", FinalDecision)
+        review = await chain.ainvoke(_orch_inputs(state, check.summary()))
+        return _orch_update(merge_review(check, decision, review))
+
+    print("--- ORCHESTRATOR (Rules) ---")
+    if DECISION_MODE == "hybrid":
+        chain = narrative_prompt | routed("orchestrator", DecisionNarrative)
+        narrative = await chain.ainvoke(_orch_inputs(state, decision.audit_trail[-1].reasoning))
+        decision.execution_plan = narrative.execution_plan
+    return _orch_update(decision)
@@ -31,16 +31,7 @@ payment_prompt = ChatPromptTemplate.from_template(
     """
 )
 
-def payment_node(state: AgentState):
-    print("--- PAYMENT AGENT (A2P) ---")
-    
-    decision = state.get("final_decision")
-    if not decision or not decision.approved:
-        return {"messages": ["Payment: Skipped (Not Approved)"]}
-
-    transactions = []
-    total_paid = 0.0
-
+def _supplier_costs(state: AgentState):
     # Group supplier offers by supplier name
     supplier_costs = {}
     if state["supplier_response"]:
@@ -48,63 +39,61 @@ def payment_node(state: AgentState):
             if offer.supplier_name not in supplier_costs:
                 supplier_costs[offer.supplier_name] = 0.0
             supplier_costs[offer.supplier_name] += offer.cost
+    return supplier_costs
+
+def _build_payment_request(state: AgentState, supplier_name: str, amount: float) -> PaymentRequest:
+    # This is a mock PO ID. In a real system, this would come from the procurement process.
+    po_id = uuid.uuid4()
+    
+    # This is a mock supplier ID. In a real system, this would be retrieved from a supplier database.
+    supplier_id = uuid.uuid4()
+
+    idempotency_key = f"agent-payment-{po_id}-{datetime.utcnow().timestamp()}"
+    agent_id = "PaymentAgent_001"
+    signature = generate_payment_signature(agent_id, idempotency_key, amount)
+
+    payment_details = PaymentDetails(
+        amount=amount,
+        currency="INR",
+        payment_method=PaymentMethod.BANK_TRANSFER,
+        supplier_id=str(supplier_id),
+        purchase_order_id=str(po_id)
+    )
+
+    # Create a simplified metadata object.
+    # In a real scenario, we'd populate this from the offers.
+    # Since `ap2_gateway.models.MedicineItem` has `name`, `quantity` and `unit_price`, 
+    # and `schemas.SupplierOffer` has `cost` and `quantity_available`,
+    # we can create a simple mapping later on.
+    metadata = Metadata(
+        medicine_items=[],
+        urgency="critical", # This would come from the forecast or pharmacy plan.
+        zone=state.get("location_zone", "unknown"),
+    )
+
+    return PaymentRequest(
+        request_id=str(uuid.uuid4()),
+        idempotency_key=idempotency_key,
+        agent_identity=AgentIdentity(agent_id=agent_id, agent_type="BillingAgent", signature=signature),
+        payment_details=payment_details,
+        metadata=metadata,
+        callback=CallbackConfig(url="http://localhost:8000/callback"), # Dummy callback URL
+        risk_assessment=RiskAssessment(cost_threshold_exceeded=False, approval_required=False)
+    )
+
+async def _pay_suppliers(state: AgentState):
+    transactions = []
+    total_paid = 0.0
 
     # Create payment requests for each supplier
-    for supplier_name, amount in supplier_costs.items():
+    for supplier_name, amount in _supplier_costs(state).items():
         if amount > 0:
             logger.info(f"Processing payment for {supplier_name} for amount {amount}")
-            # This is a mock PO ID. In a real system, this would come from the procurement process.
-            po_id = uuid.uuid4()
-            
-            # This is a mock supplier ID. In a real system, this would be retrieved from a supplier database.
-            supplier_id = uuid.uuid4()
-
-            idempotency_key = f"agent-payment-{po_id}-{datetime.utcnow().timestamp()}"
-            agent_id = "PaymentAgent_001"
-            signature = generate_payment_signature(agent_id, idempotency_key, amount)
-
-            payment_details = PaymentDetails(
-                amount=amount,
-                currency="INR",
-                payment_method=PaymentMethod.BANK_TRANSFER,
-                supplier_id=str(supplier_id),
-                purchase_order_id=str(po_id)
-            )
-
-            # Create a simplified metadata object.
-            # In a real scenario, we'd populate this from the offers.
-            medicine_items = []
-            if state["supplier_response"]:
-                for offer in state["supplier_response"].offers:
-                    if offer.supplier_name == supplier_name:
-                        # Assuming the ap2_gateway.models.MedicineItem is compatible with schemas.MedicineItem
-                        # If not, we would need to map the fields. For now, let's assume they are compatible
-                        # and that we have a way to create the AP2MedicineItem from the offer.
-                        # Since `ap2_gateway.models.MedicineItem` has `name`, `quantity` and `unit_price`, 
-                        # and `schemas.SupplierOffer` has `cost` and `quantity_available`,
-                        # we can create a simple mapping.
-                        pass
-
-
-            metadata = Metadata(
-                medicine_items=[],
-                urgency="critical", # This would come from the forecast or pharmacy plan.
-                zone=state.get("forecast", {}).get("zone", "unknown"),
-            )
-
-            request = PaymentRequest(
-                request_id=str(uuid.uuid4()),
-                idempotency_key=idempotency_key,
-                agent_identity=AgentIdentity(agent_id=agent_id, agent_type="BillingAgent", signature=signature),
-                payment_details=payment_details,
-                metadata=metadata,
-                callback=CallbackConfig(url="http://localhost:8000/callback"), # Dummy callback URL
-                risk_assessment=RiskAssessment(cost_threshold_exceeded=False, approval_required=False)
-            )
+            request = _build_payment_request(state, supplier_name, amount)
 
             try:
                 # Directly call the payment processor
-                payment_response = asyncio.run(processor.initiate_payment(request))
+                payment_response = await processor.initiate_payment(request)
                 
                 transactions.append(PaymentTransaction(
                     transaction_id=payment_response.transaction_id,
@@ -124,7 +113,9 @@ def payment_node(state: AgentState):
                     status="failed"
                 ))
 
+    return transactions, total_paid
 
+def _payment_result(state: AgentState, transactions, total_paid: float):
     staffing_cost = state["staffing_plan"].total_labor_cost if state["staffing_plan"] else 0.0
     if staffing_cost > 0:
         # Similar payment logic for staffing would go here.
@@ -143,4 +134,26 @@ def payment_node(state: AgentState):
         status="processing" if total_paid > 0 else "completed"
     )
     
-    return {"payment_status": result, "messages": [f"Payment: Processed ₹{result.total_paid}"]}
\ No newline at end of file
+    return {"payment_status": result, "messages": [f"Payment: Processed ₹{result.total_paid}"]}
+
+def payment_node(state: AgentState):
+    print("--- PAYMENT AGENT (A2P) ---")
+    
+    decision = state.get("final_decision")
+    if not decision or not decision.approved:
+        return {"messages": ["Payment: Skipped (Not Approved)"]}
+
+    transactions, total_paid = asyncio.run(_pay_suppliers(state))
+    return _payment_result(state, transactions, total_paid)
+
+async def apayment_node(state: AgentState):
+    print("--- PAYMENT AGENT (A2P) ---")
+    
+    decision = state.get("final_decision")
+    if not decision or not decision.approved:
+        return {"messages": ["Payment: Skipped (Not Approved)"]}
+
+    # Awaited on the caller's loop, so the processor's background settlement
+    # task keeps running after this node returns.
+    transactions, total_paid = await _pay_suppliers(state)
+    return _payment_result(state, transactions, total_paid)
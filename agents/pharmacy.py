@@ -1,9 +1,11 @@
 import json
 from langchain_core.prompts import ChatPromptTemplate
-from config import llm_light
+from config import PLANNING_MODE
+from llm import routed
 from schemas import PharmacyPlan
 from state import AgentState
 from tools import get_inventory_snapshot
+from engine.planning import compute_pharmacy_plan
 
 pharmacy_prompt = ChatPromptTemplate.from_template(
     """
@@ -22,14 +24,37 @@ pharmacy_prompt = ChatPromptTemplate.from_template(
     """
 )
 
-def pharmacy_node(state: AgentState):
-    print("--- PHARMACY AGENT (OpenAI) ---")
+def _pharmacy_inputs(state: AgentState, inv):
     forecast = state["forecast"]
-    inv = get_inventory_snapshot(state["location_zone"])
-    
-    chain = pharmacy_prompt | llm_light.with_structured_output(PharmacyPlan)
-    result = chain.invoke({
+    return {
         "forecast": forecast.model_dump_json(),
         "inventory": json.dumps(inv)
-    })
-    return {"pharmacy_plan": result, "messages": [f"Pharmacy: Need to reorder {len(result.items_to_reorder)} items."]}
\ No newline at end of file
+    }
+
+def _pharmacy_update(result):
+    return {"pharmacy_plan": result, "messages": [f"Pharmacy: Need to reorder {len(result.items_to_reorder)} items."]}
+
+def pharmacy_node(state: AgentState):
+    inv = get_inventory_snapshot(state["location_zone"])
+
+    if PLANNING_MODE != "llm":
+        # The plan has no narrative fields, so "hybrid" is fully rule-based too
+        print("--- PHARMACY AGENT (Rules) ---")
+        return _pharmacy_update(compute_pharmacy_plan(state["forecast"], inv))
+
+    print("--- PHARMACY AGENT (Gemini) ---")
+    chain = pharmacy_prompt | routed("pharmacy", PharmacyPlan)
+    result = chain.invoke(_pharmacy_inputs(state, inv))
+    return _pharmacy_update(result)
+
+async def apharmacy_node(state: AgentState):
+    inv = get_inventory_snapshot(state["location_zone"])
+
+    if PLANNING_MODE != "llm":
+        print("--- PHARMACY AGENT (Rules) ---")
+        return _pharmacy_update(compute_pharmacy_plan(state["forecast"], inv))
+
+    print("--- PHARMACY AGENT (Gemini) ---")
+    chain = pharmacy_prompt | routed("pharmacy", PharmacyPlan)
+    result = await chain.ainvoke(_pharmacy_inputs(state, inv))
+    return _pharmacy_update(result)
\ No newline at end of file
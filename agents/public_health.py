@@ -1,5 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
-from config import llm_heavy
+from llm import routed
 from schemas import PublicAdvisory
 from state import AgentState
 
@@ -21,11 +21,20 @@ health_prompt = ChatPromptTemplate.from_template(
     """
 )
 
-def public_health_node(state: AgentState):
-    print("--- PUBLIC HEALTH AGENT (Gemini) ---")
-    chain = health_prompt | llm_heavy.with_structured_output(PublicAdvisory)
-    result = chain.invoke({
+def _health_inputs(state: AgentState):
+    return {
         "forecast": state["forecast"].model_dump_json(),
         "zone": state["location_zone"]
-    })
+    }
+
+def public_health_node(state: AgentState):
+    print("--- PUBLIC HEALTH AGENT (Gemini) ---")
+    chain = health_prompt | routed("public_health", PublicAdvisory)
+    result = chain.invoke(_health_inputs(state))
+    return {"public_advisory": result, "messages": ["PublicHealth: Advisory drafted."]}
+
+async def apublic_health_node(state: AgentState):
+    print("--- PUBLIC HEALTH AGENT (Gemini) ---")
+    chain = health_prompt | routed("public_health", PublicAdvisory)
+    result = await chain.ainvoke(_health_inputs(state))
     return {"public_advisory": result, "messages": ["PublicHealth: Advisory drafted."]}
\ No newline at end of file
@@ -1,44 +1,111 @@
-from langchain_core.prompts import ChatPromptTemplate
-from config import llm_light
-from schemas import SupplierResponse, SupplierOffer
-from state import AgentState
-from tools import query_supplier_api
-
-supplier_prompt = ChatPromptTemplate.from_template(
-    """
-    You are **SupplierAgent**. You aggregate API results into a procurement plan.
-    
-    INPUT:
-    - API Results: {api_results}
-    
-    TASK:
-    - Sum total costs.
-    - Assess risk: If any item has 'available' < 'requested', Risk = High.
-    - If ETA > 24h, Risk = Medium.
-    
-    OUTPUT: Strict JSON (SupplierResponse).
-    """
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from config import (
+    SUPPLIER_QUOTE_TIMEOUT_SECONDS, SUPPLIER_QUOTE_CONCURRENCY,
+    SUPPLIER_SOURCE, SUPPLIER_ETA_DEADLINE_HOURS
 )
+from engine.procurement import aggregate_supplier_quotes, optimize_reorder
+from state import AgentState
+from tools import query_supplier_api, get_candidate_suppliers
+
+logger = logging.getLogger(__name__)
+
+# Aggregation rules (see engine/procurement.py):
+# - Sum total costs.
+# - If any item has 'available' < 'requested', Risk = High.
+# - If ETA > 24h, Risk = Medium.
+
+# The supplier API client is blocking, so quotes run on their own pool. Unlike
+# the loop's default executor, asyncio.run() does not wait for it on shutdown,
+# so a hung supplier cannot hold the node past its timeout.
+_quote_pool = ThreadPoolExecutor(max_workers=SUPPLIER_QUOTE_CONCURRENCY, thread_name_prefix="supplier-quote")
+
+def _started_call(loop, started: asyncio.Event, fn, *args):
+    loop.call_soon_threadsafe(started.set)
+    return fn(*args)
+
+async def _quote(gate: asyncio.Semaphore, item, supplier: str):
+    async with gate:
+        try:
+            loop = asyncio.get_running_loop()
+            started = asyncio.Event()
+            call = loop.run_in_executor(
+                _quote_pool, _started_call, loop, started,
+                query_supplier_api, item.medicine_id, item.quantity_needed, supplier,
+            )
+            # The pool is shared by every run in the process, so the timeout
+            # starts once a worker picks the quote up, not while it is queued.
+            await started.wait()
+            data = await asyncio.wait_for(call, timeout=SUPPLIER_QUOTE_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"Quote failed for {item.medicine_id} from {supplier}: {type(e).__name__} {e}")
+            return None
+    data['requested_id'] = item.medicine_id
+    data['requested_qty'] = item.quantity_needed
+    return data
+
+def _best_quote(item, quotes):
+    """Prefer quotes that fill the whole line, then the cheapest, then the fastest"""
+    if not quotes:
+        # No supplier answered in time: keep an empty line so the risk rating sees the shortfall
+        return {
+            "supplier": "NO QUOTE",
+            "available": 0,
+            "unit_cost": 0.0,
+            "eta_hours": 0,
+            "expedite_cost": 0.0,
+            "requested_id": item.medicine_id,
+            "requested_qty": item.quantity_needed,
+        }
+    return min(quotes, key=lambda q: (q["available"] < q["requested_qty"], q["unit_cost"], q["eta_hours"]))
+
+async def _collect_api_results(plan):
+    # Query every candidate supplier for every item at once, so quoting takes
+    # as long as the slowest supplier rather than the sum of all of them.
+    gate = asyncio.Semaphore(SUPPLIER_QUOTE_CONCURRENCY)
+    calls = [
+        (item, supplier)
+        for item in plan.items_to_reorder
+        for supplier in get_candidate_suppliers(item.medicine_id)
+    ]
+    results = await asyncio.gather(*(_quote(gate, item, supplier) for item, supplier in calls))
+
+    quotes_by_item = {}
+    for (item, _), data in zip(calls, results):
+        quotes = quotes_by_item.setdefault(id(item), [])
+        if data is not None:
+            quotes.append(data)
+
+    answered = sum(1 for data in results if data is not None)
+    logger.info(f"Supplier quotes received: {answered}/{len(calls)}")
+    return [_best_quote(item, quotes_by_item[id(item)]) for item in plan.items_to_reorder]
+
+def _supplier_update(result):
+    return {"supplier_response": result, "messages": [f"Supplier: Cost calculated {result.total_procurement_cost}"]}
 
 def supplier_node(state: AgentState):
-    print("--- SUPPLIER AGENT (OpenAI) ---")
+    print("--- SUPPLIER AGENT ---")
     plan = state["pharmacy_plan"]
-    
+
     if not plan or not plan.items_to_reorder:
         # No reorders needed
         return {"supplier_response": None, "messages": ["Supplier: No orders needed."]}
 
-    # Simulate calling external APIs for each item
-    api_results = []
-    for item in plan.items_to_reorder:
-        data = query_supplier_api(item.medicine_id, item.quantity_needed)
-        # In a real app, this data processing would be in Python, 
-        # but we use LLM to summarize/format the risk assessment
-        data['requested_id'] = item.medicine_id
-        data['requested_qty'] = item.quantity_needed
-        api_results.append(data)
-
-    chain = supplier_prompt | llm_light.with_structured_output(SupplierResponse)
-    result = chain.invoke({"api_results": str(api_results)})
-    
-    return {"supplier_response": result, "messages": [f"Supplier: Cost calculated {result.total_procurement_cost}"]}
\ No newline at end of file
+    if SUPPLIER_SOURCE == "catalog":
+        return _supplier_update(optimize_reorder(plan.items_to_reorder, SUPPLIER_ETA_DEADLINE_HOURS))
+
+    return _supplier_update(aggregate_supplier_quotes(asyncio.run(_collect_api_results(plan))))
+
+async def asupplier_node(state: AgentState):
+    print("--- SUPPLIER AGENT ---")
+    plan = state["pharmacy_plan"]
+
+    if not plan or not plan.items_to_reorder:
+        # No reorders needed
+        return {"supplier_response": None, "messages": ["Supplier: No orders needed."]}
+
+    if SUPPLIER_SOURCE == "catalog":
+        return _supplier_update(optimize_reorder(plan.items_to_reorder, SUPPLIER_ETA_DEADLINE_HOURS))
+
+    return _supplier_update(aggregate_supplier_quotes(await _collect_api_results(plan)))
@@ -9,45 +9,39 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def telegram_node(state: AgentState):
-    print("--- TELEGRAM BOT AGENT ---")
-    
-    infographic = state.get("infographic")
-    if not infographic:
-        return {"messages": ["Telegram: Skipped (No Content)"]}
-
-    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
-        logger.warning("TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set. Skipping actual Telegram message send.")
-        
-        # Fallback to mock send if token/chat_id is not available
-        msg_body = f"📢 **{infographic.title}**\n\n"
-        for stat in infographic.key_stats:
-            msg_body += f"• {stat}\n"
-        print(f"\n[TELEGRAM MOCK SEND] To Group: {TELEGRAM_CHAT_ID or 'HealthAlerts_Mumbai'}\n{msg_body}\n[Image: {infographic.visual_description}]\n")
-
-        result = TelegramStatus(
-            sent=True,
-            message_id="mock_msg_12345",
-        )
-        return {"telegram_status": result, "messages": ["Telegram: Alert sent to group (MOCK)."]}
-
-    # Construct the message body
+def _compose_body(infographic) -> str:
     msg_body = f"📢 **{infographic.title}**\n\n"
     for stat in infographic.key_stats:
         msg_body += f"• {stat}\n"
+    return msg_body
+
+def _mock_send(infographic):
+    logger.warning("TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set. Skipping actual Telegram message send.")
     
+    # Fallback to mock send if token/chat_id is not available
+    msg_body = _compose_body(infographic)
+    print(f"\n[TELEGRAM MOCK SEND] To Group: {TELEGRAM_CHAT_ID or 'HealthAlerts_Mumbai'}\n{msg_body}\n[Image: {infographic.visual_description}]\n")
+
+    result = TelegramStatus(
+        sent=True,
+        message_id="mock_msg_12345",
+    )
+    return {"telegram_status": result, "messages": ["Telegram: Alert sent to group (MOCK)."]}
+
+def _build_message(infographic) -> Message:
     # Create the message object for the sender
-    message = Message(
-        message=msg_body,
+    return Message(
+        message=_compose_body(infographic),
         chat_id=TELEGRAM_CHAT_ID,
         # In a real scenario, the infographic might have an image_path that can be converted to a public URL
         # For now, we are not sending an image.
         image_url=None 
     )
 
+async def _send(infographic):
     try:
         # Call the sender logic directly
-        send_result = asyncio.run(handle_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, message))
+        send_result = await handle_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, _build_message(infographic))
         logger.info(f"Telegram send result: {send_result}")
 
         result = TelegramStatus(
@@ -65,4 +59,28 @@ def telegram_node(state: AgentState):
         )
         message = f"Telegram: Failed to send alert. Error: {e}"
 
-    return {"telegram_status": result, "messages": [message]}
\ No newline at end of file
+    return {"telegram_status": result, "messages": [message]}
+
+def telegram_node(state: AgentState):
+    print("--- TELEGRAM BOT AGENT ---")
+    
+    infographic = state.get("infographic")
+    if not infographic:
+        return {"messages": ["Telegram: Skipped (No Content)"]}
+
+    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
+        return _mock_send(infographic)
+
+    return asyncio.run(_send(infographic))
+
+async def atelegram_node(state: AgentState):
+    print("--- TELEGRAM BOT AGENT ---")
+    
+    infographic = state.get("infographic")
+    if not infographic:
+        return {"messages": ["Telegram: Skipped (No Content)"]}
+
+    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
+        return _mock_send(infographic)
+
+    return await _send(infographic)
\ No newline at end of file
@@ -1,11 +1,47 @@
 import redis
 import json
+import time
 from typing import Dict, Any, Optional
 from ap2_gateway.config import config
 import logging
 
 logger = logging.getLogger(__name__)
 
+class _InMemoryStreams:
+    """Just enough of the redis-py API for RedisClient when no server is reachable"""
+    def __init__(self):
+        self._streams = {}
+        self._keys = {}
+        self._seq = 0
+    
+    def exists(self, key):
+        return int(key in self._streams or key in self._keys)
+    
+    def xadd(self, stream, fields, maxlen=None):
+        self._seq += 1
+        message_id = f"{int(time.time() * 1000)}-{self._seq}"
+        entries = self._streams.setdefault(stream, [])
+        entries.append((message_id, fields))
+        if maxlen:
+            del entries[:-maxlen]
+        return message_id
+    
+    def xgroup_create(self, stream, group, id='0', mkstream=False):
+        self._streams.setdefault(stream, [])
+    
+    def xreadgroup(self, **kwargs):
+        return []
+    
+    def xack(self, stream, group, message_id):
+        return 0
+    
+    def get(self, key):
+        value, expires_at = self._keys.get(key, (None, 0))
+        return value if time.time() < expires_at else None
+    
+    def setex(self, key, seconds, value):
+        self._keys[key] = (value, time.time() + seconds)
+
 class RedisClient:
     def __init__(self):
         self.client = redis.Redis(
@@ -14,6 +50,14 @@ class RedisClient:
             db=config.REDIS_DB,
             decode_responses=True
         )
+        try:
+            self.client.ping()
+        except redis.ConnectionError:
+            logger.warning(
+                f"Redis unreachable at {config.REDIS_HOST}:{config.REDIS_PORT}. "
+                "RedisClient is running in in-memory simulation mode. No messages will be persisted."
+            )
+            self.client = _InMemoryStreams()
         self._ensure_streams()
         self._ensure_consumer_groups()
     
@@ -17,6 +17,20 @@ class Settings:
     DB_USER: str = os.getenv("DB_USER", "postgres")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "postgres")
     
+    # Connection pool settings (backend/database.py)
+    DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+    DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+    DB_POOL_MAX_LIFETIME_SECONDS: float = float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "1800"))
+    # Idle connections older than this are pinged before reuse
+    DB_POOL_CHECK_AFTER_SECONDS: float = float(os.getenv("DB_POOL_CHECK_AFTER_SECONDS", "30"))
+    
+    # GraphQL collection pages (backend/graphql/pagination.py)
+    GRAPHQL_PAGE_SIZE: int = int(os.getenv("GRAPHQL_PAGE_SIZE", "100"))
+    GRAPHQL_MAX_PAGE_SIZE: int = int(os.getenv("GRAPHQL_MAX_PAGE_SIZE", "500"))
+    # Select only the columns a query asks for (backend/graphql/projection.py)
+    GRAPHQL_COLUMN_PROJECTION: bool = os.getenv("GRAPHQL_COLUMN_PROJECTION", "True").lower() == "true"
+    
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
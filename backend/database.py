@@ -1,61 +1,352 @@
-from contextlib import contextmanager
-from typing import Generator
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict
 import psycopg2
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError
 from backend.config import settings
 
+
+class PoolTimeout(PoolError):
+    """No connection became free within the pool timeout"""
+
+
+class _Entry:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """Thread-safe psycopg2 connection pool
+
+    Up to `max_size` connections are open at once; `min_size` are opened up
+    front. A connection idle for longer than `check_after` seconds is pinged
+    before it is handed out, and one older than `max_lifetime` is replaced.
+    Callers wait up to `timeout` seconds for a free connection; waits and
+    timeouts are counted in `stats()`.
+    """
+
+    def __init__(self, connect: Callable, min_size: int, max_size: int, timeout: float,
+                 max_lifetime: float, check_after: float):
+        self._connect = connect
+        self.min_size, self.max_size = min_size, max(max_size, 1)
+        self.timeout, self.max_lifetime, self.check_after = timeout, max_lifetime, check_after
+        self._idle = deque()
+        self._in_use: Dict[int, _Entry] = {}
+        self._size = 0  # Open connections, idle or in use
+        self._cond = threading.Condition()
+        self._counters = {
+            "acquired": 0, "waited": 0, "timeouts": 0, "created": 0,
+            "expired": 0, "failed_checks": 0, "discarded": 0,
+        }
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def open(self):
+        """Open `min_size` connections"""
+        entries = [self._new_entry() for _ in range(self.min_size)]
+        with self._cond:
+            self._size += len(entries)
+            self._idle.extend(entries)
+
+    def _new_entry(self) -> _Entry:
+        entry = _Entry(self._connect())
+        with self._cond:
+            self._counters["created"] += 1
+        return entry
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def _healthy(self, entry: _Entry) -> _Entry:
+        """`entry` if it is still usable, otherwise a fresh connection in its place"""
+        now = time.monotonic()
+        problem = None
+        if now - entry.created_at > self.max_lifetime:
+            problem = "expired"
+        elif entry.conn.closed:
+            problem = "failed_checks"
+        elif now - entry.last_used > self.check_after:
+            try:
+                with entry.conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                entry.conn.rollback()
+            except psycopg2.Error:
+                problem = "failed_checks"
+        if problem is None:
+            return entry
+        self._close(entry.conn)
+        with self._cond:
+            self._counters[problem] += 1
+        return self._new_entry()
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()  # Most recently used first, so spare connections age out
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    entry = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeout(f"No database connection free after {self.timeout:.1f}s "
+                                      f"({self.max_size} in use)")
+                waited = True
+                self._cond.wait(remaining)
+
+        try:
+            entry = self._new_entry() if entry is None else self._healthy(entry)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        wait = time.monotonic() - start
+        with self._cond:
+            self._in_use[id(entry.conn)] = entry
+            self._counters["acquired"] += 1
+            if waited:
+                self._counters["waited"] += 1
+            self._wait_seconds += wait
+            self._max_wait_seconds = max(self._max_wait_seconds, wait)
+        return entry.conn
+
+    def release(self, conn, discard: bool = False):
+        with self._cond:
+            entry = self._in_use.pop(id(conn))
+        if not discard and not conn.closed and conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()  # Never hand out a connection mid-transaction
+            except psycopg2.Error:
+                discard = True
+        expired = time.monotonic() - entry.created_at > self.max_lifetime
+
+        with self._cond:
+            if discard or expired or conn.closed:
+                self._size -= 1
+                self._counters["expired" if expired and not discard else "discarded"] += 1
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+            self._cond.notify()
+        if discard or expired or conn.closed:
+            self._close(conn)
+
+    def close(self):
+        """Close idle connections; connections in use close when released"""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self.max_lifetime = -1.0
+        for entry in idle:
+            self._close(entry.conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            acquired = self._counters["acquired"]
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **self._counters,
+                "wait_seconds_total": round(self._wait_seconds, 6),
+                "mean_wait_ms": round(1000 * self._wait_seconds / acquired, 3) if acquired else 0.0,
+                "max_wait_ms": round(1000 * self._max_wait_seconds, 3),
+            }
+
+
 class Database:
     """Database connection manager"""
-    
+
+    def __init__(self, **pool_options):
+        self._pool = None
+        self._pool_options = pool_options
+        self._lock = threading.Lock()
+
     @staticmethod
+    def connect():
+        return psycopg2.connect(
+            host=settings.DB_HOST,
+            port=settings.DB_PORT,
+            database=settings.DB_NAME,
+            user=settings.DB_USER,
+            password=settings.DB_PASSWORD,
+            cursor_factory=RealDictCursor
+        )
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Created and filled to its minimum size on first use"""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    options = {
+                        "min_size": settings.DB_POOL_MIN_SIZE,
+                        "max_size": settings.DB_POOL_MAX_SIZE,
+                        "timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+                        "max_lifetime": settings.DB_POOL_MAX_LIFETIME_SECONDS,
+                        "check_after": settings.DB_POOL_CHECK_AFTER_SECONDS,
+                        **self._pool_options,
+                    }
+                    pool = ConnectionPool(self.connect, **options)
+                    pool.open()
+                    self._pool = pool
+        return self._pool
+
+    def configure_pool(self, **pool_options):
+        """Close the current pool; the next query opens one with these overrides"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._pool_options = pool_options
+        if pool is not None:
+            pool.close()
+
+    def close(self):
+        self.configure_pool(**self._pool_options)
+
     @contextmanager
-    def get_connection():
-        """Get database connection with context manager"""
-        conn = None
+    def get_connection(self):
+        """Borrow a pooled connection with context manager"""
+        pool = self.pool
+        conn = pool.acquire()
+        discard = False
         try:
-            conn = psycopg2.connect(
-                host=settings.DB_HOST,
-                port=settings.DB_PORT,
-                database=settings.DB_NAME,
-                user=settings.DB_USER,
-                password=settings.DB_PASSWORD,
-                cursor_factory=RealDictCursor
-            )
             yield conn
         except psycopg2.Error as e:
             print(f"Database error: {e}")
-            if conn:
+            try:
                 conn.rollback()
+            except psycopg2.Error:
+                discard = True
             raise
         finally:
-            if conn:
-                conn.close()
-    
-    @staticmethod
-    def execute_query(query: str, params: tuple = None, fetch: str = "all"):
+            pool.release(conn, discard=discard)
+
+    def execute_query(self, query: str, params: tuple = None, fetch: str = "all"):
         """Execute a query and return results"""
-        with Database.get_connection() as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params or ())
-            
+
             if fetch == "one":
                 result = cursor.fetchone()
             elif fetch == "all":
                 result = cursor.fetchall()
             else:
                 result = None
-            
+
             conn.commit()
             cursor.close()
             return result
-    
-    @staticmethod
-    def execute_many(query: str, params_list: list):
+
+    def execute_many(self, query: str, params_list: list):
         """Execute multiple queries"""
-        with Database.get_connection() as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.executemany(query, params_list)
             conn.commit()
             cursor.close()
 
-db = Database()
\ No newline at end of file
+
+class AsyncDatabase:
+    """Async counterpart of Database for the GraphQL resolvers
+
+    Backed by a psycopg 3 AsyncConnectionPool with the same DB_POOL_* limits,
+    so a resolver waiting on Postgres yields the event loop instead of
+    holding a worker thread. As in ConnectionPool, only connections idle for
+    longer than DB_POOL_CHECK_AFTER_SECONDS are pinged before reuse. The pool
+    is opened on first use, inside the running loop.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._lock = None
+        self._last_used = weakref.WeakKeyDictionary()
+
+    async def _reset(self, conn):
+        self._last_used[conn] = time.monotonic()
+
+    async def _check(self, conn):
+        last_used = self._last_used.get(conn)  # None for a connection that was just opened
+        if last_used is not None and time.monotonic() - last_used > settings.DB_POOL_CHECK_AFTER_SECONDS:
+            await AsyncConnectionPool.check_connection(conn)
+
+    async def pool(self) -> AsyncConnectionPool:
+        if self._pool is None:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._pool is None:
+                    pool = AsyncConnectionPool(
+                        settings.DATABASE_URL,
+                        min_size=settings.DB_POOL_MIN_SIZE,
+                        max_size=settings.DB_POOL_MAX_SIZE,
+                        timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                        max_lifetime=settings.DB_POOL_MAX_LIFETIME_SECONDS,
+                        check=self._check,
+                        reset=self._reset,
+                        # Autocommit: a single statement is one round trip, without BEGIN/COMMIT.
+                        # Text is decoded as UTF-8 even on SQL_ASCII clusters, as psycopg2 does.
+                        kwargs={"row_factory": dict_row, "autocommit": True, "client_encoding": "utf8"},
+                        open=False,
+                    )
+                    await pool.open(wait=True)
+                    self._pool = pool
+        return self._pool
+
+    @asynccontextmanager
+    async def get_connection(self):
+        """Borrow a pooled autocommit connection; use `conn.transaction()` for multi-statement work"""
+        pool = await self.pool()
+        async with pool.connection() as conn:
+            yield conn
+
+    async def execute_query(self, query: str, params: tuple = None, fetch: str = "all"):
+        """Execute a query and return results"""
+        async with self.get_connection() as conn:
+            cursor = await conn.execute(query, params or ())
+            if fetch == "one":
+                return await cursor.fetchone()
+            if fetch == "all":
+                return await cursor.fetchall()
+            return None
+
+    async def execute_many(self, query: str, params_list: list):
+        """Execute multiple queries"""
+        async with self.get_connection() as conn:
+            async with conn.transaction(), conn.cursor() as cursor:
+                await cursor.executemany(query, params_list)
+
+    def stats(self) -> dict:
+        return self._pool.get_stats() if self._pool is not None else {}
+
+    async def close(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await pool.close()
+
+db = Database()
+adb = AsyncDatabase()
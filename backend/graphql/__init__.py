@@ -1,4 +1,5 @@
 from backend.graphql.queries import Query
 from backend.graphql.mutations import Mutation
+from backend.graphql.loaders import get_context
 
-__all__ = ['Query', 'Mutation']
\ No newline at end of file
+__all__ = ['Query', 'Mutation', 'get_context']
\ No newline at end of file
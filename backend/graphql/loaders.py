@@ -0,0 +1,73 @@
+"""
+Per-request DataLoaders for the GraphQL relationship and by-id fields.
+
+While one level of a query resolves, each loader collects the ids asked for
+and fetches them in a single `WHERE <pk> = ANY(%s)` query, so 100 ER visits
+with their patients and attending staff cost three queries instead of 201.
+Only the selected columns are fetched, so a table keeps one DataLoader per
+column set. Results are cached by id for the lifetime of one request only.
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from strawberry.dataloader import DataLoader
+from backend.database import adb
+from backend.graphql.projection import from_row, selected_columns
+from backend.schema import primary_key
+from backend.schemas.graphql_types import ERVisit, Inventory, Medicine, Patient, Staff, Supplier
+
+
+def _by_id(table: str, model: Callable, columns: Sequence[str]) -> Callable:
+    pk = primary_key(table)
+    query = f"SELECT {', '.join(columns)} FROM {table} WHERE {pk} = ANY(%s)"
+
+    async def load(ids: List[int]) -> List[Optional[object]]:
+        rows = await adb.execute_query(query, (list(ids),))
+        found = {row[pk]: from_row(model, row) for row in rows}
+        return [found.get(i) for i in ids]
+
+    return load
+
+
+def _field_key(info) -> Tuple[str, ...]:
+    """Response path without list indexes, the same for every item of a list"""
+    keys, path = [], info.path
+    while path is not None:
+        if isinstance(path.key, str):
+            keys.append(path.key)
+        path = path.prev
+    return tuple(keys)
+
+
+class ByIdLoader:
+    """Rows of one table by primary key, projected to the current field's selection"""
+
+    def __init__(self, table: str, model: Callable):
+        self.table, self.model = table, model
+        self._loaders: Dict[Tuple[str, ...], DataLoader] = {}
+        self._columns: Dict[Tuple[str, ...], Tuple[str, ...]] = {}  # By field, so each list item reuses it
+
+    def load(self, id: int, info):
+        key = _field_key(info)
+        columns = self._columns.get(key)
+        if columns is None:
+            columns = self._columns[key] = selected_columns(info, self.model, self.table)
+        loader = self._loaders.get(columns)
+        if loader is None:
+            loader = self._loaders[columns] = DataLoader(load_fn=_by_id(self.table, self.model, columns))
+        return loader.load(id)
+
+
+class Loaders:
+    """One ByIdLoader per type, created for each request"""
+
+    def __init__(self):
+        self.medicine = ByIdLoader("medicines", Medicine)
+        self.inventory = ByIdLoader("inventory", Inventory)
+        self.patient = ByIdLoader("patients", Patient)
+        self.er_visit = ByIdLoader("er_visits", ERVisit)
+        self.staff = ByIdLoader("staff", Staff)
+        self.supplier = ByIdLoader("suppliers", Supplier)
+
+
+async def get_context() -> dict:
+    """GraphQLRouter context_getter; strawberry adds the request and response"""
+    return {"loaders": Loaders()}
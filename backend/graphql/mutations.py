@@ -5,14 +5,14 @@ from backend.schemas.graphql_types import (
     Patient, ERVisit, Inventory, PatientInput, 
     ERVisitInput, InventoryUpdateInput
 )
-from backend.database import db
+from backend.database import adb
 
 @strawberry.type
 class Mutation:
     
     # Patient Mutations
     @strawberry.mutation
-    def add_patient(self, patient: PatientInput) -> Patient:
+    async def add_patient(self, patient: PatientInput) -> Patient:
         query = """
             INSERT INTO patients 
             (first_name, last_name, date_of_birth, gender, blood_type, phone, 
@@ -26,11 +26,11 @@ class Mutation:
             patient.address, patient.emergency_contact, patient.medical_history,
             datetime.now().isoformat()
         )
-        row = db.execute_query(query, params, fetch="one")
+        row = await adb.execute_query(query, params, fetch="one")
         return Patient(**dict(row))
     
     @strawberry.mutation
-    def update_patient(
+    async def update_patient(
         self, 
         patient_id: int, 
         patient: PatientInput
@@ -49,18 +49,18 @@ class Mutation:
             patient.address, patient.emergency_contact, patient.medical_history,
             patient_id
         )
-        row = db.execute_query(query, params, fetch="one")
+        row = await adb.execute_query(query, params, fetch="one")
         return Patient(**dict(row)) if row else None
     
     @strawberry.mutation
-    def delete_patient(self, patient_id: int) -> bool:
+    async def delete_patient(self, patient_id: int) -> bool:
         query = "DELETE FROM patients WHERE patient_id = %s"
-        db.execute_query(query, (patient_id,), fetch=None)
+        await adb.execute_query(query, (patient_id,), fetch=None)
         return True
     
     # ER Visit Mutations
     @strawberry.mutation
-    def add_er_visit(self, visit: ERVisitInput) -> ERVisit:
+    async def add_er_visit(self, visit: ERVisitInput) -> ERVisit:
         query = """
             INSERT INTO er_visits 
             (patient_id, arrival_time, triage_level, chief_complaint, 
@@ -73,11 +73,11 @@ class Mutation:
             visit.chief_complaint, visit.vitals, visit.treatment_summary,
             visit.discharge_time, datetime.now().isoformat()
         )
-        row = db.execute_query(query, params, fetch="one")
+        row = await adb.execute_query(query, params, fetch="one")
         return ERVisit(**dict(row))
     
     @strawberry.mutation
-    def update_er_visit_discharge(
+    async def update_er_visit_discharge(
         self, 
         visit_id: int, 
         discharge_time: str
@@ -87,12 +87,12 @@ class Mutation:
             WHERE visit_id = %s
             RETURNING *
         """
-        row = db.execute_query(query, (discharge_time, visit_id), fetch="one")
+        row = await adb.execute_query(query, (discharge_time, visit_id), fetch="one")
         return ERVisit(**dict(row)) if row else None
     
     # Inventory Mutations
     @strawberry.mutation
-    def update_inventory(
+    async def update_inventory(
         self, 
         update: InventoryUpdateInput
     ) -> Optional[Inventory]:
@@ -101,7 +101,7 @@ class Mutation:
             WHERE inventory_id = %s
             RETURNING *
         """
-        row = db.execute_query(
+        row = await adb.execute_query(
             query, 
             (update.quantity_in_stock, update.inventory_id), 
             fetch="one"
@@ -109,7 +109,7 @@ class Mutation:
         return Inventory(**dict(row)) if row else None
     
     @strawberry.mutation
-    def restock_inventory(
+    async def restock_inventory(
         self, 
         inventory_id: int, 
         quantity: int
@@ -121,7 +121,7 @@ class Mutation:
             WHERE inventory_id = %s
             RETURNING *
         """
-        row = db.execute_query(
+        row = await adb.execute_query(
             query, 
             (quantity, datetime.now().isoformat(), inventory_id), 
             fetch="one"
@@ -0,0 +1,102 @@
+"""
+Keyset pagination for the GraphQL collections.
+
+Every collection has a fixed order on an indexed sort key ending in the
+primary key, so each row has a unique position. A page is the `first` rows
+after the cursor, found with a row comparison such as
+`(visit_datetime, visit_id) < (%s, %s)` that the index answers directly
+however deep the page is; there is no OFFSET scan. Cursors are the last
+row's sort values, JSON-encoded and base64ed so clients treat them as opaque;
+on the way back in, each value is checked against its column's type.
+Only the columns selected under `edges { node }` are fetched, plus the sort key.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from backend.config import settings
+from backend.database import adb
+from backend.graphql.projection import from_row, selected_columns
+from backend.schema import column_type
+from backend.schemas.graphql_types import Connection, Edge, PageInfo
+
+# (SQL condition with one placeholder, value), e.g. ("severity = %s", "High")
+Condition = Tuple[str, Any]
+
+
+def encode_cursor(values: Sequence) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(values), default=str).encode()).decode()
+
+
+def _integer(value) -> int:
+    if type(value) is not int or not -2**31 <= value < 2**31:
+        raise ValueError(value)
+    return value
+
+
+def _text(value) -> str:
+    if not isinstance(value, str) or "\x00" in value:
+        raise ValueError(value)
+    return value
+
+
+# Parse a cursor value as each sort column's Postgres type (backend/schema.py)
+_CURSOR_TYPES: Dict[str, Callable] = {
+    "INTEGER": _integer,
+    "TEXT": _text,
+    "DATE": date.fromisoformat,
+    "TIMESTAMP": datetime.fromisoformat,
+}
+
+
+def decode_cursor(cursor: str, table: str, order: Sequence[str]) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(order):
+            raise ValueError(values)
+        return [_CURSOR_TYPES[column_type(table, column)](value) for column, value in zip(order, values)]
+    except (TypeError, ValueError) as e:  # Bad base64, UTF-8, JSON, shape or value
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def filter_conditions(filter, date_column: str = None) -> List[Condition]:
+    """`since`/`until` bound `date_column`; any other field that is set must equal its column"""
+    conditions = []
+    for name, value in (vars(filter) if filter is not None else {}).items():
+        if value is None:
+            continue
+        if name == "since":
+            conditions.append((f"{date_column} >= %s", value))
+        elif name == "until":
+            conditions.append((f"{date_column} < %s", value))
+        else:
+            conditions.append((f"{name} = %s", value))
+    return conditions
+
+
+async def paginate(info, table: str, model: Callable, order: Sequence[str], descending: bool, first: int,
+                   after: Optional[str] = None, conditions: Sequence[Condition] = ()) -> Connection:
+    """One page of `table` ordered by `order` (all ascending or all descending)"""
+    if first < 1:
+        raise ValueError("first must be at least 1")
+    first = min(first, settings.GRAPHQL_MAX_PAGE_SIZE)
+    where = [sql for sql, _ in conditions]
+    params = [value for _, value in conditions]
+    if after is not None:
+        keys = ", ".join(order)
+        placeholders = ", ".join(["%s"] * len(order))
+        where.append(f"({keys}) {'<' if descending else '>'} ({placeholders})")
+        params += decode_cursor(after, table, order)
+
+    direction = " DESC" if descending else ""
+    columns = selected_columns(info, model, table, path=("edges", "node"), required=order)
+    query = (f"SELECT {', '.join(columns)} FROM {table}"
+             f"{' WHERE ' + ' AND '.join(where) if where else ''}"
+             f" ORDER BY {', '.join(column + direction for column in order)} LIMIT %s")
+    rows = await adb.execute_query(query, (*params, first + 1))  # One extra row tells if there is a next page
+
+    edges = [Edge(node=from_row(model, row), cursor=encode_cursor([row[c] for c in order])) for row in rows[:first]]
+    return Connection(
+        edges=edges,
+        page_info=PageInfo(has_next_page=len(rows) > first, end_cursor=edges[-1].cursor if edges else None),
+    )
@@ -0,0 +1,65 @@
+"""
+Column projection from the GraphQL selection set.
+
+Resolvers select only the columns behind the fields a query asks for, plus
+the primary key and any sort keys, instead of every column of the table.
+A relationship field such as `patient` needs its foreign key, `patient_id`.
+Rows become strawberry objects through `from_row`, which skips the dataclass
+__init__ and so does not need the columns that were left out.
+"""
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, Sequence, Tuple
+from strawberry.types.nodes import SelectedField
+from strawberry.utils.str_converters import to_camel_case
+from backend.config import settings
+from backend.schema import columns, primary_key
+
+
+@lru_cache(maxsize=None)
+def _field_columns(model: Callable, table: str) -> Dict[str, str]:
+    """GraphQL field name -> the column it reads"""
+    available = set(columns(table))
+    mapping = {}
+    for field in model.__strawberry_definition__.fields:
+        name = field.graphql_name or to_camel_case(field.python_name)
+        if field.python_name in available:
+            mapping[name] = field.python_name
+        elif f"{field.python_name}_id" in available:
+            mapping[name] = f"{field.python_name}_id"  # Relationship, loaded by its foreign key
+    return mapping
+
+
+def _fields(selections) -> Iterator[SelectedField]:
+    """Selected fields, with fragments flattened"""
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            yield selection
+        else:
+            yield from _fields(selection.selections)
+
+
+def selected_columns(info, model: Callable, table: str, path: Sequence[str] = (),
+                     required: Sequence[str] = ()) -> Tuple[str, ...]:
+    """Columns of `table` that the current field's selection needs, in table order
+
+    `path` leads from the current field to the `model` objects, e.g.
+    ("edges", "node") for a connection. All columns are returned when
+    GRAPHQL_COLUMN_PROJECTION is off.
+    """
+    if not settings.GRAPHQL_COLUMN_PROJECTION:
+        return tuple(columns(table))
+    selections = [selection for field in info.selected_fields for selection in field.selections]
+    for name in path:
+        selections = [selection for field in _fields(selections) if field.name == name
+                      for selection in field.selections]
+    mapping = _field_columns(model, table)
+    wanted = {primary_key(table), *required}
+    wanted.update(mapping[field.name] for field in _fields(selections) if field.name in mapping)
+    return tuple(column for column in columns(table) if column in wanted)
+
+
+def from_row(model: Callable, row: dict):
+    """A `model` holding just the columns in `row`; strawberry only reads the selected fields"""
+    obj = model.__new__(model)
+    obj.__dict__.update(row)
+    return obj
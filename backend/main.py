@@ -3,7 +3,8 @@ from fastapi.middleware.cors import CORSMiddleware
 import strawberry
 from strawberry.fastapi import GraphQLRouter
 from backend.config import settings
-from backend.graphql import Query, Mutation
+from backend.database import adb
+from backend.graphql import Query, Mutation, get_context
 
 # Create GraphQL schema
 schema = strawberry.Schema(query=Query, mutation=Mutation)
@@ -26,7 +27,7 @@ app.add_middleware(
 )
 
 # Add GraphQL route
-graphql_app = GraphQLRouter(schema)
+graphql_app = GraphQLRouter(schema, context_getter=get_context)
 app.include_router(graphql_app, prefix="/graphql")
 
 @app.get("/")
@@ -40,13 +41,23 @@ def root():
     }
 
 @app.get("/health")
-def health_check():
-    """Health check endpoint"""
+async def health_check():
+    """Health check endpoint, probing the async pool the GraphQL resolvers use"""
+    try:
+        await adb.execute_query("SELECT 1", fetch="one")
+        database = "connected"
+    except Exception as e:
+        database = f"error: {e}"
     return {
-        "status": "healthy",
-        "database": "connected"
+        "status": "healthy" if database == "connected" else "degraded",
+        "database": database,
+        "pool": adb.stats()
     }
 
+@app.on_event("shutdown")
+async def close_pool():
+    await adb.close()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,248 @@
+"""
+Postgres schema for the hospital tables.
+
+Replaces the SQLite-flavoured DDL in the sql_files/ dumps with real
+TIMESTAMP/DATE/BOOLEAN types (and TEXT for the phone and address columns the
+dumps declare DATETIME), identity primary keys, foreign keys and indexes for
+the API's id lookups, joins and "latest first" orderings.
+
+Tables are created bare; `constraint_statements` adds the keys and indexes
+once the rows are in, which is how backend.seed_loader uses it. `migrate`
+brings an existing database up to this schema in place.
+
+Usage:
+    python -m backend.schema --migrate
+    python -m backend.schema --print
+"""
+import argparse
+from typing import Dict, List, Tuple
+from backend.database import db
+
+# Parents before children
+TABLES: Dict[str, List[Tuple[str, str]]] = {
+    "medicines": [
+        ("medicine_id", "INTEGER"), ("name", "TEXT"), ("category", "TEXT"),
+        ("unit_price", "DOUBLE PRECISION"), ("manufacturer", "TEXT"), ("description", "TEXT"),
+        ("requires_prescription", "BOOLEAN"), ("storage_conditions", "TEXT"),
+        ("created_at", "TIMESTAMP"), ("updated_at", "TIMESTAMP"),
+    ],
+    "suppliers": [
+        ("supplier_id", "INTEGER"), ("name", "TEXT"), ("contact_person", "TEXT"), ("phone", "TEXT"),
+        ("email", "TEXT"), ("address", "TEXT"), ("city", "TEXT"), ("state", "TEXT"), ("pincode", "TEXT"),
+        ("rating", "DOUBLE PRECISION"), ("payment_terms", "TEXT"),
+        ("created_at", "TIMESTAMP"), ("updated_at", "TIMESTAMP"),
+    ],
+    "patients": [
+        ("patient_id", "INTEGER"), ("name", "TEXT"), ("age", "INTEGER"), ("gender", "TEXT"),
+        ("contact_number", "TEXT"), ("email", "TEXT"), ("address", "TEXT"), ("blood_group", "TEXT"),
+        ("emergency_contact", "TEXT"), ("created_at", "TIMESTAMP"), ("updated_at", "TIMESTAMP"),
+    ],
+    "staff": [
+        ("staff_id", "INTEGER"), ("name", "TEXT"), ("role", "TEXT"), ("department", "TEXT"),
+        ("contact_number", "TEXT"), ("email", "TEXT"), ("qualification", "TEXT"),
+        ("experience_years", "INTEGER"), ("shift_preference", "TEXT"), ("hourly_rate", "DOUBLE PRECISION"),
+        ("is_active", "BOOLEAN"), ("hired_date", "TIMESTAMP"),
+        ("created_at", "TIMESTAMP"), ("updated_at", "TIMESTAMP"),
+    ],
+    "schedules": [
+        ("schedule_id", "INTEGER"), ("staff_id", "INTEGER"), ("shift_date", "DATE"), ("shift_type", "TEXT"),
+        ("start_time", "TIME"), ("end_time", "TIME"), ("status", "TEXT"),
+        ("created_at", "TIMESTAMP"), ("updated_at", "TIMESTAMP"),
+    ],
+    "supplier_medicines": [
+        ("supplier_medicine_id", "INTEGER"), ("supplier_id", "INTEGER"), ("medicine_id", "INTEGER"),
+        ("supply_price", "DOUBLE PRECISION"), ("lead_time_days", "INTEGER"),
+        ("minimum_order_quantity", "INTEGER"), ("is_preferred", "BOOLEAN"),
+        ("last_supplied_date", "TIMESTAMP"), ("created_at", "TIMESTAMP"),
+    ],
+    "inventory": [
+        ("inventory_id", "INTEGER"), ("medicine_id", "INTEGER"), ("current_stock", "INTEGER"),
+        ("reorder_level", "INTEGER"), ("maximum_stock", "INTEGER"), ("location", "TEXT"),
+        ("batch_number", "TEXT"), ("expiry_date", "DATE"),
+        ("last_restocked_date", "TIMESTAMP"), ("last_updated", "TIMESTAMP"),
+    ],
+    "er_visits": [
+        ("visit_id", "INTEGER"), ("patient_id", "INTEGER"), ("visit_datetime", "TIMESTAMP"),
+        ("chief_complaint", "TEXT"), ("severity", "TEXT"), ("wait_time_minutes", "INTEGER"),
+        ("treatment_duration_minutes", "INTEGER"), ("attending_staff_id", "INTEGER"), ("outcome", "TEXT"),
+        ("medicines_prescribed", "TEXT"), ("total_cost", "DOUBLE PRECISION"),
+        ("created_at", "TIMESTAMP"), ("updated_at", "TIMESTAMP"),
+    ],
+    "environmental_data": [
+        ("env_data_id", "INTEGER"), ("recorded_at", "TIMESTAMP"), ("temperature_celsius", "DOUBLE PRECISION"),
+        ("humidity_percent", "DOUBLE PRECISION"), ("air_quality_index", "INTEGER"),
+        ("precipitation_mm", "DOUBLE PRECISION"), ("wind_speed_kmh", "DOUBLE PRECISION"),
+        ("pressure_hpa", "DOUBLE PRECISION"), ("location", "TEXT"), ("source", "TEXT"),
+        ("created_at", "TIMESTAMP"),
+    ],
+}
+
+# The primary key is each table's first column
+FOREIGN_KEYS: Dict[str, List[Tuple[str, str]]] = {
+    "schedules": [("staff_id", "staff")],
+    "supplier_medicines": [("supplier_id", "suppliers"), ("medicine_id", "medicines")],
+    "inventory": [("medicine_id", "medicines")],
+    "er_visits": [("patient_id", "patients"), ("attending_staff_id", "staff")],
+}
+
+INDEXES: Dict[str, List[Tuple[str, str]]] = {
+    # Sort keys end in the primary key so GraphQL pages can continue from a cursor
+    "medicines": [
+        ("medicines_name_idx", "(name, medicine_id)"),
+    ],
+    "suppliers": [
+        ("suppliers_name_idx", "(name, supplier_id)"),
+    ],
+    "staff": [
+        ("staff_name_idx", "(name, staff_id)"),
+    ],
+    "schedules": [
+        ("schedules_shift_date_schedule_id_idx", "(shift_date DESC, schedule_id DESC)"),
+        ("schedules_staff_id_idx", "(staff_id)"),
+    ],
+    "supplier_medicines": [
+        # Also serves supplier_id lookups; medicine_id alone gets its own index
+        ("supplier_medicines_supplier_medicine_key", "(supplier_id, medicine_id)"),
+        ("supplier_medicines_medicine_id_idx", "(medicine_id)"),
+    ],
+    "inventory": [
+        ("inventory_medicine_id_idx", "(medicine_id)"),
+        # Partial index: only the handful of rows at or below their reorder level
+        ("inventory_low_stock_idx", "(inventory_id) WHERE current_stock <= reorder_level"),
+    ],
+    "er_visits": [
+        ("er_visits_visit_datetime_visit_id_idx", "(visit_datetime DESC, visit_id DESC)"),
+        ("er_visits_severity_visit_datetime_idx", "(severity, visit_datetime DESC, visit_id DESC)"),
+        ("er_visits_patient_id_idx", "(patient_id)"),
+        ("er_visits_attending_staff_id_idx", "(attending_staff_id)"),
+    ],
+    "environmental_data": [
+        ("environmental_data_recorded_at_env_data_id_idx", "(recorded_at DESC, env_data_id DESC)"),
+    ],
+}
+
+UNIQUE_INDEXES = {"supplier_medicines_supplier_medicine_key"}
+
+# Superseded by the indexes above; `migrate` drops them
+RETIRED_INDEXES = ["schedules_shift_date_idx", "er_visits_visit_datetime_idx", "environmental_data_recorded_at_idx"]
+
+# information_schema.columns.data_type for each declared type
+_DATA_TYPES = {
+    "INTEGER": "integer", "TEXT": "text", "BOOLEAN": "boolean", "DATE": "date", "TIME": "time without time zone",
+    "TIMESTAMP": "timestamp without time zone", "DOUBLE PRECISION": "double precision",
+}
+
+
+def columns(table: str) -> List[str]:
+    return [name for name, _ in TABLES[table]]
+
+
+def column_type(table: str, column: str) -> str:
+    return dict(TABLES[table])[column]
+
+
+def primary_key(table: str) -> str:
+    return TABLES[table][0][0]
+
+
+def create_statement(table: str) -> str:
+    """CREATE TABLE without constraints other than the identity primary-key column"""
+    pk = primary_key(table)
+    definitions = [
+        f"{name} {sql_type} GENERATED BY DEFAULT AS IDENTITY" if name == pk else f"{name} {sql_type}"
+        for name, sql_type in TABLES[table]
+    ]
+    return f"CREATE TABLE {table} ({', '.join(definitions)})"
+
+
+def _index_statement(table: str, name: str, definition: str) -> str:
+    unique = "UNIQUE " if name in UNIQUE_INDEXES else ""
+    return f"CREATE {unique}INDEX IF NOT EXISTS {name} ON {table} {definition}"
+
+
+def _sync_identity(table: str) -> str:
+    """Move the identity sequence past ids that were copied in explicitly"""
+    pk = primary_key(table)
+    return (f"SELECT setval(pg_get_serial_sequence('{table}', '{pk}'), "
+            f"COALESCE(MAX({pk}), 0) + 1, false) FROM {table}")
+
+
+def _constraints(table: str) -> List[Tuple[str, str]]:
+    """(name, statement) for the primary key, foreign keys and indexes"""
+    named = [(f"{table}_pkey", f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key(table)})")]
+    for column, parent in FOREIGN_KEYS.get(table, []):
+        name = f"{table}_{column}_fkey"
+        named.append((name, f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+                            f"FOREIGN KEY ({column}) REFERENCES {parent} ({primary_key(parent)})"))
+    named += [(name, _index_statement(table, name, definition)) for name, definition in INDEXES.get(table, [])]
+    return named
+
+
+def constraint_statements(table: str) -> List[str]:
+    """Keys and indexes to build after a bulk load"""
+    return [statement for _, statement in _constraints(table)] + [_sync_identity(table)]
+
+
+def migrate(conn) -> List[str]:
+    """Bring existing tables to this schema in place; returns the statements run"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT table_name, column_name, data_type, is_identity
+        FROM information_schema.columns WHERE table_schema = current_schema()
+    """)
+    existing: Dict[str, Dict[str, dict]] = {}
+    for row in cursor.fetchall():
+        existing.setdefault(row["table_name"], {})[row["column_name"]] = row
+    cursor.execute("""
+        SELECT conname AS name FROM pg_constraint WHERE connamespace = current_schema()::regnamespace
+        UNION SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()
+    """)
+    present = {row["name"] for row in cursor.fetchall()}
+
+    statements = []
+    for table in TABLES:
+        if table not in existing:
+            statements += [create_statement(table)] + constraint_statements(table)
+            continue
+        pk = primary_key(table)
+        for name, sql_type in TABLES[table]:
+            current = existing[table].get(name)
+            if current is None:
+                statements.append(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+            elif current["data_type"] != _DATA_TYPES[sql_type]:
+                # Via text so INTEGER 0/1 flags become booleans as well
+                statements.append(f"ALTER TABLE {table} ALTER COLUMN {name} TYPE {sql_type} "
+                                  f"USING {name}::text::{sql_type}")
+        statements += [statement for name, statement in _constraints(table) if name not in present]
+        if existing[table].get(pk, {}).get("is_identity") != "YES":
+            statements.append(f"ALTER TABLE {table} ALTER COLUMN {pk} ADD GENERATED BY DEFAULT AS IDENTITY")
+            statements.append(_sync_identity(table))
+    statements += [f"DROP INDEX {name}" for name in RETIRED_INDEXES if name in present]
+
+    for statement in statements:
+        cursor.execute(statement)
+    for table in TABLES:
+        cursor.execute(f"ANALYZE {table}")
+    conn.commit()
+    cursor.close()
+    return statements
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create or migrate the hospital schema")
+    parser.add_argument("--migrate", action="store_true", help="Migrate the configured database in place")
+    parser.add_argument("--print", action="store_true", help="Print the DDL for a fresh database")
+    args = parser.parse_args()
+
+    if args.print or not args.migrate:
+        for table in TABLES:
+            print(f"{create_statement(table)};")
+        for table in TABLES:
+            for statement in constraint_statements(table):
+                print(f"{statement};")
+    if args.migrate:
+        with db.get_connection() as conn:
+            applied = migrate(conn)
+        print(f"Applied {len(applied)} statement(s)")
+        for statement in applied:
+            print(f"  {statement}")
@@ -1,6 +1,8 @@
 import strawberry
-from typing import Optional, List
-from datetime import datetime
+from typing import Generic, Optional, List, TypeVar
+from datetime import date, datetime
+
+T = TypeVar("T")
 
 @strawberry.type
 class Medicine:
@@ -28,6 +30,10 @@ class Inventory:
     last_restocked_date: str = strawberry.field(name="lastRestockedDate")
     last_updated: str = strawberry.field(name="lastUpdated")
 
+    @strawberry.field
+    async def medicine(self, info: strawberry.Info) -> Optional[Medicine]:
+        return await info.context["loaders"].medicine.load(self.medicine_id, info)
+
 @strawberry.type
 class Patient:
     patient_id: int = strawberry.field(name="patientId")
@@ -58,6 +64,14 @@ class ERVisit:
     created_at: str = strawberry.field(name="createdAt")
     updated_at: str = strawberry.field(name="updatedAt")
 
+    @strawberry.field
+    async def patient(self, info: strawberry.Info) -> Optional[Patient]:
+        return await info.context["loaders"].patient.load(self.patient_id, info)
+
+    @strawberry.field(name="attendingStaff")
+    async def attending_staff(self, info: strawberry.Info) -> Optional["Staff"]:
+        return await info.context["loaders"].staff.load(self.attending_staff_id, info)
+
 @strawberry.type
 class Staff:
     staff_id: int = strawberry.field(name="staffId")
@@ -87,6 +101,10 @@ class Schedule:
     created_at: str = strawberry.field(name="createdAt")
     updated_at: str = strawberry.field(name="updatedAt")
 
+    @strawberry.field
+    async def staff(self, info: strawberry.Info) -> Optional[Staff]:
+        return await info.context["loaders"].staff.load(self.staff_id, info)
+
 @strawberry.type
 class Supplier:
     supplier_id: int = strawberry.field(name="supplierId")
@@ -115,6 +133,14 @@ class SupplierMedicine:
     last_supplied_date: Optional[str] = strawberry.field(default=None, name="lastSuppliedDate")
     created_at: str = strawberry.field(name="createdAt")
 
+    @strawberry.field
+    async def supplier(self, info: strawberry.Info) -> Optional[Supplier]:
+        return await info.context["loaders"].supplier.load(self.supplier_id, info)
+
+    @strawberry.field
+    async def medicine(self, info: strawberry.Info) -> Optional[Medicine]:
+        return await info.context["loaders"].medicine.load(self.medicine_id, info)
+
 @strawberry.type
 class EnvironmentalData:
     env_data_id: int = strawberry.field(name="envDataId")
@@ -129,6 +155,48 @@ class EnvironmentalData:
     source: str
     created_at: str = strawberry.field(name="createdAt")
 
+# Relay-style pages (backend/graphql/pagination.py)
+@strawberry.type
+class PageInfo:
+    has_next_page: bool = strawberry.field(name="hasNextPage")
+    end_cursor: Optional[str] = strawberry.field(default=None, name="endCursor")
+
+@strawberry.type
+class Edge(Generic[T]):
+    node: T
+    cursor: str
+
+@strawberry.type
+class Connection(Generic[T]):
+    edges: List[Edge[T]]
+    page_info: PageInfo = strawberry.field(name="pageInfo")
+
+# Collection filters; `since` is inclusive and `until` exclusive
+@strawberry.input
+class ERVisitFilter:
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    severity: Optional[str] = None
+
+@strawberry.input
+class ScheduleFilter:
+    since: Optional[date] = None
+    until: Optional[date] = None
+
+@strawberry.input
+class EnvironmentalDataFilter:
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    location: Optional[str] = None
+
+@strawberry.input
+class InventoryFilter:
+    location: Optional[str] = None
+
+@strawberry.input
+class MedicineFilter:
+    category: Optional[str] = None
+
 # Input types for mutations
 @strawberry.input
 class PatientInput:
@@ -0,0 +1,129 @@
+"""
+Bulk loader for the seed dumps in sql_files/.
+
+Each table is recreated from backend.schema and its rows are streamed through
+`COPY ... FROM STDIN` in CSV batches, one transaction per table. Keys and
+indexes are built once the data is in, then the table is ANALYZEd. Rows come
+from the .sql dumps (parsed with engine.seed_data) or, with --csv-dir, from
+<table>.csv files with a header row. Tables without either are created empty.
+
+--scale N loads N copies of each table, each copy's primary key offset past
+the previous one (foreign keys keep pointing at the original rows), for load
+and query-plan testing at production-like sizes.
+
+Usage:
+    python -m backend.seed_loader
+    python -m backend.seed_loader --scale 100
+    python -m backend.seed_loader --csv-dir exports/ --tables er_visits patients
+"""
+import argparse
+import csv
+import io
+import os
+import time
+from typing import Iterator, List
+from backend.database import db
+from backend.schema import TABLES, columns, constraint_statements, create_statement, migrate
+from engine.seed_data import dump_path, iter_rows
+
+BATCH_ROWS = 50_000
+# One offer per (supplier, medicine): copies would break the unique key, so --scale skips it
+UNSCALED = {"supplier_medicines"}
+
+
+def _field(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "1" if value else "0"  # Accepted by both INTEGER and BOOLEAN columns
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+def has_source(table: str, csv_dir: str = None) -> bool:
+    return os.path.exists(os.path.join(csv_dir, f"{table}.csv") if csv_dir else dump_path(table))
+
+
+def source_rows(table: str, columns: List[str], csv_dir: str = None) -> Iterator[list]:
+    if csv_dir is None:
+        for row in iter_rows(table):
+            yield [row.get(col) for col in columns]
+        return
+    with open(os.path.join(csv_dir, f"{table}.csv"), newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        if header != columns:
+            raise ValueError(f"{table}.csv columns {header} do not match {columns}")
+        for row in reader:
+            yield [value if value != "" else None for value in row]
+
+
+def csv_lines(rows: Iterator[list], scale: int) -> Iterator[str]:
+    """CSV lines for COPY; with scale > 1 every row is repeated with its id (first column) offset"""
+    if scale == 1:
+        for row in rows:
+            yield ",".join(_field(v) for v in row) + "\n"
+        return
+    base = [(int(row[0]), ",".join(_field(v) for v in row[1:])) for row in rows]
+    offset = max((row_id for row_id, _ in base), default=0)
+    for copy in range(scale):
+        shift = copy * offset
+        for row_id, rest in base:
+            yield f"{row_id + shift},{rest}\n"
+
+
+def load_table(conn, table: str, scale: int = 1, csv_dir: str = None) -> int:
+    names = columns(table)
+    copy_sql = f"COPY {table} ({', '.join(names)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = conn.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
+    cursor.execute(create_statement(table))
+
+    count, batch = 0, []
+    rows = source_rows(table, names, csv_dir) if has_source(table, csv_dir) else iter(())
+    for line in csv_lines(rows, 1 if table in UNSCALED else scale):
+        batch.append(line)
+        if len(batch) == BATCH_ROWS:
+            cursor.copy_expert(copy_sql, io.StringIO("".join(batch)))
+            count += len(batch)
+            batch = []
+    if batch:
+        cursor.copy_expert(copy_sql, io.StringIO("".join(batch)))
+        count += len(batch)
+
+    for statement in constraint_statements(table):
+        cursor.execute(statement)
+    conn.commit()
+    # ANALYZE outside the load transaction so the planner sees the new row counts at once
+    cursor.execute(f"ANALYZE {table}")
+    conn.commit()
+    cursor.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load the seed dumps with COPY")
+    parser.add_argument("--tables", nargs="+", choices=list(TABLES), default=list(TABLES))
+    parser.add_argument("--scale", type=int, default=1, help="Load N copies of every row")
+    parser.add_argument("--csv-dir", help="Read <table>.csv files instead of the .sql dumps")
+    args = parser.parse_args()
+
+    print(f"{'table':<20} {'rows':>10} {'seconds':>8} {'rows/s':>10}")
+    total_rows, start = 0, time.perf_counter()
+    with db.get_connection() as conn:
+        for table in [t for t in TABLES if t in args.tables]:
+            table_start = time.perf_counter()
+            rows = load_table(conn, table, args.scale, args.csv_dir)
+            seconds = time.perf_counter() - table_start
+            total_rows += rows
+            print(f"{table:<20} {rows:>10,} {seconds:>8.2f} {rows / max(seconds, 1e-9):>10,.0f}")
+        if set(args.tables) != set(TABLES):
+            # Dropping a parent table dropped the foreign keys pointing at it
+            migrate(conn)
+    seconds = time.perf_counter() - start
+    print(f"{'TOTAL':<20} {total_rows:>10,} {seconds:>8.2f} {total_rows / seconds:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Multi-zone batch runner for the surge graph.
+
+Runs the compiled graph for many (zone, timestamp) pairs on a bounded worker
+pool. LLM requests across all runs share the slots in `llm.client`, so the
+worker count controls throughput while LLM_MAX_CONCURRENCY protects the
+provider quota. A failing zone is recorded and the rest of the batch goes on.
+
+`run_batch` uses a thread pool around `invoke`; `arun_batch` drives every run
+on a single event loop through `ainvoke`.
+
+Usage:
+    python batch.py Mumbai-West Mumbai-East Thane --time 2025-11-28T10:00:00 --workers 8
+    python batch.py Mumbai-West Mumbai-East Thane --async --workers 32
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+from config import BATCH_MAX_WORKERS
+from main import build_graph, make_initial_state
+from tracing import print_summary
+
+
+class ZoneRun(BaseModel):
+    zone: str
+    current_time: str
+    state: Optional[Dict[str, Any]] = None  # Final AgentState when the run succeeded
+    error: Optional[str] = None
+    elapsed_seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchReport(BaseModel):
+    runs: List[ZoneRun]
+    wall_seconds: float
+    succeeded: int
+    failed: int
+    mean_run_seconds: float
+    max_run_seconds: float
+
+
+def run_zone(app, zone: str, current_time: str) -> ZoneRun:
+    """Run the graph for a single zone, capturing failures instead of raising"""
+    start = time.perf_counter()
+    try:
+        state = app.invoke(make_initial_state(zone, current_time))
+        return ZoneRun(zone=zone, current_time=current_time, state=dict(state),
+                       elapsed_seconds=time.perf_counter() - start)
+    except Exception as e:
+        return ZoneRun(zone=zone, current_time=current_time, error=f"{type(e).__name__}: {e}",
+                       elapsed_seconds=time.perf_counter() - start)
+
+
+async def arun_zone(app, zone: str, current_time: str) -> ZoneRun:
+    """Async counterpart of `run_zone`"""
+    start = time.perf_counter()
+    try:
+        state = await app.ainvoke(make_initial_state(zone, current_time))
+        return ZoneRun(zone=zone, current_time=current_time, state=dict(state),
+                       elapsed_seconds=time.perf_counter() - start)
+    except Exception as e:
+        return ZoneRun(zone=zone, current_time=current_time, error=f"{type(e).__name__}: {e}",
+                       elapsed_seconds=time.perf_counter() - start)
+
+
+def _log_run(run: ZoneRun):
+    status = "OK" if run.ok else f"FAILED ({run.error})"
+    print(f"[batch] {run.zone} @ {run.current_time}: {status} in {run.elapsed_seconds:.2f}s")
+
+
+def summarize(runs: List[ZoneRun], wall_seconds: float) -> BatchReport:
+    elapsed = [run.elapsed_seconds for run in runs] or [0.0]
+    succeeded = sum(1 for run in runs if run.ok)
+    return BatchReport(
+        runs=runs,
+        wall_seconds=wall_seconds,
+        succeeded=succeeded,
+        failed=len(runs) - succeeded,
+        mean_run_seconds=sum(elapsed) / len(elapsed),
+        max_run_seconds=max(elapsed),
+    )
+
+
+def run_batch(jobs: List[Tuple[str, str]], max_workers: int = BATCH_MAX_WORKERS, app=None) -> BatchReport:
+    """
+    Run the surge graph for every (zone, current_time) job.
+
+    Results are returned in the order of `jobs`, regardless of completion order.
+    """
+    app = app or build_graph()
+    runs: List[Optional[ZoneRun]] = [None] * len(jobs)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="zone-run") as pool:
+        futures = {
+            pool.submit(run_zone, app, zone, current_time): idx
+            for idx, (zone, current_time) in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            run = future.result()
+            runs[futures[future]] = run
+            _log_run(run)
+
+    return summarize(runs, time.perf_counter() - start)
+
+
+async def arun_batch(jobs: List[Tuple[str, str]], max_concurrency: int = BATCH_MAX_WORKERS, app=None) -> BatchReport:
+    """
+    Async counterpart of `run_batch`: at most `max_concurrency` graphs are in
+    flight on the current event loop, without a thread per run.
+    """
+    app = app or build_graph()
+    gate = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(zone: str, current_time: str) -> ZoneRun:
+        async with gate:
+            run = await arun_zone(app, zone, current_time)
+        _log_run(run)
+        return run
+
+    start = time.perf_counter()
+    runs = await asyncio.gather(*(_bounded(zone, current_time) for zone, current_time in jobs))
+    return summarize(list(runs), time.perf_counter() - start)
+
+
+def print_report(report: BatchReport):
+    print("\n=== BATCH SURGE REPORT ===")
+    for run in report.runs:
+        if run.ok:
+            dec = run.state.get("final_decision")
+            risk = dec.risk_level.upper() if dec else "N/A"
+            print(f"{run.zone:<20} {run.elapsed_seconds:>7.2f}s  risk={risk}")
+        else:
+            print(f"{run.zone:<20} {run.elapsed_seconds:>7.2f}s  ERROR: {run.error}")
+    print(
+        f"\nZones: {len(report.runs)} | Succeeded: {report.succeeded} | Failed: {report.failed}\n"
+        f"Wall time: {report.wall_seconds:.2f}s | Mean run: {report.mean_run_seconds:.2f}s | "
+        f"Slowest run: {report.max_run_seconds:.2f}s"
+    )
+    print_summary([trace for run in report.runs if run.ok for trace in run.state.get("traces", [])])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the surge graph for many zones at once")
+    parser.add_argument("zones", nargs="+", help="Zones to assess, optionally as ZONE@TIMESTAMP")
+    parser.add_argument("--time", default="2025-11-28T10:00:00", help="Default timestamp for every zone")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS)
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use ainvoke on one event loop")
+    args = parser.parse_args()
+
+    jobs = []
+    for entry in args.zones:
+        zone, _, current_time = entry.partition("@")
+        jobs.append((zone, current_time or args.time))
+
+    print(f"### RUNNING BATCH SURGE GRAPH: {len(jobs)} zones, {args.workers} workers ###\n")
+    if args.use_async:
+        print_report(asyncio.run(arun_batch(jobs, max_concurrency=args.workers)))
+    else:
+        print_report(run_batch(jobs, max_workers=args.workers))
@@ -0,0 +1,74 @@
+"""
+Sync query throughput with a connection per query vs the pool.
+
+Runs the `medicines` and `patientById` resolvers' SQL through
+backend.database.Database from a thread pool against the configured
+Postgres. "connect" reproduces the old behaviour (a new psycopg2 connection
+for every query, closed afterwards) by giving the pool a zero lifetime;
+"pooled" uses the DB_POOL_* settings. Pool wait metrics are printed for both.
+
+Usage:
+    python -m benchmarks.db_pool
+    python -m benchmarks.db_pool --concurrency 1 16 --requests 5000
+"""
+import argparse
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from backend.config import settings
+from backend.database import db
+
+QUERIES = {
+    "medicines": lambda rng: ("SELECT medicine_id, name, unit_price FROM medicines ORDER BY name", ()),
+    "patientById": lambda rng: ("SELECT patient_id, name FROM patients WHERE patient_id = %s",
+                                (rng.randint(1, 5000),)),
+}
+
+
+def run(query: str, concurrency: int, requests: int) -> dict:
+    rng = random.Random(0)
+    statements = [QUERIES[query](rng) for _ in range(requests)]
+
+    def one(statement) -> float:
+        start = time.perf_counter()
+        db.execute_query(*statement)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies: List[float] = list(pool.map(one, statements))
+    wall = time.perf_counter() - start
+    return {
+        "qps": requests / wall,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p99_ms": 1000 * sorted(latencies)[int(0.99 * (len(latencies) - 1))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark query throughput with and without connection pooling")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per query and level")
+    args = parser.parse_args()
+
+    print(f"### DB POOL BENCHMARK (pool {settings.DB_POOL_MIN_SIZE}-{settings.DB_POOL_MAX_SIZE}) ###")
+    print(f"{'query':<12} {'conc':>4} {'mode':<8} {'qps':>8} {'p50 ms':>8} {'p99 ms':>8} {'waited':>7} {'mean wait ms':>12}")
+    for query in QUERIES:
+        for concurrency in args.concurrency:
+            for mode in ("connect", "pooled"):
+                if mode == "connect":
+                    db.configure_pool(min_size=0, max_size=max(concurrency, settings.DB_POOL_MAX_SIZE),
+                                      max_lifetime=0)
+                else:
+                    db.configure_pool()
+                r = run(query, concurrency, args.requests)
+                stats = db.pool.stats()
+                print(f"{query:<12} {concurrency:>4} {mode:<8} {r['qps']:>8.0f} {r['p50_ms']:>8.2f} "
+                      f"{r['p99_ms']:>8.2f} {stats['waited']:>7} {stats['mean_wait_ms']:>12.3f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
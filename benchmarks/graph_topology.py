@@ -0,0 +1,51 @@
+"""
+Wall-clock comparison of the sequential and parallel surge graphs.
+
+Usage:
+    python -m benchmarks.graph_topology --runs 3 --zone Mumbai-West
+"""
+import argparse
+import statistics
+import time
+
+from main import build_graph, make_initial_state
+
+
+def time_graph(app, zone: str, current_time: str, runs: int):
+    """Invoke the compiled graph `runs` times and return per-run wall times (seconds)."""
+    timings = []
+    for _ in range(runs):
+        state = make_initial_state(zone, current_time)
+        start = time.perf_counter()
+        app.invoke(state)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential vs parallel graph latency")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--zone", default="Mumbai-West")
+    parser.add_argument("--time", default="2025-11-28T10:00:00")
+    args = parser.parse_args()
+
+    results = {}
+    for label, parallel in (("sequential", False), ("parallel", True)):
+        print(f"### Timing {label} graph ({args.runs} runs) ###")
+        results[label] = time_graph(build_graph(parallel=parallel), args.zone, args.time, args.runs)
+
+    print("\n=== GRAPH TOPOLOGY TIMINGS (seconds) ===")
+    print(f"{'topology':<12} {'mean':>8} {'median':>8} {'min':>8} {'max':>8}")
+    for label, timings in results.items():
+        print(
+            f"{label:<12} {statistics.mean(timings):>8.2f} {statistics.median(timings):>8.2f} "
+            f"{min(timings):>8.2f} {max(timings):>8.2f}"
+        )
+
+    seq = statistics.mean(results["sequential"])
+    par = statistics.mean(results["parallel"])
+    print(f"\nSpeed-up: {seq / par:.2f}x ({seq - par:.2f}s saved per run)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Concurrent GraphQL dashboard queries against the backend app in-process.
+
+Requests go through FastAPI and the strawberry router via httpx's ASGI
+transport on one event loop, the way a single uvicorn worker serves them.
+Each level runs `--requests` queries with that many clients in flight.
+
+A local Postgres answers in well under a millisecond, so the run is CPU-bound
+unless --db-rtt-ms routes the app's connections through a proxy (on its own
+thread) that delays traffic like a network hop to a managed database.
+
+Usage:
+    python -m benchmarks.graphql_concurrency
+    python -m benchmarks.graphql_concurrency --db-rtt-ms 5 --concurrency 1 100 500 --requests 3000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+import httpx
+from backend.config import settings
+from backend.database import adb
+from backend.main import app
+
+QUERIES = [
+    lambda rng: f"{{ patientById(patientId: {rng.randint(1, 5000)}) {{ patientId name bloodGroup }} }}",
+    lambda rng: "{ erVisits(first: 20) { edges { node { visitId severity visitDatetime } } } }",
+    lambda rng: "{ lowStockMedicines { inventoryId currentStock reorderLevel } }",
+]
+
+
+def start_latency_proxy(rtt_ms: float) -> int:
+    """Forward to the configured Postgres, delaying each chunk by half the RTT; returns the port"""
+    ready = threading.Event()
+    port = []
+    upstream = (settings.DB_HOST, settings.DB_PORT)
+
+    async def pipe(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                await asyncio.sleep(rtt_ms / 2000)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        upstream_reader, upstream_writer = await asyncio.open_connection(*upstream)
+        await asyncio.gather(pipe(client_reader, upstream_writer), pipe(upstream_reader, client_writer))
+
+    async def serve():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    ready.wait()
+    return port[0]
+
+
+async def run_level(concurrency: int, requests: int) -> dict:
+    rng = random.Random(concurrency)
+    documents = [rng.choice(QUERIES)(rng) for _ in range(requests)]
+    gate = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def one(document: str) -> float:
+            async with gate:
+                start = time.perf_counter()
+                response = await client.post("/graphql", json={"query": document})
+                body = response.json()
+                if response.status_code != 200 or body.get("errors"):
+                    raise RuntimeError(body.get("errors") or response.text)
+                return time.perf_counter() - start
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one(d) for d in documents))
+        wall = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    return {
+        "qps": requests / wall,
+        "p50_ms": 1000 * statistics.median(ordered),
+        "p99_ms": 1000 * ordered[int(0.99 * (len(ordered) - 1))],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent GraphQL queries on one worker")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 50, 200])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--db-rtt-ms", type=float, default=0.0, help="Simulated round trip to Postgres")
+    args = parser.parse_args()
+
+    if args.db_rtt_ms:
+        # Before the first query, so every pooled connection goes through the proxy
+        settings.DB_HOST, settings.DB_PORT = "127.0.0.1", start_latency_proxy(args.db_rtt_ms)
+
+    print(f"### GRAPHQL CONCURRENCY (one event loop, db rtt {args.db_rtt_ms:g} ms) ###")
+    print(f"{'clients':>7} {'qps':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in args.concurrency:
+        r = await run_level(concurrency, args.requests)
+        print(f"{concurrency:>7} {r['qps']:>8.0f} {r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f}")
+    await adb.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+GraphQL queries with and without column projection.
+
+Runs a few narrow dashboard selections through the ASGI app with
+GRAPHQL_COLUMN_PROJECTION off (every column of each table, as before) and on
+(only the selected columns). "kB" is the size of the values Postgres sent
+back, as text; "ms" is the mean time per query.
+
+Usage:
+    python -m benchmarks.graphql_projection
+    python -m benchmarks.graphql_projection --repeat 50 --db-rtt-ms 5
+"""
+import argparse
+import asyncio
+import time
+import httpx
+from backend.config import settings
+from backend.database import adb
+from backend.main import app
+from benchmarks.graphql_concurrency import start_latency_proxy
+
+QUERIES = {
+    "erVisits 500": "{ erVisits(first: 500) { edges { node { visitId severity visitDatetime } } } }",
+    "erVisits 100 + patient": "{ erVisits(first: 100) { edges { node { severity patient { name } } } } }",
+    "staff 500": "{ staff(first: 500) { edges { node { name role department } } } }",
+    "lowStockMedicines": "{ lowStockMedicines { currentStock medicine { name } } }",
+}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark selection-driven column projection")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--db-rtt-ms", type=float, default=0.0, help="Simulated round trip to Postgres")
+    args = parser.parse_args()
+
+    if args.db_rtt_ms:
+        settings.DB_HOST, settings.DB_PORT = "127.0.0.1", start_latency_proxy(args.db_rtt_ms)
+
+    received = [0]
+    execute_query = adb.execute_query
+
+    async def measured(*a, **kw):
+        rows = await execute_query(*a, **kw)
+        received[0] += sum(len(str(value)) for row in rows for value in row.values())
+        return rows
+
+    adb.execute_query = measured
+
+    print(f"### GRAPHQL PROJECTION (db rtt {args.db_rtt_ms:g} ms) ###")
+    print(f"{'query':<24} {'projection':<10} {'kB':>8} {'ms':>8}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        for name, query in QUERIES.items():
+            for projection in (False, True):
+                settings.GRAPHQL_COLUMN_PROJECTION = projection
+                await client.post("/graphql", json={"query": query})  # Warm-up
+                received[0] = 0
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    body = (await client.post("/graphql", json={"query": query})).json()
+                    if body.get("errors"):
+                        raise RuntimeError(body["errors"])
+                ms = 1000 * (time.perf_counter() - start) / args.repeat
+                kb = received[0] / args.repeat / 1024
+                print(f"{name:<24} {'on' if projection else 'off':<10} {kb:>8.1f} {ms:>8.2f}")
+    await adb.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Nested relationship fields vs per-id follow-up queries.
+
+"follow-up" is what clients had to do before the relationship fields: fetch
+`erVisits`, then one `patientById` and one `staffById` request per visit, all
+in flight at once. "nested" asks for `patient` and `attendingStaff` in the
+same query and lets the per-request DataLoaders batch them. Both run through
+the ASGI app on one event loop; SQL statements are counted on the async pool.
+
+Usage:
+    python -m benchmarks.graphql_relations
+    python -m benchmarks.graphql_relations --visits 200 --db-rtt-ms 5
+"""
+import argparse
+import asyncio
+import time
+import httpx
+from backend.config import settings
+from backend.database import adb
+from backend.main import app
+from benchmarks.graphql_concurrency import start_latency_proxy
+
+VISITS = "{{ erVisits(first: {n}) {{ edges {{ node {{ visitId patientId attendingStaffId }} }} }} }}"
+NESTED = ("{{ erVisits(first: {n}) {{ edges {{ node {{ "
+          "visitId patient {{ name bloodGroup }} attendingStaff {{ name role }} }} }} }} }}")
+PATIENT = "{{ patientById(patientId: {id}) {{ name bloodGroup }} }}"
+STAFF = "{{ staffById(staffId: {id}) {{ name role }} }}"
+
+
+async def follow_up(client, n: int) -> int:
+    visits = [edge["node"] for edge in (await post(client, VISITS.format(n=n)))["erVisits"]["edges"]]
+    lookups = [PATIENT.format(id=v["patientId"]) for v in visits] + \
+              [STAFF.format(id=v["attendingStaffId"]) for v in visits]
+    await asyncio.gather(*(post(client, q) for q in lookups))
+    return 1 + len(lookups)
+
+
+async def nested(client, n: int) -> int:
+    await post(client, NESTED.format(n=n))
+    return 1
+
+
+async def post(client, query: str) -> dict:
+    body = (await client.post("/graphql", json={"query": query})).json()
+    if body.get("errors"):
+        raise RuntimeError(body["errors"])
+    return body["data"]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark nested relationship fields against follow-up queries")
+    parser.add_argument("--visits", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db-rtt-ms", type=float, default=0.0, help="Simulated round trip to Postgres")
+    args = parser.parse_args()
+
+    if args.db_rtt_ms:
+        settings.DB_HOST, settings.DB_PORT = "127.0.0.1", start_latency_proxy(args.db_rtt_ms)
+
+    statements = [0]
+    execute_query = adb.execute_query
+
+    async def counted(*a, **kw):
+        statements[0] += 1
+        return await execute_query(*a, **kw)
+
+    adb.execute_query = counted
+
+    print(f"### GRAPHQL RELATIONS (db rtt {args.db_rtt_ms:g} ms) ###")
+    print(f"{'visits':>6} {'mode':<10} {'requests':>8} {'sql':>5} {'ms':>9}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        await nested(client, 1)  # Open the pool outside the timings
+        for n in args.visits:
+            for name, run in (("follow-up", follow_up), ("nested", nested)):
+                statements[0] = 0
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    requests = await run(client, n)
+                ms = 1000 * (time.perf_counter() - start) / args.repeat
+                print(f"{n:>6} {name:<10} {requests:>8} {statements[0] // args.repeat:>5} {ms:>9.2f}")
+    await adb.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""
+End-to-end throughput, latency and memory of the surge graph on the fake LLM.
+
+Every run goes through the full graph (retrieval, forecaster, all nine nodes,
+payment simulation) with LLM calls answered by llm/fake.py, so results are
+reproducible offline and comparable from change to change. The response cache
+is disabled so every run pays for its LLM calls.
+
+Usage:
+    python -m benchmarks.pipeline                       # 1, 10 and 100 concurrent runs
+    python -m benchmarks.pipeline --concurrency 1 10 --latency 0.05 --json baseline.json
+    python -m benchmarks.pipeline --mode threads
+"""
+import os
+
+# Must be set before config is imported
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+ZONES = ["Mumbai-West", "Mumbai-East", "Thane", "Navi-Mumbai", "Pune"]
+CURRENT_TIME = "2025-11-28T10:00:00"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+async def _async_level(app, make_initial_state, concurrency: int, runs: int) -> List[float]:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> float:
+        async with gate:
+            state = make_initial_state(ZONES[i % len(ZONES)], CURRENT_TIME)
+            start = time.perf_counter()
+            await app.ainvoke(state)
+            return time.perf_counter() - start
+
+    return list(await asyncio.gather(*(one(i) for i in range(runs))))
+
+
+def _threaded_level(app, make_initial_state, concurrency: int, runs: int) -> List[float]:
+    def one(i: int) -> float:
+        state = make_initial_state(ZONES[i % len(ZONES)], CURRENT_TIME)
+        start = time.perf_counter()
+        app.invoke(state)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, range(runs)))
+
+
+def run_level(app, make_initial_state, concurrency: int, runs: int, mode: str) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    # Node banners and per-run warnings would dominate the output at 100 concurrent runs
+    logging.disable(logging.WARNING)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            if mode == "async":
+                latencies = asyncio.run(_async_level(app, make_initial_state, concurrency, runs))
+            else:
+                latencies = _threaded_level(app, make_initial_state, concurrency, runs)
+    finally:
+        logging.disable(logging.NOTSET)
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "concurrency": concurrency,
+        "runs": runs,
+        "wall_seconds": round(wall, 3),
+        "runs_per_second": round(runs / wall, 2),
+        "p50_seconds": round(statistics.median(latencies), 3),
+        "p99_seconds": round(percentile(latencies, 99), 3),
+        "peak_memory_mb": round(peak / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the surge graph end to end on the fake LLM")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--runs", type=int, default=0, help="Runs per level (default: max(10, 2 x concurrency))")
+    parser.add_argument("--latency", type=float, help="Override FAKE_LLM_LATENCY_SECONDS")
+    parser.add_argument("--mode", choices=["async", "threads"], default="async")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    if args.latency is not None:
+        os.environ["FAKE_LLM_LATENCY_SECONDS"] = str(args.latency)
+
+    from config import FAKE_LLM_LATENCY_SECONDS, LLM_BACKEND, LLM_MAX_CONCURRENCY
+    from main import build_graph, make_initial_state
+    if LLM_BACKEND != "fake":
+        sys.exit("benchmarks.pipeline only runs against LLM_BACKEND=fake")
+
+    app = build_graph()
+    make_initial_state(ZONES[0], CURRENT_TIME)  # Warm the RAG index, feature store and forecaster
+
+    print(f"### PIPELINE BENCHMARK ({args.mode}, fake LLM latency {FAKE_LLM_LATENCY_SECONDS}s, "
+          f"LLM_MAX_CONCURRENCY={LLM_MAX_CONCURRENCY}) ###")
+    results = []
+    for concurrency in args.concurrency:
+        runs = args.runs or max(10, 2 * concurrency)
+        results.append(run_level(app, make_initial_state, concurrency, runs, args.mode))
+        print(f"  concurrency {concurrency}: done")
+
+    print(f"\n{'concurrency':>11} {'runs':>5} {'wall s':>8} {'runs/s':>8} {'p50 s':>7} {'p99 s':>7} {'peak MB':>8}")
+    for r in results:
+        print(f"{r['concurrency']:>11} {r['runs']:>5} {r['wall_seconds']:>8.2f} {r['runs_per_second']:>8.2f} "
+              f"{r['p50_seconds']:>7.3f} {r['p99_seconds']:>7.3f} {r['peak_memory_mb']:>8.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"mode": args.mode, "fake_latency_seconds": FAKE_LLM_LATENCY_SECONDS,
+                       "llm_max_concurrency": LLM_MAX_CONCURRENCY, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Orchestrator prompt size, full model dumps vs compact inputs.
+
+Runs the surge graph on the fake LLM for each zone, then renders the
+orchestrator prompt from the final state both ways and compares estimated
+tokens (four characters per token, as llm/fake.py reports usage).
+
+Usage:
+    python -m benchmarks.prompt_compaction
+    python -m benchmarks.prompt_compaction --budget 250
+"""
+import os
+
+# Must be set before config is imported
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+
+import argparse
+import contextlib
+import logging
+import statistics
+import sys
+
+ZONES = ["Mumbai-West", "Mumbai-East", "Thane", "Navi-Mumbai", "Pune"]
+CURRENT_TIME = "2025-11-28T10:00:00"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and compact orchestrator prompt sizes")
+    parser.add_argument("--budget", type=int, help="Override ORCHESTRATOR_PROMPT_TOKEN_BUDGET")
+    args = parser.parse_args()
+
+    from config import LLM_BACKEND, ORCHESTRATOR_PROMPT_TOKEN_BUDGET
+    from agents.orchestrator import _compact_inputs, _full_inputs, prompt_tokens
+    from main import build_graph, make_initial_state
+    if LLM_BACKEND != "fake":
+        sys.exit("benchmarks.prompt_compaction only runs against LLM_BACKEND=fake")
+    budget = args.budget or ORCHESTRATOR_PROMPT_TOKEN_BUDGET
+
+    app = build_graph()
+    print(f"### ORCHESTRATOR PROMPT COMPACTION (budget {budget} tokens) ###")
+    print(f"{'zone':<12} {'full':>6} {'compact':>8} {'saved':>7}")
+    full_sizes, compact_sizes = [], []
+    for zone in ZONES:
+        logging.disable(logging.WARNING)
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                state = app.invoke(make_initial_state(zone, CURRENT_TIME))
+        finally:
+            logging.disable(logging.NOTSET)
+        full = prompt_tokens(_full_inputs(state))
+        compact = prompt_tokens(_compact_inputs(state, budget))
+        full_sizes.append(full)
+        compact_sizes.append(compact)
+        print(f"{zone:<12} {full:>6} {compact:>8} {1 - compact / full:>7.0%}")
+
+    full_mean, compact_mean = statistics.mean(full_sizes), statistics.mean(compact_sizes)
+    print(f"{'MEAN':<12} {full_mean:>6.0f} {compact_mean:>8.0f} {1 - compact_mean / full_mean:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
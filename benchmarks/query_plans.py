@@ -0,0 +1,105 @@
+"""
+Query plans for the GraphQL resolvers' SQL on the configured Postgres.
+
+Each query is run under EXPLAIN ANALYZE twice: normally, and with index and
+bitmap scans disabled (what the planner had to do before backend.schema added
+keys and indexes). The table shows the scan the planner chose and both
+execution times. The "midway" rows fetch the page halfway through er_visits
+with a keyset cursor, as the erVisits connection does, and with OFFSET.
+
+Usage:
+    python -m benchmarks.query_plans --load-scale 100   # reload ~1M ER visits first
+    python -m benchmarks.query_plans
+"""
+import argparse
+import json
+from typing import List, Tuple
+from backend.database import db
+
+QUERIES: List[Tuple[str, str, tuple]] = [
+    ("medicineById", "SELECT * FROM medicines WHERE medicine_id = %s", (150,)),
+    ("patientById", "SELECT * FROM patients WHERE patient_id = %s", (4321,)),
+    ("staffById", "SELECT * FROM staff WHERE staff_id = %s", (250,)),
+    ("supplierById", "SELECT * FROM suppliers WHERE supplier_id = %s", (12,)),
+    ("erVisitById", "SELECT * FROM er_visits WHERE visit_id = %s", (987654,)),
+    ("erVisits", "SELECT * FROM er_visits ORDER BY visit_datetime DESC, visit_id DESC LIMIT %s", (100,)),
+    ("erVisits severity", "SELECT * FROM er_visits WHERE severity = %s "
+                          "ORDER BY visit_datetime DESC, visit_id DESC LIMIT %s", ("Critical", 100)),
+    ("erVisits by patient", "SELECT * FROM er_visits WHERE patient_id = %s", (103,)),
+    ("schedules", "SELECT * FROM schedules ORDER BY shift_date DESC, schedule_id DESC LIMIT %s", (100,)),
+    ("environmentalData", "SELECT * FROM environmental_data "
+                          "ORDER BY recorded_at DESC, env_data_id DESC LIMIT %s", (100,)),
+    ("medicines", "SELECT * FROM medicines ORDER BY name, medicine_id LIMIT %s", (100,)),
+    ("lowStockMedicines", "SELECT * FROM inventory WHERE current_stock <= reorder_level", ()),
+    ("supplier offer", "SELECT * FROM supplier_medicines WHERE supplier_id = %s AND medicine_id = %s", (1, 300)),
+]
+
+_NO_INDEXES = ("SET enable_indexscan = off", "SET enable_bitmapscan = off", "SET enable_indexonlyscan = off")
+
+
+def _scans(plan: dict) -> List[str]:
+    """Scan nodes of a plan tree, e.g. 'Index Scan using er_visits_pkey'"""
+    found = []
+    if plan["Node Type"].endswith("Scan"):
+        index = plan.get("Index Name")
+        found.append(f"{plan['Node Type']} using {index}" if index else plan["Node Type"])
+    for child in plan.get("Plans", []):
+        found += _scans(child)
+    return found
+
+
+def midway_queries(cursor) -> List[Tuple[str, str, tuple]]:
+    """The page halfway through er_visits, by keyset cursor and by OFFSET"""
+    order = "ORDER BY visit_datetime DESC, visit_id DESC"
+    cursor.execute("SELECT count(*) / 2 AS n FROM er_visits")
+    offset = cursor.fetchone()["n"]
+    cursor.execute(f"SELECT visit_datetime, visit_id FROM er_visits {order} OFFSET %s LIMIT 1", (offset,))
+    row = cursor.fetchone()
+    if row is None:
+        return []
+    return [
+        ("erVisits midway keyset", f"SELECT * FROM er_visits WHERE (visit_datetime, visit_id) < (%s, %s) "
+                                   f"{order} LIMIT %s", (row["visit_datetime"], row["visit_id"], 100)),
+        ("erVisits midway OFFSET", f"SELECT * FROM er_visits {order} OFFSET %s LIMIT %s", (offset + 1, 100)),
+    ]
+
+
+def explain(cursor, sql: str, params: tuple) -> Tuple[List[str], float]:
+    cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", params)
+    result = cursor.fetchone()
+    plan = (result["QUERY PLAN"] if isinstance(result, dict) else result[0])[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)[0]
+    return _scans(plan["Plan"]), plan["Execution Time"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE the resolver queries with and without indexes")
+    parser.add_argument("--load-scale", type=int, help="Reload the seed data at this scale first")
+    args = parser.parse_args()
+
+    if args.load_scale:
+        from backend.seed_loader import TABLES, load_table
+        with db.get_connection() as conn:
+            for table in TABLES:
+                load_table(conn, table, args.load_scale)
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT count(*) AS n FROM er_visits")
+        print(f"### QUERY PLANS ({cursor.fetchone()['n']:,} ER visits) ###")
+        print(f"{'query':<22} {'plan':<70} {'ms':>8} {'no-index ms':>12}")
+        for name, sql, params in QUERIES + midway_queries(cursor):
+            explain(cursor, sql, params)  # Warm the buffer cache for both runs
+            scans, ms = explain(cursor, sql, params)
+            for statement in _NO_INDEXES:
+                cursor.execute(statement)
+            _, seq_ms = explain(cursor, sql, params)
+            cursor.execute("RESET ALL")
+            print(f"{name:<22} {', '.join(scans):<70} {ms:>8.3f} {seq_ms:>12.3f}")
+        conn.rollback()
+        cursor.close()
+
+
+if __name__ == "__main__":
+    main()
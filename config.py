@@ -9,18 +9,121 @@ AP2_GATEWAY_URL = os.getenv("AP2_GATEWAY_URL", "http://localhost:8002")
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
-# --- HEAVY LIFTER (Reasoning, Clinical Context, Orchestration) ---
-# Using Gemini 2.0 Flash
-llm_heavy = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash",
-    temperature=0.2,
-    google_api_key=os.getenv("GOOGLE_API_KEY")
-)
-
-# --- LIGHT WEIGHT (Formatting, Math, Standard Procedures) ---
-# Using Gemini 2.0 Flash
-llm_light = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash",
-    temperature=0,
-    google_api_key=os.getenv("GOOGLE_API_KEY")
-)
\ No newline at end of file
+# --- CONCURRENCY (Batch runs) ---
+# Upper bound on LLM requests in flight across every graph run in this process
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Zone runs executed side by side by batch.py
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
+# --- LLM BACKEND ---
+# "gemini": Google Generative AI | "fake": deterministic offline responses (llm/fake.py)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+# Mean simulated latency of a fake LLM call (+/-25%, deterministic per prompt)
+FAKE_LLM_LATENCY_SECONDS = float(os.getenv("FAKE_LLM_LATENCY_SECONDS", "0.2"))
+
+# --- LLM RESPONSE CACHE ---
+# Structured responses keyed on model, temperature, rendered prompt and schema
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_responses.sqlite3")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# --- LLM ROUTING (llm/router.py) ---
+# Model health (latency samples, circuit breakers) survives restarts here
+LLM_ROUTER_STATE_PATH = os.getenv("LLM_ROUTER_STATE_PATH", ".cache/llm_router.json")
+# Fire a backup model when the primary has not answered within its p95 latency
+LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "True").lower() == "true"
+
+# --- CHECKPOINTS ---
+# LangGraph state after every completed step, so failed runs can be resumed (runs.py)
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", ".cache/checkpoints.sqlite3")
+
+# --- RAG INDEX ---
+# Memory-mapped vector segments + document metadata (engine/retriever.py)
+RAG_INDEX_DIR = os.getenv("RAG_INDEX_DIR", ".cache/rag_index")
+
+# --- EVIDENCE FEATURES ---
+# Zone the seed ER visits and environmental readings belong to (engine/features.py)
+HOSPITAL_ZONE = os.getenv("HOSPITAL_ZONE", "Mumbai-West")
+
+# --- SURGE FORECASTER (Doctor) ---
+# The statistical forecast (engine/forecaster.py) is used as-is at or above this
+# backtest-calibrated confidence; below it the doctor agent asks the LLM.
+FORECAST_MIN_CONFIDENCE = float(os.getenv("FORECAST_MIN_CONFIDENCE", "0.7"))
+
+# --- PLANNING MODE (Pharmacy & Operations) ---
+# "rules":  quantities and costs computed in Python (engine/planning.py), no LLM call
+# "hybrid": rules for the numbers, LLM only for the narrative gap analysis
+# "llm":    the original prompt-only agents
+PLANNING_MODE = os.getenv("PLANNING_MODE", "rules").lower()
+
+# --- SUPPLIER QUOTING ---
+# Every (item, candidate supplier) pair is quoted concurrently; the timeout
+# covers the supplier call only, not time queued for a free worker
+SUPPLIER_QUOTE_TIMEOUT_SECONDS = float(os.getenv("SUPPLIER_QUOTE_TIMEOUT_SECONDS", "5"))
+SUPPLIER_QUOTE_CONCURRENCY = int(os.getenv("SUPPLIER_QUOTE_CONCURRENCY", "16"))
+# "api": live supplier quotes | "catalog": optimise over the supplier_medicines catalog
+SUPPLIER_SOURCE = os.getenv("SUPPLIER_SOURCE", "api").lower()
+# Catalog suppliers must deliver within this many hours to be considered
+SUPPLIER_ETA_DEADLINE_HOURS = int(os.getenv("SUPPLIER_ETA_DEADLINE_HOURS", str(7 * 24)))
+# Agent medicine id -> catalog medicine_id, e.g. "med_1=271,med_2=138". Lines without an
+# entry are matched by exact catalog name and are reported as NO QUOTE otherwise.
+SUPPLIER_CATALOG_IDS = {
+    key.strip(): int(value)
+    for key, value in (pair.split("=", 1) for pair in os.getenv("SUPPLIER_CATALOG_IDS", "").split(",") if pair.strip())
+}
+
+# --- DECISION MODE (Orchestrator) ---
+# "rules":  GO/NO-GO computed in Python (engine/decision.py); LLM only reviews borderline runs
+# "hybrid": as "rules", plus an LLM-written execution plan on every run
+# "llm":    the original prompt-only decision
+DECISION_MODE = os.getenv("DECISION_MODE", "rules").lower()
+
+# --- ORCHESTRATOR PROMPT ---
+# "compact": decision-relevant fields and precomputed totals (engine/prompt_compaction.py)
+# "full":    every sub-agent model dumped as JSON
+ORCHESTRATOR_PROMPT_MODE = os.getenv("ORCHESTRATOR_PROMPT_MODE", "compact").lower()
+# Optional detail is dropped from the compact prompt until it fits (estimated tokens)
+ORCHESTRATOR_PROMPT_TOKEN_BUDGET = int(os.getenv("ORCHESTRATOR_PROMPT_TOKEN_BUDGET", "400"))
+
+# --- LLM CLIENTS ---
+# Gemini clients are only built for the gemini backend, so the fake backend
+# needs no API key.
+if LLM_BACKEND == "fake":
+    # Imported last: llm/ reads the settings above when it is first imported
+    from llm.fake import FakeChatModel
+    llm_heavy = FakeChatModel("gemini-2.0-flash", temperature=0.2, latency_seconds=FAKE_LLM_LATENCY_SECONDS)
+    llm_light = FakeChatModel("gemini-2.0-flash", temperature=0, latency_seconds=FAKE_LLM_LATENCY_SECONDS)
+    llm_lite = FakeChatModel("gemini-2.0-flash-lite", temperature=0, latency_seconds=FAKE_LLM_LATENCY_SECONDS)
+    llm_nano = FakeChatModel("models/nano-banana-pro-preview", temperature=0.7, latency_seconds=FAKE_LLM_LATENCY_SECONDS)
+else:
+    # --- HEAVY LIFTER (Reasoning, Clinical Context, Orchestration) ---
+    # Using Gemini 2.0 Flash
+    llm_heavy = ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash",
+        temperature=0.2,
+        google_api_key=os.getenv("GOOGLE_API_KEY")
+    )
+
+    # --- LIGHT WEIGHT (Formatting, Math, Standard Procedures) ---
+    # Using Gemini 2.0 Flash
+    llm_light = ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash",
+        temperature=0,
+        google_api_key=os.getenv("GOOGLE_API_KEY")
+    )
+
+    # --- BUDGET (Fallback / hedge target for the router) ---
+    # Using Gemini 2.0 Flash-Lite
+    llm_lite = ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash-lite",
+        temperature=0,
+        google_api_key=os.getenv("GOOGLE_API_KEY")
+    )
+
+    # --- IMAGE / INFOGRAPHIC MODEL ---
+    llm_nano = ChatGoogleGenerativeAI(
+        model="models/nano-banana-pro-preview",
+        temperature=0.7,
+        google_api_key=os.getenv("GOOGLE_API_KEY")
+    )
@@ -0,0 +1,130 @@
+"""
+Deterministic GO/NO-GO rules for the orchestrator.
+
+The orchestrator prompt's rules, evaluated in Python: human approval is
+required when the total cost (procurement + labor) exceeds 50,000 INR, the
+supplier logistics risk is high, or the forecast confidence is below 0.7.
+A plan that needs human approval is not auto-approved, so payment waits.
+
+A check is borderline when the cost or confidence sits within a small margin
+of its threshold without crossing it; those runs are the ones worth a model's
+second opinion.
+"""
+from typing import List, NamedTuple, Optional
+from schemas import AuditLog, FinalDecision, PublicAdvisory, StaffingPlan, SupplierResponse, SurgeForecast
+from engine.prompt_compaction import total_costs
+
+APPROVAL_COST_LIMIT = 50_000.0  # INR
+APPROVAL_MIN_CONFIDENCE = 0.7
+COST_MARGIN = 0.10  # Borderline within 10% of the cost limit
+CONFIDENCE_MARGIN = 0.05
+
+
+class RuleCheck(NamedTuple):
+    total_cost: float
+    procurement_cost: float
+    labor_cost: float
+    supplier_risk: str  # "none" when nothing was ordered
+    confidence: float
+    reasons: List[str]  # Rules that require human approval
+    borderline: List[str]  # Checks close to their threshold
+
+    @property
+    def human_approval_required(self) -> bool:
+        return bool(self.reasons)
+
+    @property
+    def risk_level(self) -> str:
+        if self.supplier_risk == "high" or len(self.reasons) > 1:
+            return "high"
+        if self.reasons or self.supplier_risk == "medium":
+            return "medium"
+        return "low"
+
+    def summary(self) -> str:
+        verdict = "; ".join(self.reasons) if self.reasons else "no approval rule triggered"
+        close = f" Borderline: {'; '.join(self.borderline)}." if self.borderline else ""
+        return f"{verdict}.{close}"
+
+
+def check_rules(forecast: SurgeForecast, supplier: Optional[SupplierResponse],
+                staffing: Optional[StaffingPlan]) -> RuleCheck:
+    costs = total_costs(supplier, staffing)
+    risk = supplier.logistics_risk if supplier else "none"
+    reasons, borderline = [], []
+
+    if costs["total"] > APPROVAL_COST_LIMIT:
+        reasons.append(f"total cost {costs['total']:,.0f} INR exceeds {APPROVAL_COST_LIMIT:,.0f} INR")
+    elif costs["total"] >= APPROVAL_COST_LIMIT * (1 - COST_MARGIN):
+        borderline.append(f"total cost {costs['total']:,.0f} INR is within {COST_MARGIN:.0%} of the limit")
+
+    if risk == "high":
+        reasons.append("supplier logistics risk is high")
+
+    if forecast.confidence < APPROVAL_MIN_CONFIDENCE:
+        reasons.append(f"forecast confidence {forecast.confidence:.2f} is below {APPROVAL_MIN_CONFIDENCE}")
+    elif forecast.confidence < APPROVAL_MIN_CONFIDENCE + CONFIDENCE_MARGIN:
+        borderline.append(f"forecast confidence {forecast.confidence:.2f} is just above {APPROVAL_MIN_CONFIDENCE}")
+
+    return RuleCheck(costs["total"], costs["procurement"], costs["labor"], risk,
+                     forecast.confidence, reasons, borderline)
+
+
+def execution_plan(forecast: SurgeForecast, supplier: Optional[SupplierResponse],
+                   staffing: Optional[StaffingPlan], advisory: Optional[PublicAdvisory]) -> str:
+    steps = []
+    if supplier and supplier.offers:
+        eta = max(o.delivery_eta_hours for o in supplier.offers)
+        steps.append(f"Place {len(supplier.offers)} supplier order(s) for "
+                     f"{supplier.total_procurement_cost:,.0f} INR (delivery within {eta}h).")
+    if staffing and staffing.shifts:
+        shifts = ", ".join(f"{s.count_needed} {s.role}(s)" for s in staffing.shifts)
+        steps.append(f"Call in {shifts} for {staffing.total_labor_cost:,.0f} INR.")
+    if advisory:
+        steps.append(f"Publish the {advisory.alert_level} advisory via {', '.join(advisory.target_channels)}.")
+    if not steps:
+        steps.append("No procurement or staffing action needed.")
+    return f"Prepare for {forecast.predicted_patients} patients in {forecast.zone} over 48h. " + " ".join(steps)
+
+
+def audit_trail(check: RuleCheck) -> List[AuditLog]:
+    entries = []
+    if check.procurement_cost:
+        entries.append(AuditLog(action_type="procurement", agent_name="SupplierAgent",
+                                reasoning=f"Supplier orders at {check.supplier_risk} logistics risk.",
+                                cost_impact=check.procurement_cost))
+    if check.labor_cost:
+        entries.append(AuditLog(action_type="staffing", agent_name="OperationsAgent",
+                                reasoning="Extra shifts to cover the forecast surge.", cost_impact=check.labor_cost))
+    if check.human_approval_required:
+        verdict = "Human approval required: "
+    elif check.borderline:
+        verdict = "Rules passed, sent for review: "
+    else:
+        verdict = "Auto-approved: "
+    entries.append(AuditLog(action_type="decision", agent_name="Orchestrator",
+                            reasoning=verdict + check.summary(), cost_impact=check.total_cost))
+    return entries
+
+
+def rule_decision(check: RuleCheck, plan: str) -> FinalDecision:
+    return FinalDecision(
+        approved=not check.human_approval_required,
+        execution_plan=plan,
+        risk_level=check.risk_level,
+        human_approval_required=check.human_approval_required,
+        audit_trail=audit_trail(check),
+    )
+
+
+def merge_review(check: RuleCheck, rules: FinalDecision, review: FinalDecision) -> FinalDecision:
+    """Fold a model's review of a borderline run into the rule decision; it can only add caution"""
+    required = check.human_approval_required or review.human_approval_required
+    levels = ("low", "medium", "high")
+    return FinalDecision(
+        approved=not required and review.approved,
+        execution_plan=review.execution_plan or rules.execution_plan,
+        risk_level=max(rules.risk_level, review.risk_level, key=levels.index),
+        human_approval_required=required,
+        audit_trail=rules.audit_trail + review.audit_trail,
+    )
@@ -0,0 +1,184 @@
+"""
+Rolling per-zone evidence features over ER arrivals and air quality.
+
+Each zone keeps hourly buckets of arrivals (with the severe count) and of AQI
+readings (hourly max and the hour's latest reading). Recording a visit or
+reading touches one bucket, so new events cost O(1) and nothing rescans
+er_visits or environmental_data. A snapshot sums the 48 buckets around the
+queried hour and leaves the store unchanged, so the result for a given time
+does not depend on which times were queried before it. Buckets older than
+HISTORY_HOURS behind the newest event are dropped as new events arrive.
+
+The store is seeded once from the SQL dumps. The dumps have no zone column,
+so their rows are attributed to HOSPITAL_ZONE.
+
+Usage:
+    python -m engine.features Mumbai-West --time 2025-11-28T10:00:00
+"""
+import argparse
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from config import HOSPITAL_ZONE
+from engine.seed_data import load_rows
+from schemas import EvidenceFeatures
+
+WINDOW_HOURS = 24
+HISTORY_HOURS = 400 * 24  # Covers the year of seeded dumps, for historical snapshots
+SEVERE_LEVELS = {"High", "Critical"}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def hour_index(timestamp: str) -> int:
+    """Whole hours since the epoch for an ISO timestamp (naive, local hospital time)"""
+    when = datetime.fromisoformat(timestamp).replace(tzinfo=None)
+    return int((when - _EPOCH).total_seconds() // 3600)
+
+
+class RollingZoneFeatures:
+    """
+    Hourly aggregates for a single zone.
+
+    Events may arrive out of order; one older than HISTORY_HOURS behind the
+    newest event is ignored.
+    """
+
+    def __init__(self, zone: str):
+        self.zone = zone
+        self._visits: Dict[int, List[int]] = {}  # hour -> [arrivals, severe arrivals]
+        self._aqi: Dict[int, list] = {}  # hour -> [max aqi, latest timestamp, latest aqi]
+        self._head: Optional[int] = None  # Newest hour recorded
+        self._floor: Optional[int] = None  # Oldest hour kept
+
+    def _advance(self, hour: int) -> bool:
+        """Move the newest hour forward, dropping expired buckets; False if `hour` is already expired"""
+        if self._head is None:
+            self._head, self._floor = hour, hour - HISTORY_HOURS
+        elif hour > self._head:
+            self._head = hour
+            cutoff = hour - HISTORY_HOURS
+            if cutoff - self._floor > len(self._visits) + len(self._aqi):
+                self._visits = {h: v for h, v in self._visits.items() if h >= cutoff}
+                self._aqi = {h: v for h, v in self._aqi.items() if h >= cutoff}
+            else:
+                for expired in range(self._floor, cutoff):
+                    self._visits.pop(expired, None)
+                    self._aqi.pop(expired, None)
+            self._floor = cutoff
+        return hour >= self._floor
+
+    def record_visit(self, timestamp: str, severity: str):
+        hour = hour_index(timestamp)
+        if not self._advance(hour):
+            return
+        bucket = self._visits.setdefault(hour, [0, 0])
+        bucket[0] += 1
+        bucket[1] += severity in SEVERE_LEVELS
+
+    def record_reading(self, timestamp: str, aqi: int):
+        hour = hour_index(timestamp)
+        if not self._advance(hour):
+            return
+        when = datetime.fromisoformat(timestamp).replace(tzinfo=None)
+        bucket = self._aqi.get(hour)
+        if bucket is None:
+            self._aqi[hour] = [aqi, when, aqi]
+            return
+        bucket[0] = max(bucket[0], aqi)
+        if when >= bucket[1]:
+            bucket[1], bucket[2] = when, aqi
+
+    def _arrivals(self, first: int, last: int) -> List[int]:
+        """[arrivals, severe] over hours first..last inclusive"""
+        totals = [0, 0]
+        for hour in range(first, last + 1):
+            bucket = self._visits.get(hour)
+            if bucket:
+                totals[0] += bucket[0]
+                totals[1] += bucket[1]
+        return totals
+
+    def snapshot(self, current_time: Optional[str] = None) -> EvidenceFeatures:
+        """Features for the 24h ending with the hour of `current_time` (default: the newest hour recorded)"""
+        hour = hour_index(current_time) if current_time else self._head
+        if hour is None:
+            return EvidenceFeatures(zone=self.zone, as_of=None, visits_last_24h=0, visits_prev_24h=0,
+                                    arrivals_per_hour=0.0, growth_rate=0.0, severe_share=0.0)
+
+        recent, recent_severe = self._arrivals(hour - WINDOW_HOURS + 1, hour)
+        previous, _ = self._arrivals(hour - 2 * WINDOW_HOURS + 1, hour - WINDOW_HOURS)
+        readings = [(h, self._aqi[h]) for h in range(hour - WINDOW_HOURS + 1, hour + 1) if h in self._aqi]
+
+        return EvidenceFeatures(
+            zone=self.zone,
+            as_of=(_EPOCH + timedelta(hours=hour)).isoformat(),
+            visits_last_24h=recent,
+            visits_prev_24h=previous,
+            arrivals_per_hour=round(recent / WINDOW_HOURS, 2),
+            growth_rate=round((recent - previous) / previous, 3) if previous else 0.0,
+            severe_share=round(recent_severe / recent, 3) if recent else 0.0,
+            max_aqi_24h=max(bucket[0] for _, bucket in readings) if readings else None,
+            latest_aqi=readings[-1][1][2] if readings else None,
+        )
+
+
+class FeatureStore:
+    """Thread-safe map of zone -> RollingZoneFeatures"""
+
+    def __init__(self):
+        self._zones: Dict[str, RollingZoneFeatures] = {}
+        self._lock = threading.Lock()
+
+    def _zone(self, zone: str) -> RollingZoneFeatures:
+        if zone not in self._zones:
+            self._zones[zone] = RollingZoneFeatures(zone)
+        return self._zones[zone]
+
+    def record_visit(self, zone: str, timestamp: str, severity: str):
+        with self._lock:
+            self._zone(zone).record_visit(timestamp, severity)
+
+    def record_reading(self, zone: str, timestamp: str, aqi: int):
+        with self._lock:
+            self._zone(zone).record_reading(timestamp, aqi)
+
+    def snapshot(self, zone: str, current_time: Optional[str] = None) -> EvidenceFeatures:
+        with self._lock:
+            return self._zone(zone).snapshot(current_time)
+
+
+def seed_store(store: FeatureStore, zone: str = HOSPITAL_ZONE):
+    """Replay the er_visits and environmental_data dumps into `store` in time order"""
+    events = [(v["visit_datetime"], 0, v["severity"]) for v in load_rows("er_visits")]
+    events += [(r["recorded_at"], 1, r["air_quality_index"]) for r in load_rows("environmental_data")]
+    for timestamp, kind, value in sorted(events, key=lambda e: e[0]):
+        if kind == 0:
+            store.record_visit(zone, timestamp, value)
+        else:
+            store.record_reading(zone, timestamp, value)
+
+
+_store: Optional[FeatureStore] = None
+_store_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """Process-wide store, seeded from the SQL dumps on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            store = FeatureStore()
+            seed_store(store)
+            _store = store
+    return _store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show rolling evidence features for a zone")
+    parser.add_argument("zone", nargs="?", default=HOSPITAL_ZONE)
+    parser.add_argument("--time", help="ISO timestamp to take the snapshot at")
+    args = parser.parse_args()
+
+    features = get_feature_store().snapshot(args.zone, args.time)
+    print(features.summary())
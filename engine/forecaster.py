@@ -0,0 +1,241 @@
+"""
+Statistical 48h surge forecaster for the doctor agent.
+
+The model is a seasonal hour-of-week baseline (mean arrivals per hour of the
+week) scaled by an exponentially smoothed level (actual / baseline over the
+last 14 days, in 24h blocks) and an AQI factor fitted on the overlap with
+environmental_data:
+
+    predicted = level * sum(baseline over the next 48h) * (1 + beta * (AQI - mean AQI) / 100)
+
+`confidence` is calibrated by a rolling-origin backtest over the last 60 days:
+it is the share of 48h forecasts that landed within +/-20% of the actual
+count. It is discounted when the history is stale or the current AQI is above
+anything seen in training, which is when doctor_node falls back to the LLM.
+
+Usage:
+    python -m engine.forecaster --backtest
+    python -m engine.forecaster Mumbai-West --time 2025-11-28T10:00:00
+"""
+import argparse
+from functools import lru_cache
+from typing import Dict, List, Optional
+import numpy as np
+from config import HOSPITAL_ZONE
+from engine.features import hour_index
+from engine.seed_data import load_rows
+from schemas import EvidenceFeatures, SurgeForecast
+
+HORIZON_HOURS = 48
+HOURS_PER_WEEK = 168
+LEVEL_BLOCKS = 14  # 24h blocks the level is smoothed over
+LEVEL_ALPHA = 0.3
+MIN_AQI_POINTS = 10  # Origins with an AQI reading needed to fit beta
+BACKTEST_DAYS = 60
+TOLERANCE = 0.20  # A backtest forecast "hits" within +/-20% of the actual count
+STALE_HOURS = 24  # Confidence decays once the newest visit is older than this
+SEVERITY_GROUPS = {"Low": "mild", "Medium": "moderate", "High": "severe", "Critical": "severe"}
+
+
+def hour_of_week(hours: np.ndarray) -> np.ndarray:
+    """Monday 00:00 = 0 (the epoch fell on a Thursday)"""
+    return ((hours // 24 + 3) % 7) * 24 + hours % 24
+
+
+class SurgeForecaster:
+    """Forecaster fitted on one zone's hourly arrival series"""
+
+    def __init__(self, zone: str, visits: List[dict], readings: List[dict]):
+        self.zone = zone
+        hours = np.array([hour_index(v["visit_datetime"]) for v in visits], dtype=np.int64)
+        self.start = int(hours.min())
+        self.end = int(hours.max()) + 1  # Exclusive: hours >= end are unobserved
+        offsets = hours - self.start
+        size = self.end - self.start
+
+        self.counts = np.bincount(offsets, minlength=size).astype(float)
+        self._cum = np.concatenate([[0.0], np.cumsum(self.counts)])
+        groups = np.array([SEVERITY_GROUPS.get(v["severity"], "moderate") for v in visits])
+        self._group_cum = {
+            group: np.concatenate([[0.0], np.cumsum(np.bincount(offsets[groups == group], minlength=size))])
+            for group in ("mild", "moderate", "severe")
+        }
+
+        readings = sorted(readings, key=lambda r: r["recorded_at"])
+        self._aqi_hours = np.array([hour_index(r["recorded_at"]) for r in readings], dtype=np.int64)
+        self._aqi_values = np.array([r["air_quality_index"] for r in readings], dtype=float)
+        self.max_training_aqi = float(self._aqi_values.max()) if len(readings) else None
+
+        self.backtest = self._backtest()
+        self._fit(self.end)
+
+    # --- series helpers (absolute hour indexes, clipped to the observed range) ---
+
+    def _actual(self, first: int, last: int, cum: np.ndarray = None) -> float:
+        cum = self._cum if cum is None else cum
+        first, last = max(first, self.start), min(last, self.end)
+        return float(cum[last - self.start] - cum[first - self.start]) if last > first else 0.0
+
+    def _expected(self, first: int, last: int) -> float:
+        return float(self._baseline[hour_of_week(np.arange(first, last))].sum())
+
+    def _aqi(self, hour: int) -> Optional[float]:
+        """Max AQI reading in the 24h up to `hour`"""
+        lo, hi = np.searchsorted(self._aqi_hours, [hour - 23, hour + 1])
+        return float(self._aqi_values[lo:hi].max()) if hi > lo else None
+
+    def _fit(self, until: int):
+        """Hour-of-week baseline and AQI coefficient from the data before `until`"""
+        span = np.arange(self.start, until)
+        observed = np.bincount(hour_of_week(span), weights=self.counts[:until - self.start], minlength=HOURS_PER_WEEK)
+        slots = np.bincount(hour_of_week(span), minlength=HOURS_PER_WEEK)
+        self._baseline = observed / np.maximum(slots, 1)
+
+        known = self._aqi_values[self._aqi_hours < until]
+        self._aqi_mean = float(known.mean()) if len(known) else 0.0
+        self.beta = 0.0
+
+        x, residual = [], []
+        for origin in range(until - HORIZON_HOURS, self.start + LEVEL_BLOCKS * 24, -24):
+            aqi = self._aqi(origin)
+            if aqi is None:
+                continue
+            base = self._level(origin) * self._expected(origin, origin + HORIZON_HOURS)
+            if base > 0:
+                x.append((aqi - self._aqi_mean) / 100)
+                residual.append(self._actual(origin, origin + HORIZON_HOURS) / base - 1)
+        if len(x) >= MIN_AQI_POINTS:
+            x, residual = np.array(x), np.array(residual)
+            if (x * x).sum() > 0:
+                self.beta = max(0.0, float((x * residual).sum() / (x * x).sum()))
+
+    def _level(self, origin: int) -> float:
+        """Exponentially smoothed actual / baseline ratio over the 24h blocks before `origin`"""
+        level = None
+        for k in range(LEVEL_BLOCKS, 0, -1):
+            first, last = origin - 24 * k, origin - 24 * (k - 1)
+            expected = self._expected(first, last)
+            if first < self.start or expected <= 0:
+                continue
+            ratio = self._actual(first, last) / expected
+            level = ratio if level is None else LEVEL_ALPHA * ratio + (1 - LEVEL_ALPHA) * level
+        return 1.0 if level is None else level
+
+    def _predict(self, origin: int, target: int, aqi: Optional[float]) -> Dict[str, float]:
+        """Components of the forecast for hours (target .. target + 48), level taken at `origin`"""
+        baseline = self._expected(target, target + HORIZON_HOURS)
+        level = self._level(origin)
+        factor = 1.0 if aqi is None else max(0.0, 1 + self.beta * (aqi - self._aqi_mean) / 100)
+        return {"baseline": baseline, "level": level, "aqi_factor": factor, "total": baseline * level * factor}
+
+    def _backtest(self) -> Dict[str, float]:
+        """Rolling-origin evaluation with the model fitted on data before the test window"""
+        first_origin = self.end - HORIZON_HOURS - 24 * (BACKTEST_DAYS - 1)
+        if first_origin - self.start < HOURS_PER_WEEK + LEVEL_BLOCKS * 24:
+            return {"origins": 0, "hit_rate": 0.0, "mape": 1.0, "naive_mape": 1.0, "low": 0.0, "high": 0.0}
+        self._fit(first_origin)
+
+        actuals, predictions, naive = [], [], []
+        for origin in range(first_origin, self.end - HORIZON_HOURS + 1, 24):
+            actual = self._actual(origin, origin + HORIZON_HOURS)
+            if actual <= 0:
+                continue
+            actuals.append(actual)
+            predictions.append(max(self._predict(origin, origin, self._aqi(origin))["total"], 1e-9))
+            naive.append(self._actual(origin - HORIZON_HOURS, origin))  # Last 48h carried forward
+
+        actuals, predictions, naive = np.array(actuals), np.array(predictions), np.array(naive)
+        errors = np.abs(predictions - actuals) / actuals
+        return {
+            "origins": len(actuals),
+            "hit_rate": float((errors <= TOLERANCE).mean()),
+            "mape": float(errors.mean()),
+            "naive_mape": float((np.abs(naive - actuals) / actuals).mean()),
+            # actual / predicted quantiles, used as an 80% interval around a new forecast
+            "low": float(np.quantile(actuals / predictions, 0.1)),
+            "high": float(np.quantile(actuals / predictions, 0.9)),
+        }
+
+    def severity_shares(self, origin: int) -> Dict[str, float]:
+        """Severity mix of the last LEVEL_BLOCKS days of arrivals"""
+        first = origin - LEVEL_BLOCKS * 24
+        counts = {group: self._actual(first, origin, cum) for group, cum in self._group_cum.items()}
+        total = sum(counts.values())
+        if total == 0:
+            return {"mild": 1 / 3, "moderate": 1 / 3, "severe": 1 / 3}
+        return {group: count / total for group, count in counts.items()}
+
+    def forecast(self, current_time: str, features: Optional[EvidenceFeatures] = None) -> SurgeForecast:
+        """48h forecast from `current_time`; `features` supplies the live AQI when available"""
+        target = hour_index(current_time)
+        origin = min(target, self.end)
+        aqi = features.max_aqi_24h if features and features.max_aqi_24h is not None else self._aqi(origin)
+
+        parts = self._predict(origin, target, aqi)
+        predicted = int(round(parts["total"]))
+
+        confidence = self.backtest["hit_rate"]
+        notes = []
+        stale = target - self.end
+        if stale > STALE_HOURS:
+            confidence *= max(0.0, 1 - (stale - STALE_HOURS) / HOURS_PER_WEEK)
+            notes.append(f"newest visit is {stale}h old")
+        if aqi is not None and self.max_training_aqi is not None and aqi > self.max_training_aqi:
+            confidence *= 0.5
+            notes.append(f"AQI {aqi:.0f} is above the training maximum {self.max_training_aqi:.0f}")
+        if origin - self.start < HOURS_PER_WEEK + LEVEL_BLOCKS * 24:
+            confidence = 0.0
+            notes.append("less than three weeks of history")
+
+        # Largest-remainder split so the breakdown sums to the prediction
+        shares = self.severity_shares(origin)
+        raw = {group: predicted * share for group, share in shares.items()}
+        breakdown = {group: int(value) for group, value in raw.items()}
+        for group in sorted(raw, key=lambda g: raw[g] - breakdown[g], reverse=True)[:predicted - sum(breakdown.values())]:
+            breakdown[group] += 1
+
+        low, high = self.backtest["low"], self.backtest["high"]
+        reasoning = (
+            f"Hour-of-week baseline {parts['baseline']:.1f} x smoothed level {parts['level']:.2f} "
+            f"x AQI factor {parts['aqi_factor']:.2f} (AQI {aqi if aqi is not None else 'n/a'}). "
+            f"80% interval {predicted * low:.0f}-{predicted * high:.0f}. "
+            f"Backtest: {self.backtest['hit_rate']:.0%} of {self.backtest['origins']} 48h forecasts within "
+            f"+/-{TOLERANCE:.0%}, MAPE {self.backtest['mape']:.1%} (naive {self.backtest['naive_mape']:.1%})."
+        )
+        if notes:
+            reasoning += " Confidence reduced: " + "; ".join(notes) + "."
+
+        return SurgeForecast(
+            zone=self.zone,
+            predicted_patients=predicted,
+            severity_breakdown=breakdown,
+            confidence=round(confidence, 2),
+            reasoning=reasoning,
+            timestamp=current_time,  # Not the wall clock, so reruns render the same downstream prompts
+        )
+
+
+@lru_cache(maxsize=None)
+def get_forecaster(zone: str) -> Optional[SurgeForecaster]:
+    """Fitted forecaster for `zone`, or None when the zone has no arrival history"""
+    if zone != HOSPITAL_ZONE:
+        return None
+    return SurgeForecaster(zone, load_rows("er_visits"), load_rows("environmental_data"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit, backtest and run the statistical surge forecaster")
+    parser.add_argument("zone", nargs="?", default=HOSPITAL_ZONE)
+    parser.add_argument("--time", default="2025-11-28T10:00:00")
+    parser.add_argument("--backtest", action="store_true", help="Print backtest metrics only")
+    args = parser.parse_args()
+
+    forecaster = get_forecaster(args.zone)
+    if forecaster is None:
+        raise SystemExit(f"No arrival history for {args.zone}")
+
+    bt = forecaster.backtest
+    print(f"Backtest over {bt['origins']} origins: hit rate {bt['hit_rate']:.0%} (+/-{TOLERANCE:.0%}), "
+          f"MAPE {bt['mape']:.1%}, naive MAPE {bt['naive_mape']:.1%}, AQI beta {forecaster.beta:.3f}")
+    if not args.backtest:
+        print(forecaster.forecast(args.time).model_dump_json(indent=2))
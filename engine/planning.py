@@ -0,0 +1,98 @@
+"""
+Deterministic planning rules for the pharmacy and operations agents.
+
+These are the same rules the agent prompts spell out, evaluated in Python so
+the quantities and costs are exact and reproducible run to run.
+"""
+import math
+from typing import Dict, List
+from schemas import SurgeForecast, MedicineItem, PharmacyPlan, ShiftDetail, StaffingPlan
+
+# --- PHARMACY RULES ---
+# medicine_id -> (patient group the dose applies to, units per patient)
+DOSING_RULES = {
+    "med_1": ("severe", 1),  # Salbutamol Inhaler: 1 per severe patient
+    "med_2": ("all", 2),     # Prednisolone: 2 tablets per patient
+}
+SAFETY_BUFFER = 0.10  # Reorder when stock < demand + 10%
+
+# --- STAFFING RULES ---
+# Moderate cases are not covered by the SOP, so they are staffed at the mild ratio.
+PATIENTS_PER_DOCTOR = {"mild": 20, "moderate": 20, "severe": 5}
+PATIENTS_PER_NURSE = 10  # Any severity
+HOURLY_RATE = {"doctor": 2500.0, "nurse": 800.0}  # INR
+SHIFT_HOURS = 8
+SHIFT_PERIOD = "Next 48h surge cover (8h shift)"
+
+
+def severity_counts(forecast: SurgeForecast) -> Dict[str, int]:
+    """Normalise the forecast's severity breakdown to mild/moderate/severe/all"""
+    counts = {"mild": 0, "moderate": 0, "severe": 0}
+    for label, count in forecast.severity_breakdown.items():
+        key = label.strip().lower()
+        if key in counts:
+            counts[key] += int(count)
+    counts["all"] = max(forecast.predicted_patients, sum(counts.values()))
+    return counts
+
+
+def compute_pharmacy_plan(forecast: SurgeForecast, inventory: List[dict]) -> PharmacyPlan:
+    """Reorder every medicine whose stock does not cover forecast demand plus the safety buffer"""
+    counts = severity_counts(forecast)
+    items = []
+    cost = 0.0
+
+    for stock_item in inventory:
+        rule = DOSING_RULES.get(stock_item["id"])
+        if rule is None:
+            continue
+
+        group, units_per_patient = rule
+        demand = counts[group] * units_per_patient
+        required = math.ceil(demand * (1 + SAFETY_BUFFER))
+        stock = stock_item["stock"]
+
+        if stock < required:
+            quantity = required - stock
+            items.append(MedicineItem(
+                medicine_id=stock_item["id"],
+                name=stock_item["name"],
+                quantity_needed=quantity,
+                urgency="critical" if stock < demand else "normal",
+            ))
+            cost += quantity * stock_item.get("unit_cost", 0.0)
+
+    return PharmacyPlan(
+        items_to_reorder=items,
+        estimated_internal_cost=round(cost, 2),
+        status="shortage" if items else "adequate",
+    )
+
+
+def compute_staffing_plan(forecast: SurgeForecast, roster: dict) -> StaffingPlan:
+    """Staff the forecast to the SOP ratios and price the extra shifts needed on top of the roster"""
+    counts = severity_counts(forecast)
+    needed = {
+        "doctor": sum(math.ceil(counts[sev] / ratio) for sev, ratio in PATIENTS_PER_DOCTOR.items()),
+        "nurse": math.ceil(counts["all"] / PATIENTS_PER_NURSE),
+    }
+    on_call = {
+        "doctor": roster.get("doctors_on_call", 0),
+        "nurse": roster.get("nurses_on_call", 0),
+    }
+
+    shifts = []
+    cost = 0.0
+    lines = []
+    for role in ("doctor", "nurse"):
+        gap = max(0, needed[role] - on_call[role])
+        lines.append(f"{role.title()}s: need {needed[role]}, on call {on_call[role]}, gap {gap}.")
+        if gap:
+            shifts.append(ShiftDetail(role=role, count_needed=gap, shift_period=SHIFT_PERIOD))
+            cost += gap * HOURLY_RATE[role] * SHIFT_HOURS
+
+    return StaffingPlan(
+        shifts=shifts,
+        total_labor_cost=round(cost, 2),
+        gap_analysis=" ".join(lines),
+    )
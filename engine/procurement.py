@@ -0,0 +1,216 @@
+"""
+Procurement maths for the supplier agent.
+
+Supplier API quotes are folded into a SupplierResponse in a single pass:
+per-offer costs, the procurement total and the logistics risk rating.
+`optimize_reorder` instead sources each line from the supplier_medicines
+catalog, splitting quantities across suppliers under an ETA deadline and
+minimum order quantities.
+"""
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from config import SUPPLIER_CATALOG_IDS
+from engine.seed_data import load_rows
+from schemas import MedicineItem, SupplierResponse
+
+# --- LOGISTICS RISK RULES ---
+# Any line the supplier cannot fill completely -> high
+# Any delivery slower than this many hours    -> medium
+STANDARD_ETA_HOURS = 24
+
+
+def aggregate_supplier_quotes(api_results: List[dict]) -> SupplierResponse:
+    """
+    Build the procurement plan from supplier API results.
+
+    Each result carries the quote fields (`supplier`, `available`, `unit_cost`,
+    `eta_hours`, `expedite_cost`) plus the `requested_id`/`requested_qty` it answers.
+    """
+    offers = []
+    total = 0.0
+    short = False
+    slow = False
+
+    # Plain dicts are validated in one pydantic-core pass at the end, which is
+    # several times cheaper than building the models one by one.
+    for quote in api_results:
+        available = int(quote["available"])
+        cost = available * float(quote["unit_cost"])
+        eta = int(quote["eta_hours"])
+        expedite_cost = float(quote.get("expedite_cost", 0.0))
+
+        short = short or available < quote["requested_qty"]
+        slow = slow or eta > STANDARD_ETA_HOURS
+        total += cost
+
+        offers.append({
+            "medicine_id": quote["requested_id"],
+            "supplier_name": quote["supplier"],
+            "quantity_available": available,
+            "cost": cost,
+            "delivery_eta_hours": eta,
+            "expedite_available": expedite_cost > 0,
+            "expedite_cost": expedite_cost,
+        })
+
+    return SupplierResponse.model_validate({
+        "offers": offers,
+        "total_procurement_cost": round(total, 2),
+        "logistics_risk": "high" if short else "medium" if slow else "low",
+    })
+
+
+# --- MULTI-SUPPLIER OPTIMIZER (supplier_medicines catalog) ---
+
+class CatalogOffer(NamedTuple):
+    supplier_id: int
+    supplier_name: str
+    unit_price: float
+    lead_time_hours: int
+    moq: int
+    is_preferred: bool
+
+
+@lru_cache(maxsize=1)
+def get_offer_index() -> Dict[int, List[CatalogOffer]]:
+    """
+    Per-medicine supplier offers from the seed catalog, sorted cheapest first,
+    then fastest, then preferred suppliers. Built once per process.
+    """
+    names = {row["supplier_id"]: row["name"] for row in load_rows("suppliers")}
+    index: Dict[int, List[CatalogOffer]] = {}
+    for row in load_rows("supplier_medicines"):
+        index.setdefault(row["medicine_id"], []).append(CatalogOffer(
+            supplier_id=row["supplier_id"],
+            supplier_name=names.get(row["supplier_id"], f"Supplier {row['supplier_id']}"),
+            unit_price=float(row["supply_price"]),
+            lead_time_hours=int(row["lead_time_days"]) * 24,
+            moq=int(row["minimum_order_quantity"] or 1),
+            is_preferred=bool(row["is_preferred"]),
+        ))
+    for offers in index.values():
+        offers.sort(key=lambda o: (o.unit_price, o.lead_time_hours, not o.is_preferred))
+    return index
+
+
+@lru_cache(maxsize=1)
+def get_catalog_names() -> Dict[str, int]:
+    """Lower-cased catalog medicine name -> medicine_id, for names that occur once"""
+    rows = load_rows("medicines")
+    counts = Counter(row["name"].strip().lower() for row in rows)
+    return {row["name"].strip().lower(): row["medicine_id"] for row in rows
+            if counts[row["name"].strip().lower()] == 1}
+
+
+def catalog_medicine_id(item: MedicineItem) -> Optional[int]:
+    """
+    The catalog medicine_id for a reorder line, or None if it is not in the catalog.
+
+    Agent ids ('med_1') and catalog ids are separate id spaces, so a line maps
+    through SUPPLIER_CATALOG_IDS or an exact (case-insensitive) name match.
+    """
+    if item.medicine_id in SUPPLIER_CATALOG_IDS:
+        return SUPPLIER_CATALOG_IDS[item.medicine_id]
+    return get_catalog_names().get(item.name.strip().lower())
+
+
+def allocate(quantity: int, offers: List[CatalogOffer], capacity: Optional[Dict[int, int]] = None):
+    """
+    Split `quantity` across `offers` at minimum cost.
+
+    Each step takes the offer with the lowest cost per unit actually needed,
+    where an order below the supplier's MOQ is rounded up to the MOQ. Without
+    capacity limits this picks the single cheapest way to buy the whole line;
+    with limits (supplier_id -> max units) it fills from the cheapest suppliers
+    first; a supplier without a limit is unbounded. Returns
+    ([(offer, units)], unfilled units).
+    """
+    remaining = quantity
+    available = list(offers)
+    allocations = []
+
+    while remaining > 0 and available:
+        best = None
+        for offer in available:
+            cap = capacity.get(offer.supplier_id, math.inf) if capacity else math.inf
+            take = min(remaining, cap)
+            if take <= 0 or cap < offer.moq:
+                continue
+            units = max(take, offer.moq)
+            per_needed_unit = offer.unit_price * units / take
+            if best is None or per_needed_unit < best[0]:
+                best = (per_needed_unit, offer, units, take)
+
+        if best is None:
+            break
+        _, offer, units, take = best
+        allocations.append((offer, units))
+        available.remove(offer)
+        remaining -= take
+
+    return allocations, max(remaining, 0)
+
+
+def optimize_reorder(items: List[MedicineItem], deadline_hours: int,
+                     capacity: Optional[Dict[Tuple[int, int], int]] = None) -> SupplierResponse:
+    """
+    Source every reorder line from the supplier catalog.
+
+    Only suppliers whose lead time meets `deadline_hours` are considered. A
+    line nobody can deliver in time falls back to the fastest supplier, and a
+    line that cannot be filled at all, or is not in the catalog, is reported
+    as a NO QUOTE offer; both make the plan high risk. `capacity` optionally caps units per
+    (supplier_id, catalog medicine_id).
+    """
+    index = get_offer_index()
+    offers = []
+    total = 0.0
+    short = late = slow = False
+
+    for item in items:
+        med_id = catalog_medicine_id(item)
+        candidates = index.get(med_id, [])
+        in_time = [o for o in candidates if o.lead_time_hours <= deadline_hours]
+        if candidates and not in_time:
+            late = True
+            in_time = [min(candidates, key=lambda o: o.lead_time_hours)]
+
+        limits = None
+        if capacity:
+            limits = {sid: units for (sid, mid), units in capacity.items() if mid == med_id}
+
+        allocations, unfilled = allocate(item.quantity_needed, in_time, limits)
+        short = short or unfilled > 0
+        if not allocations:
+            offers.append({
+                "medicine_id": item.medicine_id,
+                "supplier_name": "NO QUOTE",
+                "quantity_available": 0,
+                "cost": 0.0,
+                "delivery_eta_hours": 0,
+                "expedite_available": False,
+                "expedite_cost": 0.0,
+            })
+            continue
+
+        for offer, units in allocations:
+            cost = round(units * offer.unit_price, 2)
+            total += cost
+            slow = slow or offer.lead_time_hours > STANDARD_ETA_HOURS
+            offers.append({
+                "medicine_id": item.medicine_id,
+                "supplier_name": offer.supplier_name,
+                "quantity_available": units,
+                "cost": cost,
+                "delivery_eta_hours": offer.lead_time_hours,
+                "expedite_available": False,
+                "expedite_cost": 0.0,
+            })
+
+    return SupplierResponse.model_validate({
+        "offers": offers,
+        "total_procurement_cost": round(total, 2),
+        "logistics_risk": "high" if short or late else "medium" if slow else "low",
+    })
@@ -0,0 +1,104 @@
+"""
+Compact orchestrator inputs.
+
+The orchestrator only needs the fields its rules read (total cost, supplier
+risk, forecast confidence) plus enough context to write an audit entry.
+Instead of four full model dumps, each input is rendered as a short
+key=value line and the totals the rules test are precomputed.
+
+A token-budget guard drops optional detail (free-text reasoning, per-offer
+lines, advisory title) and finally truncates the remaining text until the
+rendered prompt fits. Tokens are estimated at four characters per token.
+"""
+from typing import Callable, Dict, List, Optional
+from schemas import PublicAdvisory, StaffingPlan, SupplierResponse, SurgeForecast
+
+CHARS_PER_TOKEN = 4
+DETAIL_CHARS = 160  # Free-text fields are clipped to this before any budget check
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def total_costs(supplier: Optional[SupplierResponse], staffing: Optional[StaffingPlan]) -> Dict[str, float]:
+    procurement = supplier.total_procurement_cost if supplier else 0.0
+    labor = staffing.total_labor_cost if staffing else 0.0
+    return {"procurement": procurement, "labor": labor, "total": procurement + labor}
+
+
+class CompactInputs:
+    """Orchestrator prompt variables with optional detail that can be shed"""
+
+    def __init__(self, forecast: SurgeForecast, supplier: Optional[SupplierResponse],
+                 staffing: StaffingPlan, advisory: PublicAdvisory):
+        self.forecast, self.supplier, self.staffing, self.advisory = forecast, supplier, staffing, advisory
+        self.detail_chars = DETAIL_CHARS
+        self.include_reasoning = True
+        self.include_offers = True
+        self.include_title = True
+
+    def render(self) -> Dict[str, str]:
+        f = self.forecast
+        severity = "/".join(f"{k}={v}" for k, v in f.severity_breakdown.items())
+        forecast = f"patients_48h={f.predicted_patients} confidence={f.confidence:.2f} severity={severity}"
+        if self.include_reasoning and f.reasoning:
+            forecast += f" basis=\"{_clip(f.reasoning, self.detail_chars)}\""
+
+        if self.supplier and self.supplier.offers:
+            s = self.supplier
+            eta = max(o.delivery_eta_hours for o in s.offers)
+            supplier = (f"offers={len(s.offers)} procurement_inr={s.total_procurement_cost:.0f} "
+                        f"risk={s.logistics_risk} max_eta_h={eta}")
+            if self.include_offers:
+                supplier += "; " + "; ".join(
+                    f"{o.medicine_id}:{o.supplier_name} x{o.quantity_available} {o.cost:.0f}INR {o.delivery_eta_hours}h"
+                    for o in s.offers
+                )
+        elif self.supplier:
+            supplier = f"offers=0 procurement_inr=0 risk={self.supplier.logistics_risk}"
+        else:
+            supplier = "No Orders"
+
+        roles: Dict[str, int] = {}
+        for shift in self.staffing.shifts:
+            roles[shift.role] = roles.get(shift.role, 0) + shift.count_needed
+        staffing = " ".join(f"{role}s={count}" for role, count in roles.items()) or "no extra staff"
+        staffing += f" labor_inr={self.staffing.total_labor_cost:.0f}"
+        if self.include_reasoning and self.staffing.gap_analysis:
+            staffing += f" gap=\"{_clip(self.staffing.gap_analysis, self.detail_chars)}\""
+
+        a = self.advisory
+        advisory = f"level={a.alert_level} status={a.draft_status} channels={','.join(a.target_channels)}"
+        if self.include_title:
+            advisory += f" title=\"{_clip(a.title, self.detail_chars)}\""
+
+        costs = total_costs(self.supplier, self.staffing)
+        totals = (f"total_cost_inr={costs['total']:.0f} (procurement {costs['procurement']:.0f} + "
+                  f"labor {costs['labor']:.0f}), supplier_risk={self.supplier.logistics_risk if self.supplier else 'none'}, "
+                  f"forecast_confidence={f.confidence:.2f}")
+
+        return {"forecast": forecast, "supplier": supplier, "staffing": staffing, "advisory": advisory, "totals": totals}
+
+    def fit(self, measure: Callable[[Dict[str, str]], int], budget: int) -> Dict[str, str]:
+        """Shed detail until `measure(variables)` is within `budget` tokens"""
+        steps: List[Callable[[], None]] = [
+            lambda: setattr(self, "include_reasoning", False),
+            lambda: setattr(self, "include_offers", False),
+            lambda: setattr(self, "include_title", False),
+        ]
+        variables = self.render()
+        for step in steps:
+            if measure(variables) <= budget:
+                return variables
+            step()
+            variables = self.render()
+        while measure(variables) > budget and self.detail_chars > 20:
+            self.detail_chars //= 2
+            variables = self.render()
+        return variables
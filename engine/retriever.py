@@ -0,0 +1,351 @@
+"""
+Offline retriever behind tools.retrieve_rag_context.
+
+Documents (SOPs, daily ER summaries, environmental readings) are embedded
+with a hashed bag of words and bigrams, so no model download or network call
+is needed. Vectors are stored as .npy segments that are memory-mapped on
+load, and each upsert writes a new segment plus appended document metadata,
+so the index grows without being rewritten. A query is a single brute-force
+cosine scan over every segment; at 100k chunks it takes a few milliseconds.
+
+Usage:
+    python -m engine.retriever --rebuild
+    python -m engine.retriever "respiratory surge protocol" --zone Mumbai-West
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import threading
+import zlib
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from config import RAG_INDEX_DIR
+from engine.seed_data import load_rows
+
+DIM = 128
+GLOBAL_ZONE = "*"  # Documents that apply to every zone
+MAX_SEGMENTS = 16  # Compact once this many upserts have piled up
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.:-][a-z0-9]+)*")
+
+
+def _features(text: str) -> List[str]:
+    tokens = _TOKEN.findall(text.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def _day_number(day: Optional[str]) -> int:
+    """'2025-11-27' -> 20251127, undated -> 0"""
+    return int(day[:10].replace("-", "")) if day else 0
+
+
+def embed(texts: List[str]) -> np.ndarray:
+    """Signed feature hashing into DIM dimensions, L2-normalised"""
+    vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for feature in _features(text):
+            h = zlib.crc32(feature.encode())
+            vectors[row, h % DIM] += 1.0 if h & 0x80000000 else -1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class VectorIndex:
+    """
+    Append-only, segment-per-upsert vector store.
+
+    Each document is a dict with `id`, `source`, `zone`, `text` and an optional
+    ISO `day` for time-bound evidence. Upserting an existing id hides the old
+    row, and the latest row for an id wins.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._docs_path = os.path.join(directory, "docs.jsonl")
+        self._compact_path = os.path.join(directory, "compact.npy.tmp")
+
+        self.docs: List[dict] = []
+        self._segments: List[np.ndarray] = []
+        self._row_of: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._zones = np.zeros(0, dtype=np.int32)
+        self._sources = np.zeros(0, dtype=np.int32)
+        self._days = np.zeros(0, dtype=np.int32)
+        self._codes: Dict[str, int] = {GLOBAL_ZONE: 0}
+        self._load()
+
+    def __len__(self) -> int:
+        return int(self._alive.sum())
+
+    def _code(self, value: str) -> int:
+        return self._codes.setdefault(value, len(self._codes))
+
+    def _segment_paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, "segment-*.npy")))
+
+    def _load(self):
+        tmp_docs = self._docs_path + ".tmp"
+        if os.path.exists(tmp_docs):
+            # An interrupted compaction: once its segment is in place (its tmp
+            # file is gone) finish it, otherwise the old files are still whole.
+            if os.path.exists(self._compact_path):
+                os.remove(self._compact_path)
+                os.remove(tmp_docs)
+            else:
+                os.replace(tmp_docs, self._docs_path)
+        docs = self._read_docs()
+        self._segments = self._trim_segments(len(docs))
+        rows = sum(len(segment) for segment in self._segments)
+        if len(docs) > rows:
+            # Documents without vectors would make every search fail; they
+            # can only come from writers racing on the same directory.
+            docs = docs[:rows]
+            self._truncate_docs(rows)
+        self._register(docs)
+
+    def _read_docs(self) -> List[dict]:
+        if not os.path.exists(self._docs_path):
+            return []
+        with open(self._docs_path, "r+b") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):  # Half-written line from an interrupted upsert
+                f.truncate(end)
+        return [json.loads(line) for line in data[:end].decode("utf-8").splitlines() if line.strip()]
+
+    def _truncate_docs(self, n_docs: int):
+        with open(self._docs_path, "r+b") as f:
+            kept = 0
+            while kept < n_docs:
+                if f.readline().strip():
+                    kept += 1
+            f.truncate()
+
+    def _trim_segments(self, n_docs: int) -> List[np.ndarray]:
+        """
+        Map the segments, dropping rows past the last document. Vectors are
+        written before their metadata, so such rows belong to an interrupted
+        upsert (or compaction) and would misalign the next upsert's rows.
+        """
+        segments, rows = [], 0
+        for path in self._segment_paths():
+            segment = np.load(path, mmap_mode="r")
+            keep = min(len(segment), n_docs - rows)
+            if keep <= 0:
+                os.remove(path)
+                continue
+            if keep < len(segment):
+                self._save(path, np.array(segment[:keep]))
+                segment = np.load(path, mmap_mode="r")
+            segments.append(segment)
+            rows += keep
+        return segments
+
+    def _save(self, path: str, vectors: np.ndarray):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, vectors)
+        os.replace(tmp, path)
+
+    def _register(self, docs: List[dict]):
+        start = len(self.docs)
+        self.docs.extend(docs)
+        self._alive = np.concatenate([self._alive, np.ones(len(docs), dtype=bool)])
+        self._zones = np.concatenate([self._zones, np.array([self._code(d["zone"]) for d in docs], dtype=np.int32)])
+        self._sources = np.concatenate([self._sources, np.array([self._code(d["source"]) for d in docs], dtype=np.int32)])
+        self._days = np.concatenate([self._days, np.array([_day_number(d.get("day")) for d in docs], dtype=np.int32)])
+        for offset, doc in enumerate(docs):
+            previous = self._row_of.get(doc["id"])
+            if previous is not None:
+                self._alive[previous] = False
+            self._row_of[doc["id"]] = start + offset
+
+    def upsert(self, docs: List[dict]):
+        """Embed and persist `docs` as a new segment; replaces documents with the same id"""
+        if not docs:
+            return
+        docs = [{"id": str(d["id"]), "source": d["source"], "zone": d.get("zone") or GLOBAL_ZONE,
+                 "day": d.get("day"), "text": d["text"]}
+                for d in docs]
+
+        path = os.path.join(self.directory, f"segment-{len(self._segment_paths()):05d}.npy")
+        self._save(path, embed([d["text"] for d in docs]))
+        with open(self._docs_path, "a", encoding="utf-8") as f:
+            for doc in docs:
+                f.write(json.dumps(doc) + "\n")
+
+        self._segments.append(np.load(path, mmap_mode="r"))
+        self._register(docs)
+
+        if len(self._segments) > MAX_SEGMENTS:
+            self.compact()
+
+    def compact(self):
+        """Rewrite live rows into a single segment and drop superseded documents"""
+        live = np.flatnonzero(self._alive)
+        vectors = self._matrix()[live] if len(live) else np.zeros((0, DIM), dtype=np.float32)
+        docs = [self.docs[row] for row in live]
+
+        tmp_docs = self._docs_path + ".tmp"
+        with open(self._compact_path, "wb") as f:
+            np.save(f, vectors)
+        with open(tmp_docs, "w", encoding="utf-8") as f:
+            for doc in docs:
+                f.write(json.dumps(doc) + "\n")
+
+        # Install the new segment, then its documents, and only then drop the
+        # old segments; `_load` finishes any of these steps left undone.
+        self._segments = []
+        old_paths = self._segment_paths()[1:]
+        os.replace(self._compact_path, os.path.join(self.directory, "segment-00000.npy"))
+        os.replace(tmp_docs, self._docs_path)
+        for path in old_paths:
+            os.remove(path)
+
+        self.docs, self._row_of = [], {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._zones = np.zeros(0, dtype=np.int32)
+        self._sources = np.zeros(0, dtype=np.int32)
+        self._days = np.zeros(0, dtype=np.int32)
+        self._load()
+
+    def _matrix(self) -> np.ndarray:
+        return np.concatenate(self._segments) if len(self._segments) > 1 else self._segments[0]
+
+    def search(self, query: str, k: int = 5, zone: Optional[str] = None, source: Optional[str] = None,
+               days: Optional[Tuple[str, str]] = None) -> List[Tuple[float, dict]]:
+        """
+        Top-k documents by cosine similarity, limited to `zone` (plus global
+        docs), `source` and an inclusive (first_day, last_day) ISO date range.
+        """
+        if not self.docs:
+            return []
+
+        q = embed([query])[0]
+        scores = np.concatenate([segment @ q for segment in self._segments])
+
+        mask = self._alive.copy()
+        if zone is not None:
+            mask &= (self._zones == self._codes.get(zone, -1)) | (self._zones == 0)
+        if source is not None:
+            mask &= self._sources == self._codes.get(source, -1)
+        if days is not None:
+            mask &= (self._days >= _day_number(days[0])) & (self._days <= _day_number(days[1]))
+        scores = np.where(mask, scores, -np.inf)
+
+        k = min(k, int(mask.sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[row]), self.docs[row]) for row in top]
+
+
+# --- CORPUS ---
+
+SOP_DOCUMENTS = [
+    {
+        "id": "sop-clinical-respiratory-v2.1",
+        "source": "SOP_CLINICAL",
+        "text": "Respiratory Distress Protocol v2.1: 1 Doctor per 10 Severe patients. "
+                "Steroids and Inhalers prioritized. Escalate to ICU when SpO2 stays below 90%.",
+    },
+    {
+        "id": "sop-clinical-air-quality",
+        "source": "SOP_CLINICAL",
+        "text": "Air Quality Surge Protocol: when AQI exceeds 300 (Hazardous), expect asthma and COPD "
+                "exacerbations within 24-48h; pre-position nebulizers and Salbutamol inhalers in the ER.",
+    },
+    {
+        "id": "sop-supply-auto-approve",
+        "source": "SOP_SUPPLY",
+        "text": "Procurement SOP: Auto-approve orders < 5000 INR. Orders above 50,000 INR need human approval.",
+    },
+]
+
+SEVERITY_ORDER = ["Low", "Medium", "High", "Critical"]
+
+
+def er_daily_documents() -> List[dict]:
+    """One summary chunk per day of ER visits"""
+    days = defaultdict(list)
+    for visit in load_rows("er_visits"):
+        days[visit["visit_datetime"][:10]].append(visit)
+
+    docs = []
+    for day, visits in sorted(days.items()):
+        severity = Counter(v["severity"] for v in visits)
+        complaints = Counter(v["chief_complaint"] for v in visits).most_common(3)
+        mix = ", ".join(f"{level} {severity.get(level, 0)}" for level in SEVERITY_ORDER)
+        top = ", ".join(f"{name} ({count})" for name, count in complaints)
+        docs.append({
+            "id": f"er-{day}",
+            "source": "ER_STATS",
+            "day": day,
+            "text": f"ER visits on {day}: {len(visits)} patients. Severity: {mix}. Top complaints: {top}.",
+        })
+    return docs
+
+
+def environmental_documents() -> List[dict]:
+    """One chunk per environmental reading"""
+    return [
+        {
+            "id": f"env-{row['env_data_id']}",
+            "source": "ENV",
+            "day": row["recorded_at"][:10],
+            "text": (
+                f"Reading at {row['recorded_at'][:16]} on {row['recorded_at'][:10]} ({row['location']}): "
+                f"AQI {row['air_quality_index']}, temperature {row['temperature_celsius']}C, "
+                f"humidity {row['humidity_percent']}%, precipitation {row['precipitation_mm']}mm, "
+                f"wind {row['wind_speed_kmh']}km/h."
+            ),
+        }
+        for row in load_rows("environmental_data")
+    ]
+
+
+def build_corpus() -> List[dict]:
+    return SOP_DOCUMENTS + er_daily_documents() + environmental_documents()
+
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> VectorIndex:
+    """Process-wide index, built from the seed corpus on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = VectorIndex(RAG_INDEX_DIR)
+                if not index.docs:
+                    index.upsert(build_corpus())
+                _index = index
+    return _index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the local RAG index")
+    parser.add_argument("query", nargs="?")
+    parser.add_argument("--zone")
+    parser.add_argument("--source")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--rebuild", action="store_true", help="Re-embed the seed corpus (upserts by id)")
+    args = parser.parse_args()
+
+    index = get_index()
+    if args.rebuild:
+        index.upsert(build_corpus())
+        index.compact()
+    print(f"{index.directory}: {len(index)} live chunks")
+
+    if args.query:
+        for score, doc in index.search(args.query, k=args.k, zone=args.zone, source=args.source):
+            print(f"{score:.3f} [{doc['source']}] {doc['text']}")
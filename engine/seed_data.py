@@ -0,0 +1,51 @@
+"""
+Reader for the seed dumps in sql_files/.
+
+The dumps are one `INSERT INTO table (cols) VALUES (...);` statement per row.
+Rows are yielded as dicts with Python values: quoted strings, ints, floats,
+True/False and NULL -> None.
+"""
+import os
+import re
+from functools import lru_cache
+from typing import Iterator, List
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sql_files")
+
+_INSERT = re.compile(r"^INSERT INTO (\w+) \(([^)]*)\) VALUES \((.*)\);\s*$")
+_VALUE = re.compile(r"'((?:[^']|'')*)'|(NULL)|(True|False)|(-?\d+\.\d+(?:[eE][-+]?\d+)?|-?\d+)")
+
+
+def parse_values(values: str) -> list:
+    parsed = []
+    for text, null, boolean, number in _VALUE.findall(values):
+        if null:
+            parsed.append(None)
+        elif boolean:
+            parsed.append(boolean == "True")
+        elif number:
+            parsed.append(float(number) if "." in number or "e" in number.lower() else int(number))
+        else:
+            parsed.append(text.replace("''", "'"))
+    return parsed
+
+
+def dump_path(table: str) -> str:
+    return os.path.join(SQL_DIR, f"{table}.sql")
+
+
+def iter_rows(table: str, path: str = None) -> Iterator[dict]:
+    """Stream the rows of a seed dump without loading the whole file"""
+    with open(path or dump_path(table), encoding="utf-8") as f:
+        for line in f:
+            match = _INSERT.match(line)
+            if not match:
+                continue
+            columns = [col.strip() for col in match.group(2).split(",")]
+            yield dict(zip(columns, parse_values(match.group(3))))
+
+
+@lru_cache(maxsize=None)
+def load_rows(table: str) -> List[dict]:
+    """Parsed rows of a seed dump, cached for the life of the process"""
+    return list(iter_rows(table))
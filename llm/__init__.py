@@ -0,0 +1,4 @@
+from llm.client import structured
+from llm.router import routed
+
+__all__ = ['structured', 'routed']
\ No newline at end of file
@@ -0,0 +1,118 @@
+import asyncio
+import contextvars
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from langchain_core.runnables import RunnableLambda
+from config import LLM_MAX_CONCURRENCY
+from llm.cache import ResponseCache, response_cache
+from tracing import record_cache_hit, record_llm_call
+
+# Shared by every graph running in this process, so a batch of zone runs
+# never has more than LLM_MAX_CONCURRENCY requests in flight at once.
+llm_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+# asyncio semaphores are bound to the loop that first waits on them, so async
+# runs get one pool of slots per event loop.
+_async_slots = weakref.WeakKeyDictionary()
+
+def _loop_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _async_slots.get(loop)
+    if slots is None:
+        slots = _async_slots[loop] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return slots
+
+# Set by `provider_latencies`; provider calls (cache misses) append their latency
+_provider_latencies = contextvars.ContextVar("provider_latencies", default=None)
+
+@contextmanager
+def provider_latencies():
+    """Collect the latency of each provider call made inside the block; cache hits add nothing"""
+    samples = []
+    token = _provider_latencies.set(samples)
+    try:
+        yield samples
+    finally:
+        _provider_latencies.reset(token)
+
+def _record_provider_call(model: str, seconds: float, output):
+    record_llm_call(model, seconds, _usage(output))
+    samples = _provider_latencies.get()
+    if samples is not None:
+        samples.append(seconds)
+
+def _model_name(llm) -> str:
+    return getattr(llm, "model", None) or getattr(llm, "model_name", type(llm).__name__)
+
+def _cache_key(llm, schema, prompt_value):
+    temperature = getattr(llm, "temperature", None)
+    return ResponseCache.make_key(_model_name(llm), temperature, prompt_value.to_string(), schema)
+
+def _parsed(output: dict):
+    """Unwrap an `include_raw=True` response, raising parse failures like the plain wrapper"""
+    if output.get("parsing_error") is not None:
+        raise output["parsing_error"]
+    return output["parsed"]
+
+def _usage(output):
+    return getattr(output.get("raw"), "usage_metadata", None) if output else None
+
+def structured(llm, schema):
+    """
+    Drop-in replacement for `llm.with_structured_output(schema)`.
+
+    Identical requests are answered from the response cache. Misses hold an
+    LLM slot for the duration of the call, which keeps concurrent batch runs
+    inside the provider's rate limits. Both `invoke` and `ainvoke` are supported.
+    Latency, token usage and cache hits are recorded on the current node trace.
+    """
+    bound = llm.with_structured_output(schema, include_raw=True)
+    model = _model_name(llm)
+
+    def _call(prompt_value):
+        key = _cache_key(llm, schema, prompt_value) if response_cache else None
+        if key:
+            cached = response_cache.get(key, schema)
+            if cached is not None:
+                record_cache_hit()
+                return cached
+
+        with llm_slots:
+            start = time.perf_counter()
+            output = None
+            try:
+                output = bound.invoke(prompt_value)
+            finally:
+                # Failed calls still count towards LLM latency
+                _record_provider_call(model, time.perf_counter() - start, output)
+        result = _parsed(output)
+
+        if key and isinstance(result, schema):
+            response_cache.put(key, result)
+        return result
+
+    async def _acall(prompt_value):
+        key = _cache_key(llm, schema, prompt_value) if response_cache else None
+        if key:
+            cached = response_cache.get(key, schema)
+            if cached is not None:
+                record_cache_hit()
+                return cached
+
+        async with _loop_slots():
+            start = time.perf_counter()
+            output = None
+            try:
+                output = await bound.ainvoke(prompt_value)
+            finally:
+                # Failed calls still count towards LLM latency
+                _record_provider_call(model, time.perf_counter() - start, output)
+        result = _parsed(output)
+
+        if key and isinstance(result, schema):
+            response_cache.put(key, result)
+        return result
+
+    return RunnableLambda(_call, afunc=_acall, name=f"structured_{schema.__name__}")
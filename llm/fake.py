@@ -0,0 +1,185 @@
+"""
+Deterministic offline stand-in for ChatGoogleGenerativeAI.
+
+Enabled with LLM_BACKEND=fake. `with_structured_output(schema)` returns a
+runnable that sleeps for a simulated latency and answers with a schema-valid
+instance derived from a hash of the rendered prompt, so the same prompt always
+gets the same answer and the same latency. Usage metadata is estimated at four
+characters per token so tracing and cost reporting still work.
+"""
+import asyncio
+import hashlib
+import random
+import re
+import time
+import typing
+from typing import Any, Callable, Dict, Type
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+from schemas import (
+    SurgeForecast, PharmacyPlan, MedicineItem, StaffingPlan, ShiftDetail, StaffingNarrative,
+    PublicAdvisory, FinalDecision, DecisionNarrative, AuditLog, InfographicContent,
+)
+
+
+def _zone(prompt: str) -> str:
+    match = re.search(r"Zone:\s*([\w-]+)", prompt)
+    return match.group(1) if match else "Mumbai-West"
+
+
+def _surge_forecast(rng: random.Random, prompt: str) -> SurgeForecast:
+    total = rng.randint(80, 240)
+    severe = round(total * rng.uniform(0.08, 0.2))
+    moderate = round(total * rng.uniform(0.2, 0.35))
+    return SurgeForecast(
+        zone=_zone(prompt),
+        predicted_patients=total,
+        severity_breakdown={"mild": total - moderate - severe, "moderate": moderate, "severe": severe},
+        confidence=round(rng.uniform(0.6, 0.9), 2),
+        reasoning="Simulated forecast (fake LLM backend).",
+    )
+
+
+def _pharmacy_plan(rng: random.Random, prompt: str) -> PharmacyPlan:
+    quantity = rng.randint(20, 120)
+    return PharmacyPlan(
+        items_to_reorder=[MedicineItem(medicine_id="med_1", name="Salbutamol Inhaler",
+                                       quantity_needed=quantity, urgency="critical")],
+        estimated_internal_cost=quantity * 350.0,
+        status="shortage",
+    )
+
+
+def _staffing_plan(rng: random.Random, prompt: str) -> StaffingPlan:
+    doctors, nurses = rng.randint(0, 6), rng.randint(0, 12)
+    return StaffingPlan(
+        shifts=[ShiftDetail(role="doctor", count_needed=doctors, shift_period="Next 48h"),
+                ShiftDetail(role="nurse", count_needed=nurses, shift_period="Next 48h")],
+        total_labor_cost=(doctors * 2500.0 + nurses * 800.0) * 8,
+        gap_analysis="Simulated staffing gap (fake LLM backend).",
+    )
+
+
+def _staffing_narrative(rng: random.Random, prompt: str) -> StaffingNarrative:
+    return StaffingNarrative(gap_analysis="Simulated staffing gap narrative (fake LLM backend).")
+
+
+def _public_advisory(rng: random.Random, prompt: str) -> PublicAdvisory:
+    level = rng.choice(["info", "warning", "critical"])
+    return PublicAdvisory(
+        alert_level=level,
+        title=f"{level.title()}: respiratory risk advisory",
+        message_body="Simulated advisory (fake LLM backend). Limit outdoor activity and carry inhalers.",
+        target_channels=["SMS", "WhatsApp"],
+        draft_status="ready",
+    )
+
+
+def _final_decision(rng: random.Random, prompt: str) -> FinalDecision:
+    risk = rng.choice(["low", "medium", "high"])
+    return FinalDecision(
+        approved=risk != "high",
+        execution_plan="Simulated execution plan (fake LLM backend).",
+        risk_level=risk,
+        human_approval_required=risk == "high",
+        audit_trail=[AuditLog(action_type="decision", agent_name="Orchestrator",
+                              reasoning="Simulated decision (fake LLM backend).", cost_impact=0.0)],
+    )
+
+
+def _decision_narrative(rng: random.Random, prompt: str) -> DecisionNarrative:
+    return DecisionNarrative(execution_plan="Simulated execution plan narrative (fake LLM backend).")
+
+
+def _infographic(rng: random.Random, prompt: str) -> InfographicContent:
+    return InfographicContent(
+        title="Breathe Safe: Surge Alert",
+        key_stats=["High Risk", f"AQI {rng.randint(150, 350)}", f"{rng.randint(80, 240)} patients / 48h"],
+        visual_description="Red gradient background with a mask icon.",
+    )
+
+
+BUILDERS: Dict[Type[BaseModel], Callable[[random.Random, str], BaseModel]] = {
+    SurgeForecast: _surge_forecast,
+    PharmacyPlan: _pharmacy_plan,
+    StaffingPlan: _staffing_plan,
+    StaffingNarrative: _staffing_narrative,
+    PublicAdvisory: _public_advisory,
+    FinalDecision: _final_decision,
+    DecisionNarrative: _decision_narrative,
+    InfographicContent: _infographic,
+}
+
+
+def _fake_value(annotation: Any, rng: random.Random, name: str) -> Any:
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin is typing.Literal:
+        return args[0]
+    if origin is typing.Union:
+        return _fake_value(next(a for a in args if a is not type(None)), rng, name)
+    if origin is list:
+        return [_fake_value(args[0], rng, name)]
+    if origin is dict:
+        return {"value": _fake_value(args[1], rng, name)}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return generic_instance(annotation, rng)
+    if annotation is bool:
+        return rng.random() < 0.5
+    if annotation is int:
+        return rng.randint(1, 100)
+    if annotation is float:
+        return round(rng.uniform(1, 1000), 2)
+    return f"Simulated {name} (fake LLM backend)."
+
+
+def generic_instance(schema: Type[BaseModel], rng: random.Random) -> BaseModel:
+    """Schema-valid instance for models without a dedicated builder"""
+    values = {
+        name: _fake_value(field.annotation, rng, name)
+        for name, field in schema.model_fields.items()
+        if field.is_required()
+    }
+    return schema.model_validate(values)
+
+
+class FakeChatModel:
+    """Implements the slice of the chat-model API the agents use: `with_structured_output`"""
+
+    def __init__(self, model: str, temperature: float = 0.0, latency_seconds: float = 0.2):
+        self.model = model
+        self.temperature = temperature
+        self.latency_seconds = latency_seconds
+
+    def _respond(self, schema: Type[BaseModel], prompt_value, include_raw: bool):
+        prompt = prompt_value.to_string() if hasattr(prompt_value, "to_string") else str(prompt_value)
+        seed = hashlib.sha256(f"{self.model}|{schema.__name__}|{prompt}".encode()).digest()
+        rng = random.Random(seed)
+        delay = self.latency_seconds * rng.uniform(0.75, 1.25)
+
+        builder = BUILDERS.get(schema)
+        parsed = builder(rng, prompt) if builder else generic_instance(schema, rng)
+        if not include_raw:
+            return delay, parsed
+
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(parsed.model_dump_json()) // 4)
+        raw = AIMessage(content="", usage_metadata={
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        })
+        return delay, {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+    def with_structured_output(self, schema: Type[BaseModel], include_raw: bool = False, **kwargs):
+        def _call(prompt_value):
+            delay, result = self._respond(schema, prompt_value, include_raw)
+            time.sleep(delay)
+            return result
+
+        async def _acall(prompt_value):
+            delay, result = self._respond(schema, prompt_value, include_raw)
+            await asyncio.sleep(delay)
+            return result
+
+        return RunnableLambda(_call, afunc=_acall, name=f"fake_{schema.__name__}")
@@ -0,0 +1,340 @@
+"""
+Per-node model routing with latency budgets, hedging and circuit breakers.
+
+Each LLM-backed node has a route: the models it may use, in order of
+preference, plus a latency and per-call cost budget. For every call the router
+
+1. drops models whose circuit breaker is open (a known-broken model is not
+   retried on every run),
+2. prefers models whose observed p95 latency and estimated cost fit the
+   node's budget, keeping the route's order otherwise,
+3. calls the first model and, if it has not answered within its p95 (or the
+   budget while there are too few samples), fires the next one as a hedge.
+   The first successful answer wins; a failure moves straight to the next,
+   which is counted as a retry in the node's trace.
+
+Model health (recent latencies, consecutive failures, breaker state) is kept
+per model name and persisted to LLM_ROUTER_STATE_PATH, so it survives
+restarts. Latencies come from provider calls only: an answer from the
+response cache neither adds a sample nor closes a breaker. A "model not
+found" error opens the breaker for the maximum cooldown straight away.
+
+Usage:
+    chain = prompt | routed("doctor", SurgeForecast)
+    python -m llm.router          # show model health
+    python -m llm.router --reset
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, NamedTuple, Tuple
+from langchain_core.runnables import RunnableLambda
+from config import LLM_HEDGING_ENABLED, LLM_MAX_CONCURRENCY, LLM_ROUTER_STATE_PATH
+from llm.client import _model_name, provider_latencies, structured
+from tracing import llm_cost, record_retry
+
+logger = logging.getLogger(__name__)
+
+LATENCY_WINDOW = 50  # Samples kept per model for the p95
+MIN_SAMPLES = 5  # Below this the route's latency budget is the hedge delay
+FAILURE_THRESHOLD = 3  # Consecutive failures that open a breaker
+BASE_COOLDOWN_SECONDS = 60.0
+MAX_COOLDOWN_SECONDS = 24 * 3600.0
+PERMANENT_ERRORS = ("404", "NOT_FOUND", "not found")  # Model does not exist for this key
+SAVE_EVERY = 10  # Persist health after this many successes (failures save immediately)
+
+
+class NodeRoute(NamedTuple):
+    models: Tuple[str, ...]  # Keys of config.llm_<key>, most preferred first
+    latency_budget_seconds: float
+    cost_budget_usd: float  # Per call, estimated from expected_tokens
+    expected_tokens: Tuple[int, int]  # (prompt, completion)
+
+
+ROUTES: Dict[str, NodeRoute] = {
+    "doctor": NodeRoute(("heavy", "lite"), 8.0, 0.002, (1500, 300)),
+    "public_health": NodeRoute(("heavy", "lite"), 8.0, 0.002, (1200, 300)),
+    "orchestrator": NodeRoute(("heavy", "lite"), 10.0, 0.003, (2500, 500)),
+    "pharmacy": NodeRoute(("light", "lite"), 5.0, 0.001, (800, 300)),
+    "operations": NodeRoute(("light", "lite"), 5.0, 0.001, (800, 300)),
+    "infographic": NodeRoute(("nano", "lite", "light"), 6.0, 0.001, (800, 200)),
+}
+
+
+class ModelHealth:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.cooldown = BASE_COOLDOWN_SECONDS
+        self.last_error = None
+
+    def p95(self):
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def is_open(self, now: float) -> bool:
+        return now < self.open_until
+
+    def to_dict(self) -> dict:
+        return {
+            "latencies": list(self.latencies),
+            "consecutive_failures": self.consecutive_failures,
+            "open_until": self.open_until,
+            "cooldown": self.cooldown,
+            "last_error": self.last_error,
+        }
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict) -> "ModelHealth":
+        health = cls(name)
+        health.latencies.extend(data.get("latencies", []))
+        health.consecutive_failures = data.get("consecutive_failures", 0)
+        health.open_until = data.get("open_until", 0.0)
+        health.cooldown = data.get("cooldown", BASE_COOLDOWN_SECONDS)
+        health.last_error = data.get("last_error")
+        return health
+
+
+class LLMRouter:
+    def __init__(self, state_path: str, routes: Dict[str, NodeRoute] = ROUTES, hedging: bool = True):
+        self.state_path = state_path
+        self.routes = routes
+        self.hedging = hedging
+        self.health: Dict[str, ModelHealth] = {}
+        self._lock = threading.Lock()
+        self._successes = 0
+        self._pool = ThreadPoolExecutor(max_workers=2 * LLM_MAX_CONCURRENCY, thread_name_prefix="llm-route")
+        self._runnables = {}
+        self._load()
+
+    # --- persistence ---
+
+    def _load(self):
+        if not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable router state {self.state_path}: {e}")
+            return
+        self.health = {name: ModelHealth.from_dict(name, entry) for name, entry in data.items()}
+
+    def save(self):
+        with self._lock:
+            data = {name: health.to_dict() for name, health in self.health.items()}
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.state_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def reset(self):
+        with self._lock:
+            self.health = {}
+        self.save()
+
+    # --- health ---
+
+    def _health(self, model_name: str) -> ModelHealth:
+        if model_name not in self.health:
+            self.health[model_name] = ModelHealth(model_name)
+        return self.health[model_name]
+
+    def record_success(self, model_name: str, seconds: float):
+        with self._lock:
+            health = self._health(model_name)
+            recovered = health.consecutive_failures > 0 or health.open_until > 0
+            health.latencies.append(seconds)
+            health.consecutive_failures = 0
+            health.open_until = 0.0
+            health.cooldown = BASE_COOLDOWN_SECONDS
+            self._successes += 1
+            save = recovered or self._successes % SAVE_EVERY == 0
+        if save:
+            self.save()
+
+    def record_failure(self, model_name: str, error: Exception):
+        message = f"{type(error).__name__}: {error}"
+        with self._lock:
+            health = self._health(model_name)
+            health.consecutive_failures += 1
+            health.last_error = message[:300]
+            if any(marker in message for marker in PERMANENT_ERRORS):
+                health.cooldown = MAX_COOLDOWN_SECONDS
+                health.open_until = time.time() + MAX_COOLDOWN_SECONDS
+            elif health.consecutive_failures >= FAILURE_THRESHOLD:
+                health.open_until = time.time() + health.cooldown
+                health.cooldown = min(health.cooldown * 2, MAX_COOLDOWN_SECONDS)
+            opened = health.open_until > time.time()
+        if opened:
+            logger.warning(f"Circuit open for {model_name} until {time.ctime(health.open_until)}: {message[:120]}")
+        self.save()
+
+    # --- routing ---
+
+    @staticmethod
+    def _model(key: str):
+        import config  # Resolved per call so LLM_BACKEND overrides and test patches apply
+        return getattr(config, f"llm_{key}")
+
+    def plan(self, node: str) -> List[str]:
+        """Model keys to try for `node`, in order"""
+        route = self.routes[node]
+        now = time.time()
+        with self._lock:
+            usable, within_budget = [], []
+            for key in route.models:
+                name = _model_name(self._model(key))
+                health = self._health(name)
+                if health.is_open(now):
+                    continue
+                usable.append(key)
+                p95 = health.p95()
+                fast_enough = p95 is None or p95 <= route.latency_budget_seconds
+                if fast_enough and llm_cost(name, *route.expected_tokens) <= route.cost_budget_usd:
+                    within_budget.append(key)
+
+            if not usable:
+                # Every breaker is open: probe the one that reopens first rather than fail outright
+                return [min(route.models, key=lambda k: self._health(_model_name(self._model(k))).open_until)]
+        return within_budget + [key for key in usable if key not in within_budget]
+
+    def hedge_delay(self, node: str, key: str) -> float:
+        with self._lock:
+            p95 = self._health(_model_name(self._model(key))).p95()
+        budget = self.routes[node].latency_budget_seconds
+        return budget if p95 is None else min(p95, budget)
+
+    def _runnable(self, key: str, schema):
+        model = self._model(key)
+        cache_key = (key, id(model), schema)
+        if cache_key not in self._runnables:
+            self._runnables[cache_key] = structured(model, schema)
+        return self._runnables[cache_key]
+
+    def _attempt(self, key: str, schema, prompt_value):
+        model_name = _model_name(self._model(key))
+        with provider_latencies() as samples:
+            try:
+                result = self._runnable(key, schema).invoke(prompt_value)
+            except Exception as e:
+                self.record_failure(model_name, e)
+                raise
+        if samples:  # A cache hit says nothing about the provider's latency or health
+            self.record_success(model_name, samples[-1])
+        return result
+
+    async def _aattempt(self, key: str, schema, prompt_value):
+        model_name = _model_name(self._model(key))
+        with provider_latencies() as samples:
+            try:
+                result = await self._runnable(key, schema).ainvoke(prompt_value)
+            except Exception as e:
+                self.record_failure(model_name, e)
+                raise
+        if samples:  # A cache hit says nothing about the provider's latency or health
+            self.record_success(model_name, samples[-1])
+        return result
+
+    def structured(self, node: str, schema):
+        """Routed drop-in for `llm.structured(model, schema)`"""
+        def _call(prompt_value):
+            order = self.plan(node)
+            futures, error = {}, None
+
+            def launch():
+                key = order.pop(0)
+                # Each attempt runs in a copy of the caller's context so node tracing still applies
+                context = contextvars.copy_context()
+                futures[self._pool.submit(context.run, self._attempt, key, schema, prompt_value)] = key
+                return key
+
+            current = launch()
+            while futures:
+                hedge = self.hedging and order
+                timeout = self.hedge_delay(node, current) if hedge else None
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    logger.info(f"{node}: {current} slower than {timeout:.1f}s, hedging")
+                    current = launch()
+                    continue
+                for future in done:
+                    futures.pop(future)
+                    if future.exception() is None:
+                        return future.result()
+                    error = future.exception()
+                if not futures and order:
+                    record_retry()
+                    current = launch()
+            raise error
+
+        async def _acall(prompt_value):
+            order = self.plan(node)
+            tasks, error = {}, None
+
+            def launch():
+                key = order.pop(0)
+                tasks[asyncio.ensure_future(self._aattempt(key, schema, prompt_value))] = key
+                return key
+
+            current = launch()
+            try:
+                while tasks:
+                    hedge = self.hedging and order
+                    timeout = self.hedge_delay(node, current) if hedge else None
+                    done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                    if not done:
+                        logger.info(f"{node}: {current} slower than {timeout:.1f}s, hedging")
+                        current = launch()
+                        continue
+                    for task in done:
+                        tasks.pop(task)
+                        if task.exception() is None:
+                            return task.result()
+                        error = task.exception()
+                    if not tasks and order:
+                        record_retry()
+                        current = launch()
+                raise error
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return RunnableLambda(_call, afunc=_acall, name=f"routed_{node}_{schema.__name__}")
+
+
+router = LLMRouter(LLM_ROUTER_STATE_PATH, hedging=LLM_HEDGING_ENABLED)
+
+
+def routed(node: str, schema):
+    return router.structured(node, schema)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or reset LLM router health")
+    parser.add_argument("--reset", action="store_true", help="Forget latencies and close every breaker")
+    args = parser.parse_args()
+
+    if args.reset:
+        router.reset()
+        print("Router state reset")
+    now = time.time()
+    for name, health in router.health.items():
+        state = f"OPEN for {health.open_until - now:.0f}s" if health.is_open(now) else "closed"
+        p95 = health.p95()
+        print(f"{name:<36} {state:<20} p95={'n/a' if p95 is None else f'{p95:.2f}s'} "
+              f"failures={health.consecutive_failures} last_error={health.last_error or '-'}")
@@ -1,42 +1,75 @@
+import argparse
+import asyncio
+import os
+import sqlite3
+import time
+import uuid
+from typing import Any, AsyncIterator
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.graph import StateGraph, END
+from pydantic import BaseModel
+from config import CHECKPOINT_PATH
+import schemas
 from state import AgentState
-from tools import retrieve_rag_context
+from tracing import traced, print_summary, write_jsonl, prometheus_text
+from tools import retrieve_rag_context, get_evidence_features
 
 # Import all agents
-from agents.doctor import doctor_node
-from agents.pharmacy import pharmacy_node
-from agents.supplier import supplier_node
-from agents.operations import operations_node
-from agents.public_health import public_health_node
-from agents.orchestrator import orchestrator_node
-from agents.payment import payment_node
-from agents.infographic import infographic_node
-from agents.telegram_bot import telegram_node
-
-def build_graph():
+from agents.doctor import doctor_node, adoctor_node
+from agents.pharmacy import pharmacy_node, apharmacy_node
+from agents.supplier import supplier_node, asupplier_node
+from agents.operations import operations_node, aoperations_node
+from agents.public_health import public_health_node, apublic_health_node
+from agents.orchestrator import orchestrator_node, aorchestrator_node
+from agents.payment import payment_node, apayment_node
+from agents.infographic import infographic_node, ainfographic_node
+from agents.telegram_bot import telegram_node, atelegram_node
+
+# Every node ships a sync and an async implementation, so the compiled graph
+# runs natively under both `invoke` and `ainvoke`/`astream`.
+NODES = {
+    "doctor": (doctor_node, adoctor_node),
+    "pharmacy": (pharmacy_node, apharmacy_node),
+    "supplier": (supplier_node, asupplier_node),
+    "operations": (operations_node, aoperations_node),
+    "public_health": (public_health_node, apublic_health_node),
+    "orchestrator": (orchestrator_node, aorchestrator_node),
+    "payment": (payment_node, apayment_node),
+    "infographic": (infographic_node, ainfographic_node),
+    "telegram": (telegram_node, atelegram_node),
+}
+
+def build_graph(parallel: bool = True, checkpointer=None):
     workflow = StateGraph(AgentState)
 
-    # 1. Add Nodes
-    workflow.add_node("doctor", doctor_node)
-    workflow.add_node("pharmacy", pharmacy_node)
-    workflow.add_node("supplier", supplier_node)
-    workflow.add_node("operations", operations_node)
-    workflow.add_node("public_health", public_health_node)
-    workflow.add_node("orchestrator", orchestrator_node)
-    workflow.add_node("payment", payment_node)
-    workflow.add_node("infographic", infographic_node)
-    workflow.add_node("telegram", telegram_node)
+    # 1. Add Nodes (each wrapped with per-node telemetry, see tracing.py)
+    for name, (sync_fn, async_fn) in NODES.items():
+        sync_fn, async_fn = traced(name, sync_fn, async_fn)
+        workflow.add_node(name, RunnableLambda(sync_fn, afunc=async_fn, name=name))
 
     # 2. Set Entry Point
     workflow.set_entry_point("doctor")
 
-    # 3. Define Sequential Flow
-    # Doctor -> Public Health -> Operations -> Pharmacy -> Supplier -> Orchestrator
-    workflow.add_edge("doctor", "public_health")
-    workflow.add_edge("public_health", "operations")
-    workflow.add_edge("operations", "pharmacy")
-    workflow.add_edge("pharmacy", "supplier")
-    workflow.add_edge("supplier", "orchestrator")
+    if parallel:
+        # 3. Fan-out / Fan-in Flow
+        # Public Health, Operations and Pharmacy only read the forecast, so they
+        # run concurrently once the Doctor is done. Supplier follows Pharmacy,
+        # and the Orchestrator waits for all three branches to join.
+        workflow.add_edge("doctor", "public_health")
+        workflow.add_edge("doctor", "operations")
+        workflow.add_edge("doctor", "pharmacy")
+        workflow.add_edge("pharmacy", "supplier")
+        workflow.add_edge(["public_health", "operations", "supplier"], "orchestrator")
+    else:
+        # 3. Define Sequential Flow
+        # Doctor -> Public Health -> Operations -> Pharmacy -> Supplier -> Orchestrator
+        workflow.add_edge("doctor", "public_health")
+        workflow.add_edge("public_health", "operations")
+        workflow.add_edge("operations", "pharmacy")
+        workflow.add_edge("pharmacy", "supplier")
+        workflow.add_edge("supplier", "orchestrator")
 
     # 4. Post-Orchestration Flow
     # Orchestrator -> Payment -> Infographic -> Telegram
@@ -45,22 +78,91 @@ def build_graph():
     workflow.add_edge("infographic", "telegram")
     workflow.add_edge("telegram", END)
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
+def make_checkpointer(path: str = CHECKPOINT_PATH) -> SqliteSaver:
+    """SQLite checkpointer shared by every run in this process"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # State values are the Pydantic models in schemas.py; allow exactly those
+    # to be restored from a checkpoint.
+    allowed = [("schemas", name) for name, obj in vars(schemas).items()
+               if isinstance(obj, type) and issubclass(obj, schemas.BaseModel) and obj.__module__ == "schemas"]
+    serde = JsonPlusSerializer(allowed_msgpack_modules=allowed)
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False), serde=serde)
+
+def new_thread_id(zone: str, current_time: str) -> str:
+    """One checkpoint thread per zone run"""
+    return f"{zone}@{current_time}#{uuid.uuid4().hex[:8]}"
+
+def run_config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+def make_initial_state(zone: str, current_time: str):
+    return {
+        "location_zone": zone,
+        "current_time": current_time,
+        "rag_context": retrieve_rag_context(zone, current_time),
+        "evidence_features": get_evidence_features(zone, current_time),
+        "messages": [],
+        "traces": []
+    }
+
+def jsonable(value: Any) -> Any:
+    """Pydantic models in a state update -> plain JSON values"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {key: jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(item) for item in value]
+    return value
+
+async def astream_updates(app, state, config: dict = None) -> AsyncIterator[dict]:
+    """
+    Yield each node's output as soon as the node finishes:
+    {"node": name, "elapsed_seconds": since start, "update": {state key: JSON value}}
+    """
+    start = time.perf_counter()
+    async for chunk in app.astream(state, config, stream_mode="updates"):
+        for node, update in chunk.items():
+            yield {
+                "node": node,
+                "elapsed_seconds": round(time.perf_counter() - start, 3),
+                "update": jsonable(update or {}),
+            }
+
+async def print_stream(app, state):
+    async for event in astream_updates(app, state):
+        for message in event["update"].get("messages", []):
+            print(f"[{event['elapsed_seconds']:>7.2f}s] {event['node']}: {message}")
 
 if __name__ == "__main__":
-    app = build_graph()
+    parser = argparse.ArgumentParser(description="Run the healthcare surge graph")
+    parser.add_argument("--zone", default="Mumbai-West")
+    parser.add_argument("--time", default="2025-11-28T10:00:00")
+    parser.add_argument("--stream", action="store_true", help="Print each agent's output as soon as it is ready")
+    parser.add_argument("--trace-jsonl", help="Append per-node traces to this JSONL file")
+    parser.add_argument("--metrics", help="Write per-node metrics in Prometheus text format to this file")
+    args = parser.parse_args()
+
+    if args.stream:
+        print("### STREAMING HEALTHCARE SURGE GRAPH ###\n")
+        asyncio.run(print_stream(build_graph(), make_initial_state(args.zone, args.time)))
+        raise SystemExit
+
+    app = build_graph(checkpointer=make_checkpointer())
     
-    initial_state = {
-        "location_zone": "Mumbai-West",
-        "current_time": "2025-11-28T10:00:00",
-        "rag_context": retrieve_rag_context("Mumbai-West"),
-        "messages": []
-    }
+    initial_state = make_initial_state(args.zone, args.time)
+    thread_id = new_thread_id(initial_state["location_zone"], initial_state["current_time"])
     
-    print("### RUNNING HEALTHCARE SURGE GRAPH ###\n")
+    print(f"### RUNNING HEALTHCARE SURGE GRAPH (run {thread_id}) ###\n")
     
     try:
-        result = app.invoke(initial_state)
+        start = time.perf_counter()
+        result = app.invoke(initial_state, run_config(thread_id))
+        wall_seconds = time.perf_counter() - start
         
         dec = result['final_decision']
         print("\n\n=== ORCHESTRATOR REPORT ===")
@@ -77,5 +179,13 @@ if __name__ == "__main__":
         if result.get('telegram_status') and result['telegram_status'].sent:
             print("Telegram Alert: SENT")
             
+        print_summary(result["traces"], wall_seconds)
+        if args.trace_jsonl:
+            write_jsonl(args.trace_jsonl, result["traces"], thread_id)
+        if args.metrics:
+            with open(args.metrics, "w", encoding="utf-8") as f:
+                f.write(prometheus_text(result["traces"]))
+            
     except Exception as e:
-        print(f"Graph execution failed: {e}")
\ No newline at end of file
+        print(f"Graph execution failed: {e}")
+        print(f"Completed steps are checkpointed. Resume with: python runs.py resume '{thread_id}'")
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+List, inspect and resume checkpointed surge graph runs.
+
+Every run started by main.py (or `runs.py start`) writes its state to the
+SQLite checkpointer after each completed step, under a thread id of the form
+ZONE@TIMESTAMP#xxxxxxxx. Resuming replays nothing that already finished: the
+graph picks up at the nodes that were still pending when the run failed.
+
+Usage:
+    python runs.py list
+    python runs.py show 'Mumbai-West@2025-11-28T10:00:00#1a2b3c4d'
+    python runs.py resume 'Mumbai-West@2025-11-28T10:00:00#1a2b3c4d'
+    python runs.py start Mumbai-West --time 2025-11-28T10:00:00
+"""
+import argparse
+from typing import List
+from main import build_graph, make_checkpointer, make_initial_state, new_thread_id, run_config
+
+
+def list_thread_ids(checkpointer) -> List[str]:
+    """Thread ids ordered by their latest checkpoint, newest first"""
+    rows = checkpointer.conn.execute(
+        "SELECT thread_id FROM checkpoints GROUP BY thread_id ORDER BY MAX(checkpoint_id) DESC"
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def run_status(snapshot) -> str:
+    if not snapshot.next:
+        return "completed"
+    failed = [task.name for task in snapshot.tasks if task.error]
+    if failed:
+        return f"failed at {', '.join(failed)}"
+    return f"pending {', '.join(snapshot.next)}"
+
+
+def _run(app, state, thread_id: str):
+    try:
+        result = app.invoke(state, run_config(thread_id))
+    except Exception as e:
+        print(f"Graph execution failed: {e}")
+        print(f"Resume with: python runs.py resume '{thread_id}'")
+        return
+    dec = result.get("final_decision")
+    print(f"\nRun {thread_id} completed. Risk Level: {dec.risk_level.upper() if dec else 'N/A'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage checkpointed surge graph runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show every run and where it stopped")
+    show = commands.add_parser("show", help="Print the checkpointed messages of a run")
+    show.add_argument("thread_id")
+    resume = commands.add_parser("resume", help="Continue a run from its last completed step")
+    resume.add_argument("thread_id")
+    start = commands.add_parser("start", help="Start a new checkpointed run")
+    start.add_argument("zone")
+    start.add_argument("--time", default="2025-11-28T10:00:00")
+    args = parser.parse_args()
+
+    checkpointer = make_checkpointer()
+    app = build_graph(checkpointer=checkpointer)
+
+    if args.command == "list":
+        print(f"{'thread id':<48} {'updated':<34} status")
+        for thread_id in list_thread_ids(checkpointer):
+            snapshot = app.get_state(run_config(thread_id))
+            print(f"{thread_id:<48} {snapshot.created_at or '':<34} {run_status(snapshot)}")
+
+    elif args.command == "show":
+        snapshot = app.get_state(run_config(args.thread_id))
+        if not snapshot.values:
+            raise SystemExit(f"No checkpoints for {args.thread_id}")
+        print(f"Status: {run_status(snapshot)}")
+        for message in snapshot.values.get("messages", []):
+            print(f"  {message}")
+
+    elif args.command == "resume":
+        snapshot = app.get_state(run_config(args.thread_id))
+        if not snapshot.values:
+            raise SystemExit(f"No checkpoints for {args.thread_id}")
+        if not snapshot.next:
+            raise SystemExit(f"Run {args.thread_id} already completed")
+        print(f"### RESUMING {args.thread_id} at {', '.join(snapshot.next)} ###\n")
+        _run(app, None, args.thread_id)
+
+    elif args.command == "start":
+        thread_id = new_thread_id(args.zone, args.time)
+        print(f"### RUNNING HEALTHCARE SURGE GRAPH (run {thread_id}) ###\n")
+        _run(app, make_initial_state(args.zone, args.time), thread_id)
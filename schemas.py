@@ -11,6 +11,26 @@ class SurgeForecast(BaseModel):
     reasoning: str
     timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
 
+class EvidenceFeatures(BaseModel):
+    """Rolling 24h ER and air-quality aggregates for a zone (engine/features.py)"""
+    zone: str
+    as_of: Optional[str] = Field(description="Start of the last hour in the window")
+    visits_last_24h: int
+    visits_prev_24h: int
+    arrivals_per_hour: float
+    growth_rate: float = Field(description="Change in arrivals vs the previous 24h, e.g. 0.25 = +25%")
+    severe_share: float = Field(description="High + Critical share of the last 24h arrivals")
+    max_aqi_24h: Optional[int] = None
+    latest_aqi: Optional[int] = None
+
+    def summary(self) -> str:
+        aqi = f"max AQI {self.max_aqi_24h}, latest AQI {self.latest_aqi}" if self.max_aqi_24h is not None else "no AQI readings"
+        return (
+            f"{self.zone} as of {self.as_of}: {self.visits_last_24h} ER arrivals in the last 24h "
+            f"({self.arrivals_per_hour}/h, {self.growth_rate:+.0%} vs previous 24h), "
+            f"severe share {self.severe_share:.0%}, {aqi}."
+        )
+
 # --- 2. INVENTORY (Pharmacy) ---
 class MedicineItem(BaseModel):
     medicine_id: str
@@ -49,6 +69,9 @@ class StaffingPlan(BaseModel):
     total_labor_cost: float
     gap_analysis: str
 
+class StaffingNarrative(BaseModel):
+    gap_analysis: str
+
 # --- 5. PUBLIC HEALTH (PublicHealth) ---
 class PublicAdvisory(BaseModel):
     alert_level: Literal["info", "warning", "critical"]
@@ -72,6 +95,9 @@ class FinalDecision(BaseModel):
     human_approval_required: bool
     audit_trail: List[AuditLog]
 
+class DecisionNarrative(BaseModel):
+    execution_plan: str
+
 # --- 7. PAYMENTS (Agent-to-Payment) ---
 class PaymentTransaction(BaseModel):
     transaction_id: str
@@ -95,4 +121,17 @@ class InfographicContent(BaseModel):
 class TelegramStatus(BaseModel):
     sent: bool
     message_id: Optional[str]
-    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
\ No newline at end of file
+    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+
+# --- 9. TELEMETRY (tracing.py) ---
+class NodeTrace(BaseModel):
+    node: str
+    started_at: str
+    wall_seconds: float = 0.0
+    llm_calls: int = 0
+    llm_seconds: float = 0.0  # Time inside provider calls, excluding slot waits
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cache_hits: int = 0
+    retries: int = 0  # Failed LLM calls retried on the next routed model
+    cost_usd: float = 0.0
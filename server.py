@@ -0,0 +1,69 @@
+"""
+Streaming API for the surge graph.
+
+Each agent's output is pushed to the client as soon as that node finishes,
+so dashboards can show the forecast and advisory before payments settle.
+
+    GET  /runs/stream?zone=Mumbai-West&time=2025-11-28T10:00:00   (Server-Sent Events)
+    WS   /ws/runs   send {"zone": "...", "time": "..."}, receive one JSON message per node
+
+Usage:
+    uvicorn server:app --port 8003
+"""
+import asyncio
+import json
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from main import build_graph, make_initial_state, astream_updates
+
+DEFAULT_TIME = "2025-11-28T10:00:00"
+
+app = FastAPI(title="Healthcare Surge Graph API")
+graph = build_graph()
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.get("/runs/stream")
+async def stream_run(zone: str, time: str = DEFAULT_TIME):
+    """Run the graph for a zone and stream node updates as Server-Sent Events"""
+    async def events():
+        try:
+            state = await asyncio.to_thread(make_initial_state, zone, time)
+            async for update in astream_updates(graph, state):
+                yield _sse("update", update)
+            yield _sse("done", {"zone": zone, "time": time})
+        except Exception as e:
+            yield _sse("error", {"error": f"{type(e).__name__}: {e}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.websocket("/ws/runs")
+async def websocket_run(websocket: WebSocket):
+    """Same stream as /runs/stream over a WebSocket, one run per connection"""
+    await websocket.accept()
+    try:
+        request = await websocket.receive_json()
+        zone, time = request["zone"], request.get("time", DEFAULT_TIME)
+        state = await asyncio.to_thread(make_initial_state, zone, time)
+        async for update in astream_updates(graph, state):
+            await websocket.send_json({"event": "update", **update})
+        await websocket.send_json({"event": "done", "zone": zone, "time": time})
+    except WebSocketDisconnect:
+        return
+    except Exception as e:
+        await websocket.send_json({"event": "error", "error": f"{type(e).__name__}: {e}"})
+    await websocket.close()
+
+
+@app.get("/")
+def root():
+    return {"stream": "/runs/stream?zone=Mumbai-West", "websocket": "/ws/runs"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8003)
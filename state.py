@@ -1,9 +1,9 @@
 from typing import TypedDict, List, Annotated, Optional
 import operator
 from schemas import (
-    SurgeForecast, PharmacyPlan, StaffingPlan, 
+    EvidenceFeatures, SurgeForecast, PharmacyPlan, StaffingPlan, 
     SupplierResponse, PublicAdvisory, FinalDecision,
-    PaymentStatus, InfographicContent, TelegramStatus
+    PaymentStatus, InfographicContent, TelegramStatus, NodeTrace
 )
 
 class AgentState(TypedDict):
@@ -11,6 +11,7 @@ class AgentState(TypedDict):
     location_zone: str
     current_time: str
     rag_context: str 
+    evidence_features: Optional[EvidenceFeatures]
     
     # --- Agent Outputs ---
     forecast: Optional[SurgeForecast]
@@ -28,4 +29,7 @@ class AgentState(TypedDict):
     telegram_status: Optional[TelegramStatus]
     
     # --- Chat History / Debug Log ---
-    messages: Annotated[List[str], operator.add]
\ No newline at end of file
+    messages: Annotated[List[str], operator.add]
+    
+    # --- Per-Node Telemetry (tracing.py) ---
+    traces: Annotated[List[NodeTrace], operator.add]
\ No newline at end of file
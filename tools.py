@@ -1,26 +1,56 @@
-def retrieve_rag_context(zone: str) -> str:
-    """Simulates RAG retrieval from Vector DB (Chroma/Weaviate)"""
-    return f"""
-    [SOCIAL] Twitter/Reddit in {zone}: 300% spike in 'difficulty breathing' keywords.
-    [ENV] AQI: 310 (Hazardous). Pollen count: High.
-    [ER_STATS] Yesterday: 120 patients. Trend: +15% per hour.
-    [SOP_CLINICAL] Respiratory Distress Protocol v2.1: 
-       - 1 Doctor per 10 Severe patients.
-       - Steroids and Inhalers prioritized.
-    [SOP_SUPPLY] Auto-approve orders < 5000 INR.
-    """
+from datetime import datetime, timedelta
+from engine.features import get_feature_store
+from engine.retriever import get_index
+
+def get_evidence_features(zone: str, current_time: str = None):
+    """Rolling 24h ER arrival and AQI aggregates for the zone (engine/features.py)"""
+    return get_feature_store().snapshot(zone, current_time)
+
+def retrieve_rag_context(zone: str, current_time: str = None) -> str:
+    """RAG retrieval from the local vector index (engine/retriever.py)"""
+    now = datetime.fromisoformat(current_time) if current_time else datetime.now()
+    today = now.date().isoformat()
+    yesterday = (now - timedelta(days=1)).date().isoformat()
+
+    # (source tag, query, chunks, day range) - ER and environmental evidence is
+    # limited to the last two days, SOPs apply regardless of date
+    recent = (yesterday, today)
+    queries = [
+        ("ER_STATS", f"{zone} ER visits patients severity respiratory", 2, recent),
+        ("ENV", f"{zone} AQI hazardous air quality reading", 2, recent),
+        ("SOP_CLINICAL", f"{zone} respiratory distress surge protocol AQI hazardous", 2, None),
+        ("SOP_SUPPLY", "procurement orders auto-approve INR", 1, None),
+    ]
+
+    index = get_index()
+    lines = [f"[FEATURES] {get_evidence_features(zone, current_time).summary()}"]
+    for source, query, k, days in queries:
+        for _, doc in index.search(query, k=k, zone=zone, source=source, days=days):
+            lines.append(f"[{source}] {doc['text']}")
+    return "\n".join(lines)
 
 def get_inventory_snapshot(zone: str):
     """Simulates DB Read: Inventory"""
     return [
-        {"id": "med_1", "name": "Salbutamol Inhaler", "stock": 40, "min_level": 100},
-        {"id": "med_2", "name": "Prednisolone", "stock": 500, "min_level": 200}
+        {"id": "med_1", "name": "Salbutamol Inhaler", "stock": 40, "min_level": 100, "unit_cost": 350.0},
+        {"id": "med_2", "name": "Prednisolone", "stock": 500, "min_level": 200, "unit_cost": 15.0}
     ]
 
-def query_supplier_api(medicine_id: str, quantity: int):
+# Suppliers stocking each medicine (Simulates supplier directory lookup)
+SUPPLIER_DIRECTORY = {
+    "med_1": ["MedCorp India Pvt Ltd", "PharmaFast India"],
+    "med_2": ["PharmaFast India"],
+}
+
+def get_candidate_suppliers(medicine_id: str):
+    """Simulates DB Read: suppliers that can quote a medicine"""
+    return SUPPLIER_DIRECTORY.get(medicine_id, ["PharmaFast India"])
+
+def query_supplier_api(medicine_id: str, quantity: int, supplier: str = None):
     """Simulates External Supplier API"""
+    supplier = supplier or get_candidate_suppliers(medicine_id)[0]
     # Simulate a partial shortage for realism
-    if medicine_id == "med_1": # Inhaler
+    if medicine_id == "med_1" and supplier == "MedCorp India Pvt Ltd": # Inhaler
         return {
             "supplier": "MedCorp India Pvt Ltd",
             "available": min(quantity, 50), # Cap at 50
@@ -28,6 +58,14 @@ def query_supplier_api(medicine_id: str, quantity: int):
             "eta_hours": 24,
             "expedite_cost": 2500.0 # INR
         }
+    if medicine_id == "med_1": # Inhaler from the backup distributor
+        return {
+            "supplier": "PharmaFast India",
+            "available": quantity,
+            "unit_cost": 395.0, # INR
+            "eta_hours": 48,
+            "expedite_cost": 800.0 # INR
+        }
     return {
         "supplier": "PharmaFast India",
         "available": quantity,
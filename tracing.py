@@ -0,0 +1,161 @@
+"""
+Per-node telemetry for the surge graph.
+
+`build_graph` wraps every node with `traced`, which opens a NodeTrace in a
+context variable for the duration of the node. `llm.structured` records each
+provider call (latency, tokens, cost) and cache hit into whichever trace is
+current; the router (`llm.router`) counts a retry each time a failed call
+moves on to the next model on the route. The finished trace is returned as a `traces` update, so it lands in AgentState
+next to the node's own output (and in checkpoints and streamed updates).
+
+Traces can be printed as a summary table, appended to a JSONL file or
+rendered in the Prometheus text exposition format.
+"""
+import json
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from schemas import NodeTrace
+
+# USD per million (prompt, completion) tokens
+PRICING_USD_PER_MTOK: Dict[str, Tuple[float, float]] = {
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+_current: ContextVar[Optional[NodeTrace]] = ContextVar("node_trace", default=None)
+
+
+def current_trace() -> Optional[NodeTrace]:
+    return _current.get()
+
+
+def llm_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = PRICING_USD_PER_MTOK.get(model.removeprefix("models/"), (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def record_llm_call(model: str, seconds: float, usage: Optional[dict]):
+    trace = _current.get()
+    if trace is None:
+        return
+    prompt_tokens = int((usage or {}).get("input_tokens", 0))
+    completion_tokens = int((usage or {}).get("output_tokens", 0))
+    trace.llm_calls += 1
+    trace.llm_seconds += seconds
+    trace.prompt_tokens += prompt_tokens
+    trace.completion_tokens += completion_tokens
+    trace.cost_usd += llm_cost(model, prompt_tokens, completion_tokens)
+
+
+def record_cache_hit():
+    trace = _current.get()
+    if trace is not None:
+        trace.cache_hits += 1
+
+
+def record_retry():
+    trace = _current.get()
+    if trace is not None:
+        trace.retries += 1
+
+
+def _with_trace(update, trace: NodeTrace) -> dict:
+    return {**(update or {}), "traces": [trace]}
+
+
+def traced(name: str, fn: Callable, afn: Callable) -> Tuple[Callable, Callable]:
+    """Wrap a node's sync and async implementations so each call yields a NodeTrace"""
+    def run(state):
+        trace = NodeTrace(node=name, started_at=datetime.now().isoformat())
+        token = _current.set(trace)
+        start = time.perf_counter()
+        try:
+            update = fn(state)
+        finally:
+            trace.wall_seconds = time.perf_counter() - start
+            _current.reset(token)
+        return _with_trace(update, trace)
+
+    async def arun(state):
+        trace = NodeTrace(node=name, started_at=datetime.now().isoformat())
+        token = _current.set(trace)
+        start = time.perf_counter()
+        try:
+            update = await afn(state)
+        finally:
+            trace.wall_seconds = time.perf_counter() - start
+            _current.reset(token)
+        return _with_trace(update, trace)
+
+    return run, arun
+
+
+# --- EXPORT ---
+
+_FIELDS = ("wall_seconds", "llm_calls", "llm_seconds", "prompt_tokens", "completion_tokens",
+           "cache_hits", "retries", "cost_usd")
+
+
+def aggregate(traces: Iterable[NodeTrace]) -> Dict[str, dict]:
+    """Per-node totals in first-seen order"""
+    totals: Dict[str, dict] = {}
+    for trace in traces:
+        row = totals.setdefault(trace.node, {"runs": 0, **{field: 0 for field in _FIELDS}})
+        row["runs"] += 1
+        for field in _FIELDS:
+            row[field] += getattr(trace, field)
+    return totals
+
+
+def print_summary(traces: List[NodeTrace], wall_seconds: Optional[float] = None):
+    totals = aggregate(traces)
+    print("\n=== NODE TRACE SUMMARY ===")
+    print(f"{'node':<14} {'runs':>4} {'wall s':>8} {'llm s':>8} {'calls':>5} {'hits':>4} "
+          f"{'retry':>5} {'prompt':>7} {'compl':>7} {'cost $':>9}")
+    grand = {field: 0 for field in _FIELDS}
+    for node, row in totals.items():
+        print(f"{node:<14} {row['runs']:>4} {row['wall_seconds']:>8.3f} {row['llm_seconds']:>8.3f} "
+              f"{row['llm_calls']:>5} {row['cache_hits']:>4} {row['retries']:>5} {row['prompt_tokens']:>7} "
+              f"{row['completion_tokens']:>7} {row['cost_usd']:>9.5f}")
+        for field in _FIELDS:
+            grand[field] += row[field]
+    print(f"{'TOTAL':<14} {'':>4} {grand['wall_seconds']:>8.3f} {grand['llm_seconds']:>8.3f} "
+          f"{grand['llm_calls']:>5} {grand['cache_hits']:>4} {grand['retries']:>5} {grand['prompt_tokens']:>7} "
+          f"{grand['completion_tokens']:>7} {grand['cost_usd']:>9.5f}")
+    if wall_seconds is not None:
+        print(f"Run wall time: {wall_seconds:.3f}s (node wall times overlap where branches run in parallel)")
+
+
+def write_jsonl(path: str, traces: List[NodeTrace], run_id: str):
+    """Append one JSON object per node trace, tagged with the run id"""
+    with open(path, "a", encoding="utf-8") as f:
+        for trace in traces:
+            f.write(json.dumps({"run_id": run_id, **trace.model_dump()}) + "\n")
+
+
+_METRICS = (
+    ("surge_node_runs_total", "runs", "Node executions"),
+    ("surge_node_wall_seconds_total", "wall_seconds", "Wall time spent in the node"),
+    ("surge_llm_calls_total", "llm_calls", "LLM provider calls"),
+    ("surge_llm_seconds_total", "llm_seconds", "Time spent in LLM provider calls"),
+    ("surge_llm_prompt_tokens_total", "prompt_tokens", "Prompt tokens sent"),
+    ("surge_llm_completion_tokens_total", "completion_tokens", "Completion tokens received"),
+    ("surge_llm_cache_hits_total", "cache_hits", "Structured responses served from the cache"),
+    ("surge_llm_retries_total", "retries", "LLM calls retried on another model after a failure"),
+    ("surge_llm_cost_usd_total", "cost_usd", "Estimated LLM spend in USD"),
+)
+
+
+def prometheus_text(traces: List[NodeTrace]) -> str:
+    """Per-node counters in the Prometheus text exposition format"""
+    totals = aggregate(traces)
+    lines = []
+    for metric, field, help_text in _METRICS:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for node, row in totals.items():
+            lines.append(f'{metric}{{node="{node}"}} {row[field]:g}')
+    return "\n".join(lines) + "\n"